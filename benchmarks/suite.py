@@ -0,0 +1,413 @@
+"""
+Benchmark suite for the strategy and portfolio hot paths.
+
+Purpose
+-------
+Time and memory-profile the functions a nightly run spends its time in,
+on deterministic synthetic data, and compare runs against a stored
+baseline:
+
+- every case is timed ``repeat`` times (min / median wall time per
+  call; fast cases are looped so each sample lasts ``min_sample``
+  seconds) and run once more under ``tracemalloc`` for peak bytes
+- sizes are ``TICKERSxDAYS`` pairs, e.g. ``500x252``
+- results are JSON; ``compare`` flags cases slower (or hungrier) than
+  the baseline by more than a threshold and exits non-zero
+
+Usage
+-----
+python -m benchmarks.suite run --sizes 200x252,2000x252 --out bench.json
+python -m benchmarks.suite run --cases filter_universe_loop,filter_universe --sizes 3000x252,10000x252
+python -m benchmarks.suite compare baseline.json bench.json --threshold 0.15
+python -m benchmarks.suite list
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.reference import filter_universe_loop
+from benchmarks.synthetic import make_prices, make_scores
+from src.engine.backtest import MeanReversionConfig, run_mean_reversion_backtest
+from src.filter_universe import filter_universe
+from src.portfolio.metrics import curve_metrics
+from src.portfolio.portfolio import Portfolio, compute_metrics
+from src.strategy.allocator import AllocationConfig, allocate_capital
+from src.strategy.ranker import RankerConfig, rank_universe
+from src.strategy.regimes import classify_regime, classify_regime_matrix
+from src.strategy.scoring import score_symbol, score_universe
+from src.strategy.signals import generate_signals
+
+
+# -------------------------------------------------------------------
+# Cases
+# -------------------------------------------------------------------
+# Each setup takes (n_tickers, n_days, seed) and returns a zero-argument
+# callable; setup cost is excluded from timings.
+
+CASES: Dict[str, Callable[[int, int, int], Callable[[], object]]] = {}
+
+
+def case(name: str):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+@case("score_symbol")
+def _score_symbol(n_tickers, n_days, seed):
+    prices = make_prices(n_tickers, n_days, seed)
+    last = prices.iloc[-1]
+    columns = [prices[t] for t in prices.columns]
+
+    def run():
+        return [
+            score_symbol(s.name, last[s.name], s, "neutral")
+            for s in columns
+        ]
+    return run
+
+
+@case("score_universe")
+def _score_universe(n_tickers, n_days, seed):
+    prices = make_prices(n_tickers, n_days, seed)
+    return lambda: score_universe(prices)
+
+
+@case("rank_universe")
+def _rank_universe(n_tickers, n_days, seed):
+    scores = make_scores(n_tickers, seed)
+    config = RankerConfig(top_n=20, bottom_n=20)
+    return lambda: rank_universe(scores, config)
+
+
+def _filter_inputs(n_tickers, n_days, seed):
+    prices = make_prices(n_tickers, n_days, seed, missing_frac=0.02)
+    universe = pd.DataFrame({"Ticker": list(prices.columns)})
+    # Recently traded names: the lists the old loop scanned per ticker
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(prices.columns, size=2 * max(1, n_tickers // 20), replace=False)
+    half = len(picks) // 2
+    return universe, prices, picks[:half].tolist(), picks[half:].tolist()
+
+
+@case("filter_universe_loop")
+def _filter_universe_loop(n_tickers, n_days, seed):
+    universe, prices, held, sold = _filter_inputs(n_tickers, n_days, seed)
+    return lambda: filter_universe_loop(universe, prices, held, sold)
+
+
+@case("filter_universe")
+def _filter_universe(n_tickers, n_days, seed):
+    universe, prices, held, sold = _filter_inputs(n_tickers, n_days, seed)
+    return lambda: filter_universe(universe, prices, held, sold)
+
+
+@case("classify_regime")
+def _classify_regime(n_tickers, n_days, seed):
+    prices = make_prices(n_tickers, n_days, seed)
+    columns = [prices[t] for t in prices.columns]
+    return lambda: [classify_regime(s) for s in columns]
+
+
+@case("classify_regime_matrix")
+def _classify_regime_matrix(n_tickers, n_days, seed):
+    prices = make_prices(n_tickers, n_days, seed)
+    return lambda: classify_regime_matrix(prices)
+
+
+@case("generate_signals")
+def _generate_signals(n_tickers, n_days, seed):
+    prices = make_prices(n_tickers, n_days, seed)
+    return lambda: generate_signals(prices)
+
+
+@case("allocate_capital")
+def _allocate_capital(n_tickers, n_days, seed):
+    prices = make_prices(n_tickers, n_days, seed)
+    last = prices.iloc[-1].to_dict()
+    scores = dict(zip(prices.columns, np.random.default_rng(seed).normal(size=n_tickers)))
+    ranked = rank_universe(scores, RankerConfig(top_n=20, bottom_n=20))
+    config = AllocationConfig(max_positions=20, target_weight=0.05)
+
+    def run():
+        portfolio = Portfolio(1_000_000)
+        allocate_capital(portfolio, ranked["top"], ranked["bottom"], last, config)
+        return portfolio
+    return run
+
+
+def _orders(n_tickers, seed):
+    rng = np.random.default_rng(seed)
+    symbols = [f"T{i:05d}" for i in range(n_tickers)]
+    n_orders = max(1_000, n_tickers * 4)
+    picks = rng.integers(0, n_tickers, n_orders)
+    prices = rng.uniform(5, 200, n_orders)
+    sides = np.where(rng.random(n_orders) < 0.6, "BUY", "SELL")
+    sizes = rng.integers(1, 50, n_orders)
+    return list(zip([symbols[i] for i in picks], prices.tolist(), sides.tolist(), sizes.tolist()))
+
+
+@case("portfolio_execute")
+def _portfolio_execute(n_tickers, n_days, seed):
+    orders = _orders(n_tickers, seed)
+
+    def run():
+        portfolio = Portfolio(10_000_000)
+        for symbol, price, side, size in orders:
+            portfolio.execute(symbol, price, side, position_size=size)
+        return portfolio
+    return run
+
+
+@case("portfolio_execute_batch")
+def _portfolio_execute_batch(n_tickers, n_days, seed):
+    orders = [
+        (symbol, side, size, price)
+        for symbol, price, side, size in _orders(n_tickers, seed)
+    ]
+
+    def run():
+        portfolio = Portfolio(10_000_000)
+        portfolio.execute_batch(orders)
+        return portfolio
+    return run
+
+
+@case("curve_metrics")
+def _curve_metrics(n_tickers, n_days, seed):
+    # One equity curve per "ticker": the shape of a sweep's results
+    curves = make_prices(n_tickers, n_days, seed, missing_frac=0.0).to_numpy()
+    return lambda: curve_metrics(curves)
+
+
+@case("backtest_end_to_end")
+def _backtest(n_tickers, n_days, seed):
+    prices = make_prices(n_tickers, n_days, seed)
+    config = MeanReversionConfig()
+
+    def run():
+        result = run_mean_reversion_backtest(prices, config)
+        return compute_metrics(result.equity_curve)
+    return run
+
+
+# -------------------------------------------------------------------
+# Runner
+# -------------------------------------------------------------------
+
+@dataclass
+class BenchResult:
+    case: str
+    n_tickers: int
+    n_days: int
+    repeat: int
+    number: int
+    min_seconds: float
+    median_seconds: float
+    peak_bytes: int
+
+
+def parse_sizes(text: str) -> List[tuple]:
+    sizes = []
+    for part in text.split(","):
+        tickers, days = part.lower().split("x")
+        sizes.append((int(tickers), int(days)))
+    return sizes
+
+
+def run_case(
+    name: str,
+    n_tickers: int,
+    n_days: int,
+    repeat: int = 5,
+    seed: int = 0,
+    min_sample: float = 0.05
+) -> BenchResult:
+    fn = CASES[name](n_tickers, n_days, seed)
+
+    # Warm-up (imports, caches) outside the measurements
+    t0 = time.perf_counter()
+    fn()
+    first = time.perf_counter() - t0
+
+    # Loop fast cases so timer resolution and noise stay negligible
+    number = max(1, int(min_sample / max(first, 1e-9)))
+
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - t0) / number)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchResult(
+        case=name,
+        n_tickers=n_tickers,
+        n_days=n_days,
+        repeat=repeat,
+        number=number,
+        min_seconds=min(timings),
+        median_seconds=statistics.median(timings),
+        peak_bytes=int(peak),
+    )
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=10,
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_suite(sizes, cases=None, repeat: int = 5, seed: int = 0, min_sample: float = 0.05) -> dict:
+    cases = list(cases or CASES)
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {unknown}")
+
+    results = []
+    for n_tickers, n_days in sizes:
+        for name in cases:
+            result = run_case(name, n_tickers, n_days, repeat, seed, min_sample)
+            results.append(result)
+            print(
+                f"{name:<24} {n_tickers:>6}x{n_days:<5} "
+                f"median {result.median_seconds * 1e3:9.2f} ms  "
+                f"peak {result.peak_bytes / 1e6:8.2f} MB"
+            )
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "seed": seed,
+        },
+        "results": [asdict(r) for r in results],
+    }
+
+
+# -------------------------------------------------------------------
+# Comparison
+# -------------------------------------------------------------------
+
+def compare(
+    baseline: dict,
+    current: dict,
+    threshold: float = 0.10,
+    memory_threshold: float = 0.25,
+    metric: str = "min_seconds"
+) -> pd.DataFrame:
+    """
+    Join two result files on (case, n_tickers, n_days).
+
+    A case regresses if its ``metric`` time grew by more than
+    ``threshold`` or its peak memory by more than ``memory_threshold``
+    (fractions). Min time is the default: it is the least noisy.
+    """
+    key = ["case", "n_tickers", "n_days"]
+    base = pd.DataFrame(baseline["results"]).set_index(key)
+    cur = pd.DataFrame(current["results"]).set_index(key)
+
+    joined = base[[metric, "peak_bytes"]].join(
+        cur[[metric, "peak_bytes"]],
+        lsuffix="_base",
+        rsuffix="_new",
+        how="inner",
+    )
+
+    joined["time_ratio"] = joined[f"{metric}_new"] / joined[f"{metric}_base"]
+    joined["memory_ratio"] = joined["peak_bytes_new"] / joined["peak_bytes_base"].clip(lower=1)
+    joined["regression"] = (
+        (joined["time_ratio"] > 1 + threshold)
+        | (joined["memory_ratio"] > 1 + memory_threshold)
+    )
+    return joined.reset_index()
+
+
+# -------------------------------------------------------------------
+# CLI
+# -------------------------------------------------------------------
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Strategy / portfolio benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="run benchmarks and write JSON")
+    run_p.add_argument("--sizes", type=parse_sizes, default=parse_sizes("200x252"))
+    run_p.add_argument("--cases", default=None, help="comma-separated case names")
+    run_p.add_argument("--repeat", type=int, default=5)
+    run_p.add_argument("--min-sample", type=float, default=0.05, help="seconds per timing sample")
+    run_p.add_argument("--seed", type=int, default=0)
+    run_p.add_argument("--out", default="benchmark_results.json")
+
+    cmp_p = sub.add_parser("compare", help="flag regressions against a baseline")
+    cmp_p.add_argument("baseline")
+    cmp_p.add_argument("current")
+    cmp_p.add_argument("--threshold", type=float, default=0.10)
+    cmp_p.add_argument("--memory-threshold", type=float, default=0.25)
+    cmp_p.add_argument("--metric", choices=["min_seconds", "median_seconds"], default="min_seconds")
+
+    sub.add_parser("list", help="list benchmark cases")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        print("\n".join(CASES))
+        return 0
+
+    if args.command == "run":
+        cases = args.cases.split(",") if args.cases else None
+        report = run_suite(args.sizes, cases, args.repeat, args.seed, args.min_sample)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {len(report['results'])} results to {args.out}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    table = compare(baseline, current, args.threshold, args.memory_threshold, args.metric)
+    print(table[[
+        "case", "n_tickers", "n_days", "time_ratio", "memory_ratio", "regression"
+    ]].to_string(index=False, float_format=lambda x: f"{x:.2f}"))
+
+    regressions = table[table["regression"]]
+    if len(regressions):
+        print(f"\n{len(regressions)} regression(s) against {args.baseline}")
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Deterministic synthetic market data for benchmarks.
+
+Purpose
+-------
+Generate reproducible inputs without network access:
+
+- geometric Brownian motion closes with per-ticker drift / volatility
+- optional missing bars to exercise NaN handling
+- OHLCV panels and score dictionaries derived from the same draws
+
+The same (n_tickers, n_days, seed) always yields identical data.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def ticker_names(n_tickers: int) -> list[str]:
+    return [f"T{i:05d}" for i in range(n_tickers)]
+
+
+def make_prices(
+    n_tickers: int,
+    n_days: int,
+    seed: int = 0,
+    missing_frac: float = 0.0,
+    start: str = "2015-01-02"
+) -> pd.DataFrame:
+    """
+    Close prices, index = business days, columns = tickers.
+    """
+    rng = np.random.default_rng(seed)
+
+    mu = rng.normal(0.0003, 0.0005, n_tickers)
+    sigma = rng.uniform(0.01, 0.04, n_tickers)
+    start_price = rng.lognormal(3.5, 1.0, n_tickers)
+
+    log_returns = rng.standard_normal((n_days, n_tickers)) * sigma + mu
+    values = start_price * np.exp(np.cumsum(log_returns, axis=0))
+
+    if missing_frac > 0:
+        values[rng.random(values.shape) < missing_frac] = np.nan
+
+    return pd.DataFrame(
+        values,
+        index=pd.bdate_range(start, periods=n_days),
+        columns=ticker_names(n_tickers),
+    )
+
+
+def make_volume(prices: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    """
+    Daily share volume aligned with ``prices``.
+    """
+    rng = np.random.default_rng(seed + 1)
+    base = rng.lognormal(13.0, 1.5, prices.shape[1])
+    noise = rng.uniform(0.5, 1.5, prices.shape)
+    return pd.DataFrame(base * noise, index=prices.index, columns=prices.columns)
+
+
+def make_scores(n_tickers: int, seed: int = 0, nan_frac: float = 0.01) -> dict:
+    """
+    symbol -> score; about ``nan_frac`` of the entries are missing, half
+    NaN (failed scoring) and half -inf (short history, as score_symbol
+    emits), so the ranker's missing-score handling is exercised.
+    """
+    rng = np.random.default_rng(seed + 2)
+    values = rng.normal(0.0, 1.0, n_tickers)
+    draw = rng.random(n_tickers)
+    values[draw < nan_frac] = float("-inf")
+    values[draw < nan_frac / 2] = np.nan
+    return dict(zip(ticker_names(n_tickers), values.tolist()))
@@ -1,15 +1,460 @@
+"""
+Monte Carlo price path generation.
+
+Purpose
+-------
+Single shared implementation of the log-normal forecast used by the
+simulators:
+
+- all paths for all tickers are drawn at once and built with a
+  cumulative sum of log returns (no per-step Python loop)
+- randomness comes from a ``numpy.random.Generator`` seeded from
+  ``config.RANDOM_SEED`` (or a caller-supplied generator)
+- float32 output halves memory for large runs
+- ``path_summary`` returns per-day mean / quantiles per ticker while
+  only materializing a bounded chunk of tickers at a time
+- ``StreamingPathStats`` consumes paths in fixed-size simulation chunks
+  and keeps running moments plus a binned quantile sketch, so memory is
+  O(days) per ticker regardless of the simulation count
+
+Row ``t`` of a path is the simulated price ``t + 1`` days ahead.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Sequence
+
 import numpy as np
+import pandas as pd
+
+from src.config.config import RANDOM_SEED
+
+
+# -------------------------------------------------------------------
+# Helpers
+# -------------------------------------------------------------------
+
+def make_rng(seed=RANDOM_SEED) -> np.random.Generator:
+    """
+    Generator seeded from config (None = fresh OS entropy).
+    """
+    return np.random.default_rng(seed)
+
+
+def _as_frame(prices) -> pd.DataFrame:
+    if isinstance(prices, pd.DataFrame):
+        return prices
+    if isinstance(prices, pd.Series):
+        return prices.to_frame()
+    values = np.asarray(prices, dtype=float)
+    return pd.DataFrame(values if values.ndim == 2 else values[:, None])
+
+
+def estimate_log_params(prices):
+    """
+    Per-ticker drift and volatility of daily log returns.
+
+    Returns
+    -------
+    last : np.ndarray
+        Last valid price per ticker
+    mu, sigma : np.ndarray
+        Mean and std (ddof=1) of log returns, NaN bars dropped
+    """
+    frame = _as_frame(prices)
+    values = frame.to_numpy(dtype=float)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        filled = frame.ffill().to_numpy(dtype=float)
+        log_returns = np.full_like(values, np.nan)
+        log_returns[1:] = np.log(values[1:] / filled[:-1])
+
+    valid = ~np.isnan(log_returns)
+    n = valid.sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mu = np.nansum(log_returns, axis=0) / n
+        centered = np.where(valid, log_returns - mu, 0.0)
+        sigma = np.sqrt((centered ** 2).sum(axis=0) / (n - 1))
+
+    last = filled[-1] if len(filled) else np.full(values.shape[1], np.nan)
+    return last, mu, sigma
+
+
+# -------------------------------------------------------------------
+# Path generation
+# -------------------------------------------------------------------
+
+def simulate_paths(
+    last_prices,
+    mu,
+    sigma,
+    n_days: int,
+    n_sims: int,
+    rng: np.random.Generator | None = None,
+    dtype=np.float64
+) -> np.ndarray:
+    """
+    Log-normal paths for several tickers at once.
+
+    Returns
+    -------
+    np.ndarray
+        Shape (n_days, n_sims, n_tickers)
+    """
+    rng = rng if rng is not None else make_rng()
+
+    last_prices = np.atleast_1d(np.asarray(last_prices, dtype=dtype))
+    mu = np.atleast_1d(np.asarray(mu, dtype=dtype))
+    sigma = np.atleast_1d(np.asarray(sigma, dtype=dtype))
+
+    paths = rng.standard_normal((n_days, n_sims, last_prices.size), dtype=dtype)
+    paths *= sigma
+    paths += mu
+    np.cumsum(paths, axis=0, out=paths)
+    np.exp(paths, out=paths)
+    paths *= last_prices
+    return paths
+
+
+def monte_carlo_paths(
+    series,
+    n_days,
+    n_sims,
+    rng: np.random.Generator | None = None,
+    dtype=np.float64
+) -> np.ndarray:
+    """
+    Simulated paths for one price series, shape (n_days, n_sims).
+    """
+    last, mu, sigma = estimate_log_params(series)
+    return simulate_paths(last[:1], mu[:1], sigma[:1], n_days, n_sims, rng, dtype)[:, :, 0]
+
+
+# -------------------------------------------------------------------
+# Summary statistics without the full tensor
+# -------------------------------------------------------------------
+
+@dataclass
+class MonteCarloSummary:
+    mean: pd.DataFrame
+    quantiles: Dict[float, pd.DataFrame] = field(default_factory=dict)
+    std: pd.DataFrame | None = None
+
+    @property
+    def median(self) -> pd.DataFrame:
+        return self.quantiles[0.5]
+
+
+def path_summary(
+    prices,
+    n_days: int,
+    n_sims: int,
+    quantiles: Sequence[float] = (0.05, 0.5, 0.95),
+    rng: np.random.Generator | None = None,
+    dtype=np.float32,
+    max_elements: int = 50_000_000
+) -> MonteCarloSummary:
+    """
+    Per-day mean and quantiles of simulated prices for every ticker.
+
+    Tickers are simulated in chunks of at most ``max_elements`` path
+    values, so peak memory is bounded regardless of universe size. When
+    a single ticker's paths would exceed that bound, the simulations are
+    streamed through ``streaming_path_summary`` instead (approximate
+    quantiles).
+
+    Parameters
+    ----------
+    prices : DataFrame, Series or np.ndarray
+        Price history, index = dates, columns = tickers
+    n_days, n_sims : int
+        Forecast horizon and number of simulations
+    quantiles : sequence of float
+        Quantiles to report (0.5 = median)
+    rng : np.random.Generator, optional
+        Random source; defaults to ``make_rng()``
+    dtype : numpy dtype
+        Path precision
+    max_elements : int
+        Upper bound on n_days * n_sims * tickers held at once
+
+    Returns
+    -------
+    MonteCarloSummary
+        DataFrames of shape (n_days, tickers)
+    """
+    if n_days * n_sims > max_elements:
+        return streaming_path_summary(
+            prices, n_days, n_sims, quantiles, rng, dtype,
+            chunk_sims=max(1, max_elements // max(1, n_days)),
+            max_elements=max_elements,
+        )
+
+    rng = rng if rng is not None else make_rng()
+    frame = _as_frame(prices)
+    last, mu, sigma = estimate_log_params(frame)
+
+    n_tickers = len(last)
+    chunk = max(1, max_elements // max(1, n_days * n_sims))
+    qs = np.asarray(quantiles, dtype=float)
+
+    mean = np.empty((n_days, n_tickers))
+    quant = np.empty((len(qs), n_days, n_tickers))
+
+    for start in range(0, n_tickers, chunk):
+        stop = min(start + chunk, n_tickers)
+        paths = simulate_paths(
+            last[start:stop], mu[start:stop], sigma[start:stop],
+            n_days, n_sims, rng, dtype,
+        )
+        mean[:, start:stop] = paths.mean(axis=1, dtype=np.float64)
+        if len(qs):
+            quant[:, :, start:stop] = np.quantile(paths, qs, axis=1)
+
+    columns = frame.columns
+    index = pd.RangeIndex(1, n_days + 1, name="day")
+    return MonteCarloSummary(
+        mean=pd.DataFrame(mean, index=index, columns=columns),
+        quantiles={
+            float(q): pd.DataFrame(quant[i], index=index, columns=columns)
+            for i, q in enumerate(qs)
+        },
+    )
+
+
+# -------------------------------------------------------------------
+# Streaming estimator
+# -------------------------------------------------------------------
+
+class StreamingPathStats:
+    """
+    Running per-day moments and approximate quantiles over path chunks.
+
+    Mean and variance are merged chunk by chunk (Chan et al.). Quantiles
+    come from a fixed-grid histogram of log prices per (day, ticker):
+    the grid is laid out from the first chunk's range widened by
+    ``margin`` on each side, with under/overflow bins bounded by the
+    running min/max. The sketch is updated with one ``bincount`` per
+    scratch-buffer block, so there is no per-sample Python work.
+
+    Cells with non-finite paths (e.g. a ticker with too little history
+    for a drift / vol estimate) report NaN mean, std and quantiles, as
+    ``path_summary`` does.
+
+    Parameters
+    ----------
+    n_days, n_tickers : int
+        Shape of one simulation (days x tickers)
+    bins : int
+        Histogram bins per cell; quantile error is about
+        (range / bins) / 2 in log space
+    margin : float
+        Extra range, as a multiple of the first chunk's range
+    buffer_elements : int
+        Size of the two scratch buffers (float64 and int64) that each
+        chunk is processed through, so working memory beyond the chunk
+        itself stays fixed
+    """
+
+    def __init__(
+        self,
+        n_days: int,
+        n_tickers: int,
+        bins: int = 1024,
+        margin: float = 0.5,
+        buffer_elements: int = 1_000_000
+    ):
+        self.n_days = n_days
+        self.n_tickers = n_tickers
+        self.bins = bins
+        self.margin = margin
+
+        shape = (n_days, n_tickers)
+        self.count = 0
+        self._mean = np.zeros(shape)
+        self._m2 = np.zeros(shape)
+
+        self._lo = None
+        self._width = None
+        self._min = np.full(shape, np.inf)
+        self._max = np.full(shape, -np.inf)
+        self._invalid = np.zeros(shape, dtype=bool)
+        self._hist = np.zeros((n_days * n_tickers, bins + 2), dtype=np.int64)
+
+        # Scratch space for ``_block`` simulations at a time
+        self._block = max(1, buffer_elements // max(1, n_days * n_tickers))
+        size = n_days * self._block * n_tickers
+        self._fbuf = np.empty(size)
+        self._ibuf = np.empty(size, dtype=np.int64)
+        # Histogram row start per (day, ticker), shifted past the underflow bin
+        self._offsets = (
+            np.arange(n_days * n_tickers, dtype=np.int64).reshape(n_days, 1, n_tickers)
+            * (bins + 2) + 1
+        )
+
+    def update(self, paths: np.ndarray) -> None:
+        """
+        Add a chunk of paths, shape (n_days, chunk_sims, n_tickers).
+        """
+        n_b = paths.shape[1]
+        if n_b == 0:
+            return
+
+        mean_b = paths.mean(axis=1, dtype=np.float64)
+        m2_b = np.zeros_like(mean_b)
+
+        # log is monotone, so the log range comes from the price range
+        chunk_min = np.log(paths.min(axis=1), dtype=np.float64)
+        chunk_max = np.log(paths.max(axis=1), dtype=np.float64)
+
+        if self._lo is None:
+            span = np.maximum(chunk_max - chunk_min, 1e-12)
+            self._lo = chunk_min - self.margin * span
+            self._width = span * (1 + 2 * self.margin) / self.bins
+
+        np.minimum(self._min, chunk_min, out=self._min)
+        np.maximum(self._max, chunk_max, out=self._max)
+        self._invalid |= ~(np.isfinite(chunk_min) & np.isfinite(chunk_max))
+
+        lo = self._lo[:, None, :]
+        width = self._width[:, None, :]
+
+        for start in range(0, n_b, self._block):
+            sub = paths[:, start:start + self._block]
+            size = sub.size
+            buf = self._fbuf[:size].reshape(sub.shape)
+            ibuf = self._ibuf[:size].reshape(sub.shape)
+
+            # ----------------------------
+            # Moments (price space)
+            # ----------------------------
+            np.subtract(sub, mean_b[:, None, :], out=buf)
+            np.square(buf, out=buf)
+            m2_b += buf.sum(axis=1)
+
+            # ----------------------------
+            # Quantile sketch (log space)
+            # ----------------------------
+            np.log(sub, out=buf, dtype=np.float64)
+            buf -= lo
+            buf /= width
+            np.floor(buf, out=buf)
+            # NaN samples land in the underflow bin of an invalid cell
+            np.nan_to_num(buf, copy=False, nan=-1.0)
+            np.clip(buf, -1, self.bins, out=buf)
+            np.copyto(ibuf, buf, casting="unsafe")
+            ibuf += self._offsets
+            self._hist += np.bincount(
+                self._ibuf[:size], minlength=self._hist.size
+            ).reshape(self._hist.shape)
+
+        n_a = self.count
+        n = n_a + n_b
+        delta = mean_b - self._mean
+        self._mean += delta * (n_b / n)
+        self._m2 += m2_b + delta ** 2 * (n_a * n_b / n)
+        self.count = n
+
+    # ----------------------------
+    # Results
+    # ----------------------------
+    def mean(self) -> np.ndarray:
+        return self._mean.copy()
+
+    def std(self) -> np.ndarray:
+        if self.count < 2:
+            return np.full_like(self._mean, np.nan)
+        return np.sqrt(self._m2 / (self.count - 1))
+
+    def quantile(self, q: float) -> np.ndarray:
+        """
+        Approximate quantile per (day, ticker), linear within a bin.
+        """
+        if self.count == 0:
+            return np.full_like(self._mean, np.nan)
+
+        cum = np.cumsum(self._hist, axis=1)
+        rank = q * self.count
+        k = np.minimum((cum < rank).sum(axis=1), self.bins + 1)
+
+        rows = np.arange(cum.shape[0])
+        before = np.where(k > 0, cum[rows, np.maximum(k - 1, 0)], 0)
+        in_bin = self._hist[rows, k]
+
+        lo = self._lo.ravel()
+        width = self._width.ravel()
+        left = np.where(k == 0, self._min.ravel(), lo + (k - 1) * width)
+        right = np.where(
+            k == self.bins + 1,
+            self._max.ravel(),
+            np.where(k == 0, lo, lo + k * width),
+        )
+        # Under/overflow bins may start past the observed extremes
+        left = np.minimum(left, right)
+
+        frac = np.clip((rank - before) / np.maximum(in_bin, 1), 0.0, 1.0)
+        with np.errstate(invalid="ignore"):
+            value = np.exp(left + frac * (right - left)).reshape(self.n_days, self.n_tickers)
+        return np.where(self._invalid, np.nan, value)
+
+
+def streaming_path_summary(
+    prices,
+    n_days: int,
+    n_sims: int,
+    quantiles: Sequence[float] = (0.05, 0.5, 0.95),
+    rng: np.random.Generator | None = None,
+    dtype=np.float32,
+    chunk_sims: int = 10_000,
+    bins: int = 1024,
+    max_elements: int = 50_000_000
+) -> MonteCarloSummary:
+    """
+    Like ``path_summary`` but streams simulations in fixed-size chunks.
+
+    Peak memory is bounded by ``max_elements`` path values plus the
+    per-ticker sketches and ``StreamingPathStats``' fixed scratch
+    buffers, independent of ``n_sims``. Mean and std are
+    exact up to floating point; quantiles are approximate (see
+    ``StreamingPathStats``).
+    """
+    rng = rng if rng is not None else make_rng()
+    frame = _as_frame(prices)
+    last, mu, sigma = estimate_log_params(frame)
+
+    n_tickers = len(last)
+    chunk_sims = max(1, min(chunk_sims, n_sims))
+    block = max(1, max_elements // max(1, n_days * chunk_sims))
+
+    mean = np.empty((n_days, n_tickers))
+    std = np.empty((n_days, n_tickers))
+    quant = {float(q): np.empty((n_days, n_tickers)) for q in quantiles}
 
-def monte_carlo_paths(series, n_days, n_sims):
-log_returns = np.log(series / series.shift(1)).dropna()
-mu = log_returns.mean()
-sigma = log_returns.std()
+    for start in range(0, n_tickers, block):
+        stop = min(start + block, n_tickers)
+        stats = StreamingPathStats(n_days, stop - start, bins=bins)
 
-paths = np.zeros((n_days, n_sims))
-paths[0] = series.iloc[-1]
+        done = 0
+        while done < n_sims:
+            size = min(chunk_sims, n_sims - done)
+            stats.update(simulate_paths(
+                last[start:stop], mu[start:stop], sigma[start:stop],
+                n_days, size, rng, dtype,
+            ))
+            done += size
 
-for t in range(1, n_days):
-rand = np.random.normal(mu, sigma, n_sims)
-paths[t] = paths[t - 1] * np.exp(rand)
+        mean[:, start:stop] = stats.mean()
+        std[:, start:stop] = stats.std()
+        for q, out in quant.items():
+            out[:, start:stop] = stats.quantile(q)
 
-return paths
+    columns = frame.columns
+    index = pd.RangeIndex(1, n_days + 1, name="day")
+    return MonteCarloSummary(
+        mean=pd.DataFrame(mean, index=index, columns=columns),
+        quantiles={
+            q: pd.DataFrame(values, index=index, columns=columns)
+            for q, values in quant.items()
+        },
+        std=pd.DataFrame(std, index=index, columns=columns),
+    )
@@ -0,0 +1,256 @@
+"""
+Process-parallel Monte Carlo forecasts.
+
+Purpose
+-------
+Spread the per-ticker log-normal simulation over a process pool:
+
+- every ticker gets its own ``Generator`` spawned from one
+  ``SeedSequence``, so results are bit-identical for any worker count
+  or task split
+- workers write mean / quantiles straight into a shared-memory result
+  buffer; only tiny parameter arrays are pickled per task
+- small universes run in-process, where a pool costs more than it saves
+- ``ParallelConfig.processes`` forces the choice; left as None, a call
+  made from a child process (e.g. an unguarded script body re-imported
+  as ``__main__`` under spawn / forkserver) runs in-process and emits a
+  ``RuntimeWarning`` rather than starting a nested pool
+
+Run ``python -m src.analytics.parallel_mc`` for a scaling benchmark.
+"""
+
+import multiprocessing
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.monte_carlo import (
+    MonteCarloSummary,
+    StreamingPathStats,
+    _as_frame,
+    estimate_log_params,
+    simulate_paths,
+)
+from src.config.config import RANDOM_SEED
+
+
+@dataclass(frozen=True)
+class ParallelConfig:
+    max_workers: int | None = None      # None = os.cpu_count()
+    tickers_per_task: int = 16          # tickers simulated per pool task
+    min_tickers: int = 64               # below this, stay in-process
+    max_elements: int = 50_000_000      # per-ticker paths held at once
+    processes: bool | None = None       # True = pool, False = in-process, None = auto
+
+
+# -------------------------------------------------------------------
+# Per-ticker kernel
+# -------------------------------------------------------------------
+
+def _ticker_summary(last, mu, sigma, n_days, n_sims, qs, seed, dtype, max_elements):
+    """
+    Mean and quantiles (n_days each) for one ticker from its own seed.
+    """
+    rng = np.random.default_rng(seed)
+
+    if n_days * n_sims <= max_elements:
+        paths = simulate_paths(last, mu, sigma, n_days, n_sims, rng, dtype)[:, :, 0]
+        mean = paths.mean(axis=1, dtype=np.float64)
+        quant = np.quantile(paths, qs, axis=1) if len(qs) else np.empty((0, n_days))
+        return mean, quant
+
+    stats = StreamingPathStats(n_days, 1)
+    chunk = max(1, max_elements // max(1, n_days))
+    done = 0
+    while done < n_sims:
+        size = min(chunk, n_sims - done)
+        stats.update(simulate_paths(last, mu, sigma, n_days, size, rng, dtype))
+        done += size
+
+    quant = np.array([stats.quantile(q)[:, 0] for q in qs]).reshape(len(qs), n_days)
+    return stats.mean()[:, 0], quant
+
+
+def _fill_block(out, start, stop, last, mu, sigma, n_days, n_sims, qs, seeds, dtype, max_elements):
+    """
+    Write tickers ``start:stop`` into ``out`` (shape (1 + len(qs), n_days, n_tickers)).
+    """
+    for j, i in enumerate(range(start, stop)):
+        mean, quant = _ticker_summary(
+            last[j], mu[j], sigma[j], n_days, n_sims, qs, seeds[j], dtype, max_elements
+        )
+        out[0, :, i] = mean
+        out[1:, :, i] = quant
+
+
+def _pool_task(shm_name, shape, start, stop, last, mu, sigma, n_days, n_sims, qs, seeds, dtype, max_elements):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        _fill_block(out, start, stop, last, mu, sigma, n_days, n_sims, qs, seeds, dtype, max_elements)
+        del out
+    finally:
+        shm.close()
+    return stop - start
+
+
+# -------------------------------------------------------------------
+# Public API
+# -------------------------------------------------------------------
+
+def parallel_path_summary(
+    prices,
+    n_days: int,
+    n_sims: int,
+    quantiles: Sequence[float] = (0.05, 0.5, 0.95),
+    seed=RANDOM_SEED,
+    dtype=np.float32,
+    config: ParallelConfig = ParallelConfig()
+) -> MonteCarloSummary:
+    """
+    Per-day mean and quantiles for every ticker, simulated in parallel.
+
+    Parameters
+    ----------
+    prices : DataFrame, Series or np.ndarray
+        Price history, index = dates, columns = tickers
+    n_days, n_sims : int
+        Forecast horizon and number of simulations
+    quantiles : sequence of float
+        Quantiles to report (0.5 = median)
+    seed : int, SeedSequence or None
+        Root seed; ticker ``i`` uses child ``i`` of ``SeedSequence(seed)``
+    dtype : numpy dtype
+        Path precision
+    config : ParallelConfig
+        Pool sizing and the pool / in-process decision
+
+    Returns
+    -------
+    MonteCarloSummary
+        Same layout as ``path_summary``
+
+    Notes
+    -----
+    With ``config.processes`` None a pool is used when there is more
+    than one worker and at least ``config.min_tickers`` tickers, unless
+    the caller is itself a child process: then the work runs in-process
+    and a ``RuntimeWarning`` says so. Set ``processes=True`` to start a
+    pool from a (non-daemonic) child anyway, or ``False`` to never
+    start one. Results are identical either way.
+    """
+    frame = _as_frame(prices)
+    last, mu, sigma = estimate_log_params(frame)
+    qs = np.asarray(quantiles, dtype=float)
+
+    n_tickers = len(last)
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    seeds = root.spawn(n_tickers)
+
+    shape = (1 + len(qs), n_days, n_tickers)
+    workers = config.max_workers or os.cpu_count() or 1
+    step = max(1, config.tickers_per_task)
+    blocks = [(s, min(s + step, n_tickers)) for s in range(0, n_tickers, step)]
+
+    use_pool = config.processes
+    if use_pool is None:
+        use_pool = workers > 1 and n_tickers >= config.min_tickers
+        if use_pool and multiprocessing.parent_process() is not None:
+            warnings.warn(
+                "parallel_path_summary called from a child process; running "
+                "in-process. Pass ParallelConfig(processes=True) to start a "
+                "pool anyway.",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+            use_pool = False
+
+    if not use_pool:
+        result = np.empty(shape)
+        for start, stop in blocks:
+            _fill_block(
+                result, start, stop,
+                last[start:stop], mu[start:stop], sigma[start:stop],
+                n_days, n_sims, qs, seeds[start:stop], dtype, config.max_elements,
+            )
+    else:
+        nbytes = max(1, int(np.prod(shape)) * np.dtype(np.float64).itemsize)
+        shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        _pool_task, shm.name, shape, start, stop,
+                        last[start:stop], mu[start:stop], sigma[start:stop],
+                        n_days, n_sims, qs, seeds[start:stop], dtype, config.max_elements,
+                    )
+                    for start, stop in blocks
+                ]
+                for future in futures:
+                    future.result()
+            result = np.ndarray(shape, dtype=np.float64, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    columns = frame.columns
+    index = pd.RangeIndex(1, n_days + 1, name="day")
+    return MonteCarloSummary(
+        mean=pd.DataFrame(result[0], index=index, columns=columns),
+        quantiles={
+            float(q): pd.DataFrame(result[1 + i], index=index, columns=columns)
+            for i, q in enumerate(qs)
+        },
+    )
+
+
+# -------------------------------------------------------------------
+# Benchmark
+# -------------------------------------------------------------------
+
+def benchmark(n_tickers=500, n_sims=10_000, n_days=60, max_workers=None, seed=0):
+    """
+    Time ``parallel_path_summary`` for 1..N workers and check the
+    results are identical across worker counts.
+    """
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0005, 0.02, size=(250, n_tickers))
+    prices = pd.DataFrame(100 * np.exp(np.cumsum(returns, axis=0)))
+
+    max_workers = max_workers or os.cpu_count() or 1
+    counts = sorted({1, *[w for w in (2, 4, 8, 16, 32) if w < max_workers], max_workers})
+
+    rows = []
+    reference = None
+    for workers in counts:
+        config = ParallelConfig(max_workers=workers, min_tickers=0)
+        t0 = time.perf_counter()
+        summary = parallel_path_summary(prices, n_days, n_sims, seed=seed, config=config)
+        elapsed = time.perf_counter() - t0
+
+        if reference is None:
+            reference = summary
+        identical = all(
+            np.array_equal(summary.quantiles[q].to_numpy(), reference.quantiles[q].to_numpy())
+            for q in reference.quantiles
+        ) and np.array_equal(summary.mean.to_numpy(), reference.mean.to_numpy())
+
+        rows.append({
+            "workers": workers,
+            "seconds": elapsed,
+            "speedup": rows[0]["seconds"] / elapsed if rows else 1.0,
+            "identical": identical,
+        })
+
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    print(benchmark().to_string(index=False))
@@ -1,10 +1,39 @@
 # src/data/data_loader.py
 
 import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
 import pandas as pd
-import yfinance as yf
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from src.data.fetchers import PriceFetcher, YFinanceFetcher, fetch_many
+from src.data.ohlcv import FIELDS, OHLCVPanel
+from src.data.price_cache import PriceCache
+from src.engine.instrumentation import count, instrument
+
+
+# --------------------------------------------------
+# Batched download configuration
+# --------------------------------------------------
+@dataclass(frozen=True)
+class BatchConfig:
+    batch_size: int = 100          # symbols per upstream request
+    max_workers: int = 4           # concurrent batches
+    max_retries: int = 2           # extra attempts for failed symbols
+    backoff_seconds: float = 1.0   # doubled after every retry
+
+
+@dataclass
+class BatchReport:
+    batch_id: int
+    n_tickers: int
+    n_ok: int = 0
+    failed: List[str] = field(default_factory=list)
+    attempts: int = 0
+    latency_seconds: float = 0.0
+
 
 # --------------------------------------------------
 # Load Universe (ROBUST CSV HANDLING)
@@ -51,16 +80,26 @@ def load_universe(path="universe.csv"):
 # --------------------------------------------------
 # Safe ticker downloader
 # --------------------------------------------------
-def download_ticker_data(ticker, start, end):
+def download_ticker_frame(
+    ticker,
+    start,
+    end,
+    cache: PriceCache | None = None,
+    fetcher: PriceFetcher | None = None,
+):
+    """
+    Return ``(ticker, ohlcv_frame)`` or None on a bad download.
+
+    With a cache, only bars not already on disk are fetched. An explicit
+    ``fetcher`` takes precedence over ``cache.fetcher``, as in
+    ``fetch_in_batches``.
+    """
 
     try:
-        data = yf.download(
-            ticker,
-            start=start,
-            end=end,
-            progress=False,
-            auto_adjust=True,
-        )
+        if cache is not None:
+            data = cache.load(ticker, start, end, fetcher)
+        else:
+            data = (fetcher or YFinanceFetcher()).fetch(ticker, start, end)
 
         # Skip bad downloads
         if data is None or data.empty:
@@ -69,33 +108,260 @@ def download_ticker_data(ticker, start, end):
         if "Close" not in data.columns:
             return None
 
-        series = data["Close"]
+        return ticker, data
 
-        # Ensure we return a pandas Series
-        if not isinstance(series, pd.Series):
-            return None
+    except Exception:
+        return None
 
-        return ticker, series
 
-    except Exception:
+def download_ticker_data(
+    ticker,
+    start,
+    end,
+    cache: PriceCache | None = None,
+    fetcher: PriceFetcher | None = None,
+):
+    """
+    Return ``(ticker, close_series)`` or None on a bad download.
+    """
+
+    result = download_ticker_frame(ticker, start, end, cache, fetcher)
+    if result is None:
         return None
 
+    series = result[1]["Close"]
+
+    # Ensure we return a pandas Series
+    if not isinstance(series, pd.Series):
+        return None
+
+    return ticker, series
+
 
 # --------------------------------------------------
-# Load price data for entire universe
+# Batched multi-symbol downloader
 # --------------------------------------------------
-def load_universe_prices(df_universe, start, end, parallel=True):
+def _fetch_bisecting(
+    fetcher: PriceFetcher,
+    tickers: List[str],
+    start,
+    end,
+) -> Dict[str, pd.DataFrame]:
+    """
+    One multi-symbol request; if it raises, split it in halves.
 
-    tickers = df_universe["Ticker"].tolist()
+    A symbol that makes the provider raise is isolated in O(log n)
+    extra requests, so only it is dropped instead of its whole batch.
+    A provider that fails every request costs up to 2n - 1 requests.
+    """
+    try:
+        return fetch_many(fetcher, tickers, start, end)
+    except Exception:
+        if len(tickers) <= 1:
+            return {}
+
+    mid = len(tickers) // 2
+    frames = _fetch_bisecting(fetcher, tickers[:mid], start, end)
+    frames.update(_fetch_bisecting(fetcher, tickers[mid:], start, end))
+    return frames
+
+
+def _fetch_with_retry(
+    fetcher: PriceFetcher,
+    tickers: List[str],
+    start,
+    end,
+    config: BatchConfig,
+    report: BatchReport,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch one batch, re-requesting only the symbols that failed.
+
+    A request that raises is bisected (see ``_fetch_bisecting``), so a
+    symbol the provider chokes on does not fail the rest of its batch.
+    """
+    frames = {}
+    pending = list(tickers)
 
-    price_data = {}
+    for attempt in range(config.max_retries + 1):
+        if attempt > 0:
+            time.sleep(config.backoff_seconds * 2 ** (attempt - 1))
 
-    if parallel:
+        report.attempts += 1
+        got = _fetch_bisecting(fetcher, pending, start, end)
+
+        frames.update(got)
+        pending = [t for t in pending if t not in got]
+        if not pending:
+            break
+
+    return frames
+
+
+def _run_batch(
+    batch_id: int,
+    tickers: List[str],
+    ranges: Tuple,
+    fetcher: PriceFetcher,
+    config: BatchConfig,
+    cache: PriceCache | None,
+) -> Tuple[Dict[str, pd.DataFrame], BatchReport]:
+
+    report = BatchReport(batch_id=batch_id, n_tickers=len(tickers))
+    started = time.perf_counter()
+
+    frames = {}
+    ok = set()
+    for range_start, range_end in ranges:
+        got = _fetch_with_retry(
+            fetcher,
+            tickers,
+            pd.Timestamp(range_start).strftime("%Y-%m-%d"),
+            pd.Timestamp(range_end).strftime("%Y-%m-%d"),
+            config,
+            report,
+        )
+        ok.update(got)
+
+        for ticker, frame in got.items():
+            if cache is not None:
+                cache.merge(ticker, frame, range_start, range_end)
+            else:
+                frames[ticker] = frame
+
+    report.n_ok = len(ok)
+    report.failed = [t for t in tickers if t not in ok]
+    report.latency_seconds = time.perf_counter() - started
+
+    return frames, report
+
+
+def fetch_in_batches(
+    tickers: List[str],
+    start,
+    end,
+    fetcher: PriceFetcher | None = None,
+    config: BatchConfig = BatchConfig(),
+    cache: PriceCache | None = None,
+) -> Tuple[Dict[str, pd.DataFrame], List[BatchReport]]:
+    """
+    Download bars for many tickers with one request per batch.
+
+    Tickers are grouped into ``config.batch_size`` chunks and batches run
+    on ``config.max_workers`` threads. Symbols missing from a response
+    are retried with exponential backoff; a request that raises is split
+    until the offending symbols are isolated. With a cache, tickers are
+    grouped by the range they are missing so only the tail is requested.
+    An explicit ``fetcher`` takes precedence over ``cache.fetcher``.
+
+    Returns
+    -------
+    frames : dict
+        ticker -> OHLCV DataFrame, in input order
+    reports : list[BatchReport]
+        Per-batch size, failures, attempts and wall-clock latency
+    """
+    fetcher = fetcher or (cache.fetcher if cache is not None else YFinanceFetcher())
+
+    # ----------------------------
+    # Group by missing range
+    # ----------------------------
+    groups = defaultdict(list)
+    for ticker in tickers:
+        if cache is not None:
+            ranges = tuple(cache.plan(ticker, start, end))
+        else:
+            ranges = ((start, end),)
+        if ranges:
+            groups[ranges].append(ticker)
+
+    jobs = []
+    for ranges, group in groups.items():
+        for i in range(0, len(group), config.batch_size):
+            jobs.append((group[i:i + config.batch_size], ranges))
+
+    # ----------------------------
+    # Run batches
+    # ----------------------------
+    fetched = {}
+    reports = []
+
+    with ThreadPoolExecutor(max_workers=max(1, config.max_workers)) as executor:
+        futures = [
+            executor.submit(_run_batch, batch_id, chunk, ranges, fetcher, config, cache)
+            for batch_id, (chunk, ranges) in enumerate(jobs)
+        ]
+        for future in as_completed(futures):
+            frames, report = future.result()
+            fetched.update(frames)
+            reports.append(report)
+
+    reports.sort(key=lambda r: r.batch_id)
+
+    # ----------------------------
+    # Assemble in input order
+    # ----------------------------
+    result = {}
+    for ticker in tickers:
+        frame = (
+            cache.read_range(ticker, start, end)
+            if cache is not None
+            else fetched.get(ticker)
+        )
+        if frame is not None:
+            result[ticker] = frame
+
+    return result, reports
+
+
+# --------------------------------------------------
+# Download raw frames for a universe
+# --------------------------------------------------
+def _download_frames(
+    tickers,
+    start,
+    end,
+    parallel=True,
+    cache: PriceCache | None = None,
+    fetcher: PriceFetcher | None = None,
+    batch_config: BatchConfig | None = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    ticker -> full OHLCV frame, for every ticker that downloaded.
+    """
+
+    fetcher = fetcher or (cache.fetcher if cache is not None else YFinanceFetcher())
+
+    frames = {}
+
+    if batch_config is not None:
+
+        fetched, reports = fetch_in_batches(
+            tickers, start, end, fetcher, batch_config, cache
+        )
+
+        for ticker, frame in fetched.items():
+            if "Close" in frame.columns and isinstance(frame["Close"], pd.Series):
+                frames[ticker] = frame
+
+        if reports:
+            latencies = [r.latency_seconds for r in reports]
+            n_failed = sum(len(r.failed) for r in reports)
+            print(
+                f"Fetched {len(reports)} batches: "
+                f"mean {sum(latencies) / len(latencies):.2f}s, "
+                f"max {max(latencies):.2f}s, "
+                f"{n_failed} failed symbols"
+            )
+
+    elif parallel:
 
         with ThreadPoolExecutor(max_workers=10) as executor:
 
             futures = {
-                executor.submit(download_ticker_data, ticker, start, end): ticker
+                executor.submit(
+                    download_ticker_frame, ticker, start, end, cache, fetcher
+                ): ticker
                 for ticker in tickers
             }
 
@@ -106,22 +372,57 @@ def load_universe_prices(df_universe, start, end, parallel=True):
                 if result is None:
                     continue
 
-                ticker, series = result
+                ticker, frame = result
 
-                price_data[ticker] = series
+                frames[ticker] = frame
 
     else:
 
         for ticker in tickers:
 
-            result = download_ticker_data(ticker, start, end)
+            result = download_ticker_frame(ticker, start, end, cache, fetcher)
 
             if result is None:
                 continue
 
-            ticker, series = result
+            ticker, frame = result
+
+            frames[ticker] = frame
+
+    if cache is not None:
+        print(f"Price cache: {cache.stats.as_dict()}")
+
+    count("load.downloaded", len(frames))
+    count("load.missing", len(tickers) - len(frames))
+
+    return frames
+
+
+# --------------------------------------------------
+# Load price data for entire universe
+# --------------------------------------------------
+@instrument("load.prices", rows=lambda df_universe, *a, **k: len(df_universe))
+def load_universe_prices(
+    df_universe,
+    start,
+    end,
+    parallel=True,
+    cache: PriceCache | None = None,
+    fetcher: PriceFetcher | None = None,
+    batch_config: BatchConfig | None = None,
+):
 
-            price_data[ticker] = series
+    tickers = df_universe["Ticker"].tolist()
+
+    frames = _download_frames(
+        tickers, start, end, parallel, cache, fetcher, batch_config
+    )
+
+    price_data = {
+        ticker: frame["Close"]
+        for ticker, frame in frames.items()
+        if isinstance(frame["Close"], pd.Series)
+    }
 
     # --------------------------------------------------
     # Handle case where no tickers downloaded
@@ -142,3 +443,39 @@ def load_universe_prices(df_universe, start, end, parallel=True):
     df.columns = price_data.keys()
 
     return df.dropna(axis=1, how="all")
+
+
+# --------------------------------------------------
+# Load every OHLCV field for entire universe
+# --------------------------------------------------
+@instrument("load.ohlcv", rows=lambda df_universe, *a, **k: len(df_universe))
+def load_universe_ohlcv(
+    df_universe,
+    start,
+    end,
+    parallel=True,
+    cache: PriceCache | None = None,
+    fetcher: PriceFetcher | None = None,
+    batch_config: BatchConfig | None = None,
+    fields=FIELDS,
+) -> OHLCVPanel:
+    """
+    Download the universe once and keep all OHLCV fields.
+
+    Returns an ``OHLCVPanel`` (one dates x tickers array per field) in
+    universe order, so liquidity filters and ADV / volatility estimates
+    run off the same structure as the close matrix.
+    """
+
+    tickers = df_universe["Ticker"].tolist()
+
+    frames = _download_frames(
+        tickers, start, end, parallel, cache, fetcher, batch_config
+    )
+
+    ordered = {ticker: frames[ticker] for ticker in tickers if ticker in frames}
+    panel = OHLCVPanel.from_frames(ordered, fields)
+
+    print(f"Downloaded OHLCV panel: {panel.shape[0]} dates x {panel.shape[1]} tickers")
+
+    return panel
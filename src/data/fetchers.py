@@ -0,0 +1,170 @@
+# src/data/fetchers.py
+
+"""
+Price data providers.
+
+Purpose
+-------
+Isolate the upstream data source behind a small interface so that the
+loader and the on-disk cache can be driven by yfinance in production
+and by a local fake provider in tests (no network).
+
+A fetcher returns a daily OHLCV DataFrame indexed by date, or None when
+the provider has no data for the requested range. Providers that can
+serve several symbols in one request also implement ``fetch_many``.
+"""
+
+import threading
+from typing import Dict, List, Protocol
+
+import pandas as pd
+import yfinance as yf
+
+
+# -------------------------------------------------------------------
+# Interface
+# -------------------------------------------------------------------
+
+class PriceFetcher(Protocol):
+
+    def fetch(self, ticker: str, start, end) -> pd.DataFrame | None:
+        """
+        Return daily bars for ``ticker`` in [start, end), or None.
+        """
+        ...
+
+
+class BatchPriceFetcher(PriceFetcher, Protocol):
+
+    def fetch_many(
+        self,
+        tickers: List[str],
+        start,
+        end
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Return bars per ticker for [start, end); failed symbols are omitted.
+        """
+        ...
+
+
+def fetch_many(fetcher: PriceFetcher, tickers: List[str], start, end) -> Dict[str, pd.DataFrame]:
+    """
+    Multi-symbol fetch, falling back to one request per ticker.
+    """
+    if hasattr(fetcher, "fetch_many"):
+        return fetcher.fetch_many(tickers, start, end)
+
+    frames = {}
+    for ticker in tickers:
+        frame = fetcher.fetch(ticker, start, end)
+        if frame is not None and not frame.empty:
+            frames[ticker] = frame
+    return frames
+
+
+# -------------------------------------------------------------------
+# yfinance provider
+# -------------------------------------------------------------------
+
+class YFinanceFetcher:
+    """
+    Fetch adjusted daily bars through ``yf.download``.
+    """
+
+    def fetch(self, ticker: str, start, end) -> pd.DataFrame | None:
+        data = yf.download(
+            ticker,
+            start=start,
+            end=end,
+            progress=False,
+            auto_adjust=True,
+        )
+
+        if data is None or data.empty:
+            return None
+
+        # Newer yfinance returns (field, ticker) columns even for one symbol
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = data.columns.get_level_values(0)
+
+        return data
+
+    def fetch_many(
+        self,
+        tickers: List[str],
+        start,
+        end
+    ) -> Dict[str, pd.DataFrame]:
+        data = yf.download(
+            tickers,
+            start=start,
+            end=end,
+            progress=False,
+            auto_adjust=True,
+            group_by="ticker",
+            threads=False,
+        )
+
+        if data is None or data.empty:
+            return {}
+
+        # Older yfinance drops the ticker level for a single symbol
+        if not isinstance(data.columns, pd.MultiIndex):
+            return {tickers[0]: data} if len(tickers) == 1 else {}
+
+        frames = {}
+        available = set(data.columns.get_level_values(0))
+        for ticker in tickers:
+            if ticker not in available:
+                continue
+            frame = data[ticker].dropna(how="all")
+            if not frame.empty:
+                frames[ticker] = frame
+        return frames
+
+
+# -------------------------------------------------------------------
+# In-memory provider
+# -------------------------------------------------------------------
+
+class InMemoryFetcher:
+    """
+    Serve bars from in-memory frames (tests and offline runs).
+
+    Every request is recorded in ``calls`` as ``(tickers, start, end)``.
+    """
+
+    def __init__(self, frames: Dict[str, pd.DataFrame]):
+        self.frames = frames
+        self.calls: List[tuple] = []
+        self._lock = threading.Lock()
+
+    def _slice(self, ticker: str, start, end) -> pd.DataFrame | None:
+        frame = self.frames.get(ticker)
+        if frame is None:
+            return None
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        frame = frame[(frame.index >= start) & (frame.index < end)]
+        return frame.copy() if not frame.empty else None
+
+    def fetch(self, ticker: str, start, end) -> pd.DataFrame | None:
+        with self._lock:
+            self.calls.append(([ticker], start, end))
+        return self._slice(ticker, start, end)
+
+    def fetch_many(
+        self,
+        tickers: List[str],
+        start,
+        end
+    ) -> Dict[str, pd.DataFrame]:
+        with self._lock:
+            self.calls.append((list(tickers), start, end))
+
+        frames = {}
+        for ticker in tickers:
+            frame = self._slice(ticker, start, end)
+            if frame is not None:
+                frames[ticker] = frame
+        return frames
@@ -0,0 +1,221 @@
+"""
+Multi-field OHLCV panel.
+
+Purpose
+-------
+Keep every downloaded bar field, not just ``Close``, in one compact
+in-memory structure:
+
+- one dates x tickers array per field (Open, High, Low, Close, Volume)
+- all fields share the same date and ticker axes
+- liquidity and volatility inputs (ADV, average price, return
+  volatility) are computed vectorized over the arrays
+
+``OHLCVPanel`` also answers the ``price_data[ticker]`` /
+``price_data["Volume"]`` lookups used by ``src/filter_universe.py``,
+and ``snapshot`` builds the per-ticker table expected by
+``src/universe.py`` (``ticker``, ``price``, ``adv``) and
+``UniverseManager`` (``symbol``, ``price``, ``avg_volume``).
+"""
+
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+
+class OHLCVPanel:
+    """
+    Field -> (dates x tickers) arrays on shared axes.
+
+    Parameters
+    ----------
+    dates : DatetimeIndex
+        Sorted bar dates (union over tickers)
+    tickers : sequence of str
+        Column order shared by every field
+    fields : dict
+        Field name -> array of shape (len(dates), len(tickers)); NaN
+        where a ticker has no bar
+    """
+
+    def __init__(self, dates: pd.DatetimeIndex, tickers: Sequence[str], fields: Dict[str, np.ndarray]):
+        self.dates = pd.DatetimeIndex(dates)
+        self.tickers: List[str] = list(tickers)
+        self.fields = fields
+        self._columns = {t: i for i, t in enumerate(self.tickers)}
+
+        shape = (len(self.dates), len(self.tickers))
+        for name, values in fields.items():
+            if values.shape != shape:
+                raise ValueError(f"Field {name} has shape {values.shape}, expected {shape}")
+
+    # ----------------------------
+    # Construction
+    # ----------------------------
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Mapping[str, pd.DataFrame],
+        fields: Sequence[str] = FIELDS,
+        dtype=np.float64
+    ) -> "OHLCVPanel":
+        """
+        Align per-ticker OHLCV frames onto one date axis.
+
+        Tickers keep mapping order; fields missing from a ticker's frame
+        stay NaN for that ticker.
+        """
+        frames = {t: f for t, f in frames.items() if f is not None and not f.empty}
+        tickers = list(frames)
+
+        if tickers:
+            dates = pd.DatetimeIndex(
+                np.unique(np.concatenate([
+                    pd.DatetimeIndex(f.index).to_numpy(dtype="datetime64[ns]")
+                    for f in frames.values()
+                ]))
+            )
+        else:
+            dates = pd.DatetimeIndex([])
+
+        arrays = {
+            name: np.full((len(dates), len(tickers)), np.nan, dtype=dtype)
+            for name in fields
+        }
+
+        for j, (ticker, frame) in enumerate(frames.items()):
+            rows = dates.get_indexer(pd.DatetimeIndex(frame.index))
+            for name in fields:
+                if name in frame.columns:
+                    arrays[name][rows, j] = frame[name].to_numpy(dtype=dtype)
+
+        return cls(dates, tickers, arrays)
+
+    # ----------------------------
+    # Access
+    # ----------------------------
+    @property
+    def columns(self) -> pd.Index:
+        return pd.Index(self.tickers)
+
+    @property
+    def shape(self):
+        return (len(self.dates), len(self.tickers))
+
+    def __contains__(self, key) -> bool:
+        return key in self.fields or key in self._columns
+
+    def __getitem__(self, key):
+        """
+        Field name -> DataFrame (dates x tickers); ticker -> Close series.
+        """
+        if key in self.fields:
+            return self.frame(key)
+        if key in self._columns:
+            return pd.Series(self.field("Close")[:, self._columns[key]], index=self.dates, name=key)
+        raise KeyError(key)
+
+    def field(self, name: str) -> np.ndarray:
+        return self.fields[name]
+
+    def frame(self, name: str) -> pd.DataFrame:
+        return pd.DataFrame(self.fields[name], index=self.dates, columns=self.tickers)
+
+    @property
+    def close(self) -> pd.DataFrame:
+        return self.frame("Close")
+
+    def ticker_index(self, ticker: str) -> int:
+        return self._columns[ticker]
+
+    def select(self, tickers: Sequence[str]) -> "OHLCVPanel":
+        idx = [self._columns[t] for t in tickers]
+        return OHLCVPanel(
+            self.dates, tickers, {name: a[:, idx] for name, a in self.fields.items()}
+        )
+
+    def between(self, start=None, end=None) -> "OHLCVPanel":
+        """
+        Row slice (views) with start <= date <= end.
+        """
+        lo = 0 if start is None else int(self.dates.searchsorted(pd.Timestamp(start), side="left"))
+        hi = len(self.dates) if end is None else int(self.dates.searchsorted(pd.Timestamp(end), side="right"))
+        return OHLCVPanel(
+            self.dates[lo:hi], self.tickers, {name: a[lo:hi] for name, a in self.fields.items()}
+        )
+
+    # ----------------------------
+    # Vectorized liquidity / risk inputs
+    # ----------------------------
+    def _trailing(self, name: str, window: int | None) -> np.ndarray:
+        values = self.fields[name]
+        return values if window is None else values[-window:]
+
+    def _nanmean(self, values: np.ndarray) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            count = (~np.isnan(values)).sum(axis=0)
+            return np.where(count > 0, np.nansum(values, axis=0) / np.maximum(count, 1), np.nan)
+
+    def adv(self, window: int | None = None) -> pd.Series:
+        """
+        Average daily share volume per ticker over the trailing window.
+        """
+        return pd.Series(self._nanmean(self._trailing("Volume", window)), index=self.tickers, name="adv")
+
+    def avg_price(self, window: int | None = None) -> pd.Series:
+        return pd.Series(self._nanmean(self._trailing("Close", window)), index=self.tickers, name="avg_price")
+
+    def dollar_volume(self, window: int | None = None) -> pd.Series:
+        """
+        Average Close * Volume per ticker over the trailing window.
+        """
+        value = self._trailing("Close", window) * self._trailing("Volume", window)
+        return pd.Series(self._nanmean(value), index=self.tickers, name="dollar_volume")
+
+    def last_price(self) -> pd.Series:
+        """
+        Last valid close per ticker.
+        """
+        close = self.fields["Close"]
+        values = np.full(close.shape[1], np.nan)
+
+        if len(close):
+            valid = ~np.isnan(close)
+            last_row = len(close) - 1 - np.argmax(valid[::-1], axis=0)
+            has = np.flatnonzero(valid.any(axis=0))
+            values[has] = close[last_row[has], has]
+
+        return pd.Series(values, index=self.tickers, name="price")
+
+    def volatility(self, window: int | None = None) -> pd.Series:
+        """
+        Std (ddof=1) of daily close-to-close returns over the trailing window.
+        """
+        close = self._trailing("Close", None if window is None else window + 1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            returns = close[1:] / close[:-1] - 1.0
+            vol = pd.DataFrame(returns).std(axis=0).to_numpy()
+        return pd.Series(vol, index=self.tickers, name="volatility")
+
+    def snapshot(self, window: int = 20) -> pd.DataFrame:
+        """
+        Per-ticker liquidity table for the universe filters.
+
+        Columns: ticker, symbol, price (last close), adv / avg_volume
+        (trailing mean volume), avg_price, dollar_volume, volatility.
+        """
+        adv = self.adv(window).to_numpy()
+        return pd.DataFrame({
+            "ticker": self.tickers,
+            "symbol": self.tickers,
+            "price": self.last_price().to_numpy(),
+            "adv": adv,
+            "avg_volume": adv,
+            "avg_price": self.avg_price(window).to_numpy(),
+            "dollar_volume": self.dollar_volume(window).to_numpy(),
+            "volatility": self.volatility(window).to_numpy(),
+        })
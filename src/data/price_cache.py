@@ -0,0 +1,281 @@
+# src/data/price_cache.py
+
+"""
+On-disk columnar price cache.
+
+Purpose
+-------
+Avoid re-downloading full histories on every run:
+
+- one columnar file per ticker (Parquet when an engine is installed,
+  pickle otherwise) plus a small JSON sidecar with the covered range
+- a load only fetches the part of [start, end) that is not yet covered
+  (typically the tail since the last cached bar) and merges it in
+- hit / partial-hit / miss and byte counters for tuning
+
+Coverage is tracked as the requested range rather than the range of
+returned bars, so tickers that list after ``start`` are not re-fetched
+every run. Fetches that return no data are not recorded as covered.
+"""
+
+import importlib.util
+import json
+import os
+import threading
+from dataclasses import dataclass, asdict
+from typing import List, Tuple
+
+import pandas as pd
+
+from src.data.fetchers import PriceFetcher, YFinanceFetcher
+
+
+DEFAULT_CACHE_DIR = "data_cache/prices"
+
+
+def _parquet_available() -> bool:
+    return any(
+        importlib.util.find_spec(engine) is not None
+        for engine in ("pyarrow", "fastparquet")
+    )
+
+
+# -------------------------------------------------------------------
+# Statistics
+# -------------------------------------------------------------------
+
+@dataclass
+class CacheStats:
+    hits: int = 0            # request fully served from disk
+    partial_hits: int = 0    # request needed a top-up fetch
+    misses: int = 0          # nothing cached for the ticker
+    bytes_read: int = 0
+    bytes_written: int = 0
+    rows_fetched: int = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+# -------------------------------------------------------------------
+# Cache
+# -------------------------------------------------------------------
+
+class PriceCache:
+    """
+    Per-ticker price store with incremental top-up from a fetcher.
+    """
+
+    def __init__(
+        self,
+        root: str = DEFAULT_CACHE_DIR,
+        fetcher: PriceFetcher | None = None,
+        file_format: str | None = None
+    ):
+        if file_format is None:
+            file_format = "parquet" if _parquet_available() else "pickle"
+        if file_format not in ("parquet", "pickle"):
+            raise ValueError(f"Unsupported cache format: {file_format}")
+
+        self.root = root
+        self.fetcher = fetcher or YFinanceFetcher()
+        self.file_format = file_format
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+        os.makedirs(self.root, exist_ok=True)
+
+    # ----------------------------
+    # Paths
+    # ----------------------------
+    def _stem(self, ticker: str) -> str:
+        safe = ticker.replace("/", "_").replace("\\", "_")
+        return os.path.join(self.root, safe)
+
+    def _data_path(self, ticker: str) -> str:
+        ext = "parquet" if self.file_format == "parquet" else "pkl"
+        return f"{self._stem(ticker)}.{ext}"
+
+    def _meta_path(self, ticker: str) -> str:
+        return f"{self._stem(ticker)}.meta.json"
+
+    # ----------------------------
+    # Coverage
+    # ----------------------------
+    def coverage(self, ticker: str) -> Tuple[pd.Timestamp, pd.Timestamp] | None:
+        """
+        Return the cached [start, end) range for a ticker, if any.
+        """
+        meta_path = self._meta_path(ticker)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return pd.Timestamp(meta["start"]), pd.Timestamp(meta["end"])
+
+    def missing_ranges(
+        self,
+        ticker: str,
+        start,
+        end
+    ) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Sub-ranges of [start, end) that must be fetched for a ticker.
+        """
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        covered = self.coverage(ticker)
+
+        if covered is None:
+            return [(start, end)]
+
+        cov_start, cov_end = covered
+        gaps = []
+        if start < cov_start:
+            gaps.append((start, cov_start))
+        if end > cov_end:
+            gaps.append((cov_end, end))
+        return gaps
+
+    # ----------------------------
+    # Disk IO
+    # ----------------------------
+    def _read(self, ticker: str) -> pd.DataFrame | None:
+        path = self._data_path(ticker)
+        if not os.path.exists(path):
+            return None
+
+        if self.file_format == "parquet":
+            frame = pd.read_parquet(path)
+        else:
+            frame = pd.read_pickle(path)
+
+        with self._lock:
+            self.stats.bytes_read += os.path.getsize(path)
+        return frame
+
+    def _write(self, ticker: str, frame: pd.DataFrame, covered: Tuple) -> None:
+        path = self._data_path(ticker)
+
+        if self.file_format == "parquet":
+            frame.to_parquet(path)
+        else:
+            frame.to_pickle(path)
+
+        # Sidecar is written last so a crash never claims unsaved data
+        with open(self._meta_path(ticker), "w") as f:
+            json.dump(
+                {
+                    "start": covered[0].isoformat(),
+                    "end": covered[1].isoformat(),
+                    "rows": len(frame),
+                },
+                f,
+            )
+
+        with self._lock:
+            self.stats.bytes_written += os.path.getsize(path)
+
+    # ----------------------------
+    # Public API
+    # ----------------------------
+    def merge(self, ticker: str, fetched: pd.DataFrame, start, end) -> pd.DataFrame:
+        """
+        Merge freshly fetched bars for [start, end) into the store.
+
+        Newer bars win on overlapping dates. The covered range is only
+        extended to the closing day, because today's bar is still moving.
+
+        Returns
+        -------
+        DataFrame
+            Full cached history for the ticker after the merge
+        """
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        end = min(end, pd.Timestamp.today().normalize())
+
+        cached = self._read(ticker)
+        covered = self.coverage(ticker)
+
+        if cached is not None and not cached.empty:
+            frame = pd.concat([cached, fetched])
+            frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+        else:
+            frame = fetched.sort_index()
+
+        if covered is not None:
+            start = min(start, covered[0])
+            end = max(end, covered[1])
+
+        self._write(ticker, frame, (start, max(start, end)))
+
+        with self._lock:
+            self.stats.rows_fetched += len(fetched)
+
+        return frame
+
+    def plan(self, ticker: str, start, end) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Return the ranges to fetch for a request and record the lookup.
+        """
+        had_coverage = self.coverage(ticker) is not None
+        gaps = self.missing_ranges(ticker, start, end)
+
+        with self._lock:
+            if not gaps:
+                self.stats.hits += 1
+            elif had_coverage:
+                self.stats.partial_hits += 1
+            else:
+                self.stats.misses += 1
+
+        return gaps
+
+    def read_range(self, ticker: str, start, end) -> pd.DataFrame | None:
+        """
+        Return cached bars for [start, end) without fetching.
+        """
+        frame = self._read(ticker)
+        if frame is None or frame.empty:
+            return None
+
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        frame = frame[(frame.index >= start) & (frame.index < end)]
+        return frame if not frame.empty else None
+
+    def load(
+        self,
+        ticker: str,
+        start,
+        end,
+        fetcher: PriceFetcher | None = None
+    ) -> pd.DataFrame | None:
+        """
+        Return bars for [start, end), fetching only what is not cached.
+
+        ``fetcher`` overrides the cache's own fetcher for this call.
+        """
+        fetcher = fetcher or self.fetcher
+        for gap_start, gap_end in self.plan(ticker, start, end):
+            fetched = fetcher.fetch(
+                ticker,
+                gap_start.strftime("%Y-%m-%d"),
+                gap_end.strftime("%Y-%m-%d"),
+            )
+            if fetched is None or fetched.empty:
+                continue
+            self.merge(ticker, fetched, gap_start, gap_end)
+
+        return self.read_range(ticker, start, end)
+
+    def clear(self, ticker: str | None = None) -> None:
+        """
+        Remove one ticker (or everything) from the store.
+        """
+        if ticker is not None:
+            names = [self._data_path(ticker), self._meta_path(ticker)]
+        else:
+            names = [os.path.join(self.root, n) for n in os.listdir(self.root)]
+
+        for path in names:
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,252 @@
+"""
+Memory-mapped price matrix on disk.
+
+Purpose
+-------
+Persist a dates x tickers price matrix once and open it from any number
+of processes without rebuilding or unpickling a DataFrame:
+
+    <root>/
+        CURRENT           name of the live version directory
+        v<timestamp>/
+            meta.json     shape, dtype, format version
+            dates.npy     int64 nanosecond timestamps (sorted)
+            tickers.json  column order
+            values.bin    contiguous C-order values (float32 or float64)
+
+Each write goes to a fresh version directory and then swaps ``CURRENT``
+with an atomic rename, so a reader always opens one complete matrix.
+The previous version is kept for readers that resolved ``CURRENT``
+just before the swap; older ones are removed.
+
+``open_price_matrix`` maps ``values.bin`` read-only with
+``numpy.memmap``; row (date-range) slices are zero-copy views and only
+the pages actually touched are read. A ``PriceMatrix`` pickles as its
+path plus row window, so sending one to a worker process re-maps the
+file instead of copying the data.
+"""
+
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+FORMAT_VERSION = 1
+
+POINTER = "CURRENT"
+_FILES = ("meta.json", "dates.npy", "tickers.json", "values.bin")
+
+
+# -------------------------------------------------------------------
+# Writer
+# -------------------------------------------------------------------
+
+def write_price_matrix(prices: pd.DataFrame, root, dtype=np.float32) -> Path:
+    """
+    Write ``prices`` (index = dates, columns = tickers) under ``root``.
+
+    The data goes to a new version directory that ``CURRENT`` is then
+    atomically pointed at, so readers never see a half-written matrix.
+    Returns the version directory.
+    """
+    root = Path(root)
+    dtype = np.dtype(dtype)
+
+    prices = prices.sort_index()
+    dates = pd.DatetimeIndex(prices.index)
+    values = np.ascontiguousarray(prices.to_numpy(dtype=dtype))
+
+    root.mkdir(parents=True, exist_ok=True)
+    previous = _current_version(root)
+
+    version = f"v{time.time_ns()}"
+    path = root / version
+    path.mkdir()
+
+    values.tofile(path / "values.bin")
+    np.save(path / "dates.npy", dates.to_numpy(dtype="datetime64[ns]").view(np.int64))
+    with open(path / "tickers.json", "w") as f:
+        json.dump([str(t) for t in prices.columns], f)
+    with open(path / "meta.json", "w") as f:
+        json.dump({
+            "version": FORMAT_VERSION,
+            "dtype": dtype.str,
+            "shape": list(values.shape),
+        }, f)
+
+    tmp = root / (POINTER + ".tmp")
+    tmp.write_text(version)
+    os.replace(tmp, root / POINTER)
+
+    _prune(root, keep={version, previous})
+    return path
+
+
+def _current_version(root: Path) -> str | None:
+    try:
+        return (root / POINTER).read_text().strip()
+    except FileNotFoundError:
+        return None
+
+
+def _prune(root: Path, keep: set) -> None:
+    """
+    Drop superseded version directories and any unversioned layout.
+    """
+    for child in root.iterdir():
+        if child.is_dir() and child.name.startswith("v") and child.name not in keep:
+            shutil.rmtree(child, ignore_errors=True)
+        elif child.name in _FILES:
+            child.unlink()
+
+
+# -------------------------------------------------------------------
+# Reader
+# -------------------------------------------------------------------
+
+class PriceMatrix:
+    """
+    Read-only view of an on-disk price matrix.
+
+    Attributes
+    ----------
+    values : np.memmap
+        Shape (dates, tickers); slicing rows does not read the file
+    dates : pd.DatetimeIndex
+    tickers : list[str]
+    """
+
+    def __init__(self, path, values: np.ndarray, dates: pd.DatetimeIndex, tickers: List[str], rows: slice):
+        self.path = Path(path)
+        self.values = values
+        self.dates = dates
+        self.tickers = tickers
+        self._rows = rows
+        self._columns: Dict[str, int] = {t: i for i, t in enumerate(tickers)}
+
+    def __reduce__(self):
+        return _reopen, (str(self.path), self._rows.start, self._rows.stop)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.values, dtype=dtype)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    # ----------------------------
+    # Lookup
+    # ----------------------------
+    def ticker_index(self, ticker: str) -> int:
+        try:
+            return self._columns[ticker]
+        except KeyError:
+            raise KeyError(f"Ticker not in price matrix: {ticker}") from None
+
+    def date_index(self, date) -> int:
+        """
+        Row of ``date``; raises KeyError if the date is not present.
+        """
+        i = int(self.dates.searchsorted(pd.Timestamp(date)))
+        if i >= len(self.dates) or self.dates[i] != pd.Timestamp(date):
+            raise KeyError(f"Date not in price matrix: {date}")
+        return i
+
+    def price(self, date, ticker: str) -> float:
+        return float(self.values[self.date_index(date), self.ticker_index(ticker)])
+
+    def column(self, ticker: str) -> np.ndarray:
+        """
+        Strided view of one ticker's prices.
+        """
+        return self.values[:, self.ticker_index(ticker)]
+
+    def series(self, ticker: str) -> pd.Series:
+        return pd.Series(np.asarray(self.column(ticker)), index=self.dates, name=ticker)
+
+    # ----------------------------
+    # Slicing
+    # ----------------------------
+    def between(self, start=None, end=None) -> "PriceMatrix":
+        """
+        Zero-copy view of rows with start <= date <= end (inclusive).
+        """
+        lo = 0 if start is None else int(self.dates.searchsorted(pd.Timestamp(start), side="left"))
+        hi = len(self.dates) if end is None else int(self.dates.searchsorted(pd.Timestamp(end), side="right"))
+        hi = max(lo, hi)
+
+        base = self._rows.start or 0
+        return PriceMatrix(
+            self.path,
+            self.values[lo:hi],
+            self.dates[lo:hi],
+            self.tickers,
+            slice(base + lo, base + hi),
+        )
+
+    def select(self, tickers: Sequence[str]) -> np.ndarray:
+        """
+        Copy of the requested columns, shape (dates, len(tickers)).
+        """
+        return self.values[:, [self.ticker_index(t) for t in tickers]]
+
+    def to_frame(self, tickers: Sequence[str] | None = None) -> pd.DataFrame:
+        if tickers is None:
+            return pd.DataFrame(np.asarray(self.values), index=self.dates, columns=self.tickers)
+        return pd.DataFrame(self.select(tickers), index=self.dates, columns=list(tickers))
+
+
+def open_price_matrix(root) -> PriceMatrix:
+    """
+    Map a matrix written by ``write_price_matrix`` (read-only).
+
+    ``root`` may be the matrix root (its current version is opened) or
+    a version directory.
+    """
+    root = Path(root)
+    version = _current_version(root)
+    if version is not None:
+        root = root / version
+
+    with open(root / "meta.json") as f:
+        meta = json.load(f)
+    if meta.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported price matrix version: {meta.get('version')}")
+
+    with open(root / "tickers.json") as f:
+        tickers = json.load(f)
+    dates = pd.DatetimeIndex(np.load(root / "dates.npy").view("datetime64[ns]"))
+
+    shape = tuple(meta["shape"])
+    if shape[0] * shape[1] == 0:
+        values = np.empty(shape, dtype=meta["dtype"])
+    else:
+        values = np.memmap(root / "values.bin", dtype=meta["dtype"], mode="r", shape=shape)
+
+    return PriceMatrix(root, values, dates, tickers, slice(0, shape[0]))
+
+
+def _reopen(path: str, start: int, stop: int) -> PriceMatrix:
+    matrix = open_price_matrix(path)
+    if (start, stop) == (0, len(matrix)):
+        return matrix
+    return PriceMatrix(
+        matrix.path,
+        matrix.values[start:stop],
+        matrix.dates[start:stop],
+        matrix.tickers,
+        slice(start, stop),
+    )
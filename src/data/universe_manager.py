@@ -8,12 +8,16 @@ Supports:
 - periodic universe refresh
 - liquidity and data-quality filtering
 - graceful symbol entry/exit
+- incremental refresh from per-symbol deltas (``apply_updates``), with
+  entered / exited symbol lists
 
-This module is intentionally conservative and deterministic.
+This module is intentionally conservative and deterministic: ties in
+liquidity are broken by symbol, so full and incremental refreshes agree.
 """
 
-from dataclasses import dataclass
-from typing import List
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
 import pandas as pd
 
 
@@ -29,6 +33,13 @@ class UniverseConfig:
     max_universe_size: int | None = None
 
 
+@dataclass
+class UniverseChange:
+    day: int
+    entered: List[str] = field(default_factory=list)
+    exited: List[str] = field(default_factory=list)
+
+
 # -------------------------------------------------------------------
 # Core universe logic
 # -------------------------------------------------------------------
@@ -43,6 +54,13 @@ class UniverseManager:
         self._last_refresh_day: int | None = None
         self._current_universe: List[str] = []
 
+        # Incremental state: latest (price, avg_volume) per symbol and the
+        # eligible symbols as sorted (-avg_volume, symbol) keys
+        self._records: Dict[str, Tuple[float, float]] = {}
+        self._ranked: List[Tuple[float, str]] = []
+        self._dirty = False
+        self.last_change: UniverseChange | None = None
+
     def should_refresh(self, day: int) -> bool:
         """
         Determine whether the universe should be refreshed.
@@ -93,13 +111,25 @@ class UniverseManager:
         df = df[df["avg_volume"] >= self.config.min_avg_volume]
 
         # ----------------------------
-        # Sort by liquidity
+        # Sort by liquidity (ties by symbol)
         # ----------------------------
         df = df.sort_values(
-            by="avg_volume",
-            ascending=False
+            by=["avg_volume", "symbol"],
+            ascending=[False, True],
+            kind="mergesort"
         )
 
+        # ----------------------------
+        # Rebuild incremental state
+        # ----------------------------
+        previous = set(self._current_universe)
+
+        self._records = dict(zip(
+            universe_df["symbol"],
+            zip(universe_df["price"], universe_df["avg_volume"]),
+        ))
+        self._ranked = list(zip(-df["avg_volume"], df["symbol"]))
+
         # ----------------------------
         # Cap universe size
         # ----------------------------
@@ -111,12 +141,146 @@ class UniverseManager:
         # ----------------------------
         self._current_universe = df["symbol"].tolist()
         self._last_refresh_day = day
+        self._dirty = False
+
+        current = set(self._current_universe)
+        self.last_change = UniverseChange(
+            day=day,
+            entered=[s for s in self._current_universe if s not in previous],
+            exited=sorted(previous - current),
+        )
 
         return self._current_universe
 
+    # ----------------------------
+    # Incremental refresh
+    # ----------------------------
+    def _eligible(self, price: float, avg_volume: float) -> bool:
+        return price >= self.config.min_price and avg_volume >= self.config.min_avg_volume
+
+    def _cutoff(self) -> Tuple[float, str] | None:
+        """
+        Key of the last member, or None when every eligible symbol is in.
+        """
+        cap = self.config.max_universe_size
+        if cap is None or len(self._ranked) <= cap:
+            return None
+        return self._ranked[cap - 1] if cap > 0 else (float("-inf"), "")
+
+    @staticmethod
+    def _within(key: Tuple[float, str] | None, cutoff: Tuple[float, str] | None) -> bool:
+        return key is not None and (cutoff is None or key <= cutoff)
+
+    def apply_updates(
+        self,
+        day: int,
+        updates: pd.DataFrame | None = None,
+        removed: Iterable[str] = ()
+    ) -> UniverseChange:
+        """
+        Apply per-symbol deltas instead of re-filtering and re-sorting.
+
+        Each changed symbol is located by bisection in O(log n), but the
+        list insert / delete shifts the tail, so the worst case is
+        O(changes * n) element moves (a memmove, far cheaper than the
+        full filter and sort) plus the symbols that actually cross the
+        ``max_universe_size`` boundary. The resulting universe is the
+        one ``refresh_universe`` would build from the same data.
+
+        Parameters
+        ----------
+        day : int
+            Simulation day index
+        updates : DataFrame, optional
+            Changed or newly listed symbols: symbol, price, avg_volume
+        removed : iterable of str
+            Delisted / dropped symbols
+
+        Returns
+        -------
+        UniverseChange
+            Symbols that entered / exited the universe, by liquidity
+        """
+        changes: Dict[str, Tuple[float, float] | None] = {}
+        if updates is not None and len(updates):
+            changes.update(zip(
+                updates["symbol"],
+                zip(updates["price"], updates["avg_volume"]),
+            ))
+        for symbol in removed:
+            changes[symbol] = None
+
+        old_cut = self._cutoff()
+
+        # ----------------------------
+        # Re-rank changed symbols
+        # ----------------------------
+        old_keys = {}
+        new_keys = {}
+        for symbol, record in changes.items():
+            previous = self._records.get(symbol)
+            old_key = None
+            if previous is not None and self._eligible(*previous):
+                old_key = (-previous[1], symbol)
+                del self._ranked[bisect_left(self._ranked, old_key)]
+
+            new_key = None
+            if record is None:
+                self._records.pop(symbol, None)
+            else:
+                self._records[symbol] = record
+                if self._eligible(*record):
+                    new_key = (-record[1], symbol)
+                    insort(self._ranked, new_key)
+
+            old_keys[symbol] = old_key
+            new_keys[symbol] = new_key
+
+        new_cut = self._cutoff()
+
+        # ----------------------------
+        # Membership changes
+        # ----------------------------
+        entered = []
+        exited = []
+
+        for symbol in changes:
+            was = self._within(old_keys[symbol], old_cut)
+            now = self._within(new_keys[symbol], new_cut)
+            if now and not was:
+                entered.append(new_keys[symbol])
+            elif was and not now:
+                exited.append(old_keys[symbol])
+
+        # Unchanged symbols only move across the boundary if it shifted
+        if old_cut != new_cut:
+            inf = (float("inf"), "")
+            lo, hi = sorted([old_cut or inf, new_cut or inf])
+            for key in self._ranked[bisect_right(self._ranked, lo):bisect_right(self._ranked, hi)]:
+                if key[1] in changes:
+                    continue
+                if self._within(key, new_cut):
+                    entered.append(key)
+                else:
+                    exited.append(key)
+
+        self._last_refresh_day = day
+        self._dirty = True
+
+        self.last_change = UniverseChange(
+            day=day,
+            entered=[symbol for _, symbol in sorted(entered)],
+            exited=[symbol for _, symbol in sorted(exited)],
+        )
+        return self.last_change
+
     def get_universe(self) -> List[str]:
         """
         Return the currently active universe.
         """
+        if self._dirty:
+            cap = self.config.max_universe_size
+            ranked = self._ranked if cap is None else self._ranked[:cap]
+            self._current_universe = [symbol for _, symbol in ranked]
+            self._dirty = False
         return list(self._current_universe)
-
@@ -0,0 +1,318 @@
+"""
+Vectorized event-driven backtest engine.
+
+Purpose
+-------
+Run the momentum strategy from ``quant_simulator.py`` over a
+dates x tickers price matrix without re-slicing history every day:
+
+- signal matrices are precomputed once with rolling means
+- the day loop only visits tickers that can actually trade
+- equity is a dot product over held positions
+
+The fills, trade log and equity curve are identical to the per-day
+loop in ``quant_simulator.py`` on the same (date-aligned) inputs.
+
+``run_mean_reversion_backtest`` runs the z-score strategy from
+``src.strategy.signals`` with the ``config.py`` sizing and cost
+parameters, for parameter sweeps.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config.config import (
+    BUY_ZSCORE,
+    INITIAL_CAPITAL,
+    LOOKBACK,
+    MAX_POSITION_PCT,
+    SELL_ZSCORE,
+    TRANSACTION_COST,
+)
+from src.portfolio.performance import PerformanceTracker
+from src.strategy.signals import BUY, SELL, generate_signals
+
+
+# -------------------------------------------------------------------
+# Configuration
+# -------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class MomentumConfig:
+    fast_window: int = 5
+    slow_window: int = 20
+    band: float = 0.01      # fast must clear slow by this fraction
+
+
+@dataclass(frozen=True)
+class MeanReversionConfig:
+    lookback: int = LOOKBACK
+    buy_zscore: float = BUY_ZSCORE
+    sell_zscore: float = SELL_ZSCORE
+    max_position_pct: float = MAX_POSITION_PCT
+    transaction_cost: float = TRANSACTION_COST
+
+
+@dataclass
+class BacktestResult:
+    trade_log: List[Tuple] = field(default_factory=list)
+    equity_curve: pd.Series | None = None
+    drawdown: pd.Series | None = None
+    cash: float = 0.0
+    positions: dict = field(default_factory=dict)
+
+
+# -------------------------------------------------------------------
+# Signal precomputation
+# -------------------------------------------------------------------
+
+def momentum_signal_matrix(
+    prices: pd.DataFrame,
+    config: MomentumConfig = MomentumConfig()
+) -> np.ndarray:
+    """
+    Compute the momentum signal for every (date, ticker) in one pass.
+
+    Equivalent to evaluating the script's per-day rolling(5) vs rolling(20)
+    check on ``series.iloc[:day + 1]``: rolling means at row ``day`` only
+    depend on rows up to ``day``, and warm-up rows are NaN, i.e. HOLD.
+
+    Returns
+    -------
+    np.ndarray
+        int8 matrix of BUY / SELL / HOLD codes, shape (dates, tickers)
+    """
+    fast = prices.rolling(config.fast_window).mean().to_numpy()
+    slow = prices.rolling(config.slow_window).mean().to_numpy()
+
+    signals = np.zeros(fast.shape, dtype=np.int8)
+
+    # NaN comparisons are False, so warm-up rows stay HOLD
+    with np.errstate(invalid="ignore"):
+        signals[fast > slow * (1 + config.band)] = BUY
+        signals[fast < slow * (1 - config.band)] = SELL
+
+    return signals
+
+
+# -------------------------------------------------------------------
+# Simulation loop
+# -------------------------------------------------------------------
+
+def run_backtest(
+    prices: pd.DataFrame,
+    starting_cash: float = 272.0,
+    transaction_cost: float = 0.001,
+    config: MomentumConfig = MomentumConfig(),
+    signals: np.ndarray | None = None
+) -> BacktestResult:
+    """
+    Simulate the all-in momentum strategy over a price matrix.
+
+    Parameters
+    ----------
+    prices : DataFrame
+        Close prices, index = dates, columns = tickers. Tickers are
+        processed in column order each day, as the script does.
+    starting_cash : float
+        Initial cash balance
+    transaction_cost : float
+        Proportional cost applied to both buys and sells
+    config : MomentumConfig
+        Signal parameters
+    signals : np.ndarray, optional
+        Precomputed signal codes; computed from ``prices`` if omitted
+
+    Returns
+    -------
+    BacktestResult
+        Trade log as ``(date, ticker, side, price, qty)`` tuples, the
+        daily equity and drawdown (%) curves, and the final book.
+    """
+    if signals is None:
+        signals = momentum_signal_matrix(prices, config)
+
+    values = prices.to_numpy(dtype=float)
+    dates = prices.index
+    tickers = list(prices.columns)
+    n_days, n_tickers = values.shape
+
+    cash = float(starting_cash)
+    positions = np.zeros(n_tickers, dtype=np.int64)
+    trade_log = []
+
+    tracker = PerformanceTracker(initial_equity=starting_cash, capacity=n_days)
+
+    for day in range(n_days):
+        row = values[day]
+        signal_row = signals[day]
+        date = dates[day]
+
+        # ----------------------------
+        # Candidate selection
+        # ----------------------------
+        # Sells always fire on a held position; a buy can only fire if the
+        # price is below the most cash we could hold at any point today.
+        sell_mask = (signal_row == SELL) & (positions > 0)
+        cash_ceiling = cash + np.dot(
+            positions[sell_mask], row[sell_mask]
+        ) * (1 - transaction_cost)
+        with np.errstate(invalid="ignore"):
+            buy_mask = (signal_row == BUY) & (row < cash_ceiling)
+
+        for j in np.flatnonzero(sell_mask | buy_mask):
+            price = row[j]
+
+            if signal_row[j] == BUY:
+                if cash > price:
+                    qty = int(cash // price)
+                    if qty > 0:
+                        cash -= qty * price * (1 + transaction_cost)
+                        positions[j] += qty
+                        trade_log.append((date, tickers[j], "BUY", price, qty))
+
+            elif positions[j] > 0:
+                qty = int(positions[j])
+                cash += qty * price * (1 - transaction_cost)
+                positions[j] = 0
+                trade_log.append((date, tickers[j], "SELL", price, qty))
+
+        # ----------------------------
+        # Mark to market
+        # ----------------------------
+        held = positions != 0
+        equity = cash + float(np.dot(positions[held], row[held]))
+
+        tracker.update(equity)
+
+    return BacktestResult(
+        trade_log=trade_log,
+        equity_curve=pd.Series(tracker.curve, index=dates, name="equity"),
+        drawdown=pd.Series(tracker.drawdown_curve * 100, index=dates, name="drawdown_pct"),
+        cash=cash,
+        positions={
+            tickers[j]: int(positions[j]) for j in np.flatnonzero(positions)
+        },
+    )
+
+
+def run_mean_reversion_backtest(
+    prices,
+    config: MeanReversionConfig = MeanReversionConfig(),
+    initial_capital: float = INITIAL_CAPITAL,
+    signals: np.ndarray | None = None
+) -> BacktestResult:
+    """
+    Simulate the z-score mean-reversion strategy over a price matrix.
+
+    Each day, held tickers with a SELL signal are liquidated, then
+    unheld tickers with a BUY signal get ``max_position_pct`` of the
+    day's opening equity (whole shares, if cash covers price plus
+    cost). Sells run before buys so freed cash is available.
+
+    Missing prices (NaN) never trade: held tickers are marked at their
+    last valid price, and a ticker whose series ends early (e.g. a
+    delisting tail on a date-aligned matrix) is sold on its last valid
+    bar.
+
+    Parameters
+    ----------
+    prices : DataFrame or np.ndarray
+        Close prices, index = dates, columns = tickers
+    config : MeanReversionConfig
+        Signal, sizing and cost parameters
+    initial_capital : float
+        Starting cash
+    signals : np.ndarray, optional
+        Precomputed int8 signal codes (e.g. shared across a sweep);
+        computed with ``generate_signals`` if omitted
+
+    Returns
+    -------
+    BacktestResult
+        Same layout as ``run_backtest``
+    """
+    values = np.asarray(prices, dtype=float)
+    if signals is None:
+        signals = generate_signals(
+            values, config.lookback, config.buy_zscore, config.sell_zscore
+        )
+
+    if isinstance(prices, pd.DataFrame):
+        dates, tickers = prices.index, list(prices.columns)
+    else:
+        dates, tickers = pd.RangeIndex(len(values)), list(range(values.shape[1]))
+
+    n_days, n_tickers = values.shape
+    tc = config.transaction_cost
+
+    cash = float(initial_capital)
+    positions = np.zeros(n_tickers, dtype=np.int64)
+    marks = np.full(n_tickers, np.nan)
+    trade_log = []
+
+    # Last valid bar per ticker; series that stop early are closed out there
+    valid = np.isfinite(values)
+    last_valid = n_days - 1 - np.argmax(valid[::-1], axis=0)
+    exit_day = np.where(valid.any(axis=0) & (last_valid < n_days - 1), last_valid, -1)
+
+    tracker = PerformanceTracker(initial_equity=initial_capital, capacity=n_days)
+
+    for day in range(n_days):
+        row = values[day]
+        signal_row = signals[day]
+        date = dates[day]
+
+        np.copyto(marks, row, where=valid[day])
+        final_bar = exit_day == day
+
+        held = positions != 0
+        open_equity = cash + float(np.dot(positions[held], marks[held]))
+        budget = config.max_position_pct * open_equity
+
+        # ----------------------------
+        # Exits
+        # ----------------------------
+        for j in np.flatnonzero(((signal_row == SELL) | final_bar) & held):
+            qty = int(positions[j])
+            cash += qty * row[j] * (1 - tc)
+            positions[j] = 0
+            trade_log.append((date, tickers[j], "SELL", row[j], qty))
+
+        # ----------------------------
+        # Entries
+        # ----------------------------
+        with np.errstate(invalid="ignore"):
+            entries = (
+                (signal_row == BUY) & ~held & ~final_bar & (row > 0) & (row <= budget)
+            )
+
+        for j in np.flatnonzero(entries):
+            price = row[j]
+            qty = int(budget // price)
+            cost = qty * price * (1 + tc)
+            if qty > 0 and cost <= cash:
+                cash -= cost
+                positions[j] = qty
+                trade_log.append((date, tickers[j], "BUY", price, qty))
+
+        # ----------------------------
+        # Mark to market
+        # ----------------------------
+        held = positions != 0
+        equity = cash + float(np.dot(positions[held], marks[held]))
+
+        tracker.update(equity)
+
+    return BacktestResult(
+        trade_log=trade_log,
+        equity_curve=pd.Series(tracker.curve, index=dates, name="equity"),
+        drawdown=pd.Series(tracker.drawdown_curve * 100, index=dates, name="drawdown_pct"),
+        cash=cash,
+        positions={
+            tickers[j]: int(positions[j]) for j in np.flatnonzero(positions)
+        },
+    )
@@ -0,0 +1,272 @@
+"""
+Lightweight pipeline instrumentation.
+
+Purpose
+-------
+Answer "where did the time go?" for a simulation run:
+
+- ``stage(name)`` context manager and ``instrument(name)`` decorator
+  record wall time, call count, rows processed and (optionally) peak
+  traced memory per stage
+- ``count(name, n)`` keeps free-form counters
+- ``report()`` / ``summary()`` / ``dump(path)`` produce a structured
+  JSON report and a human-readable table
+
+Instrumentation is off by default. Disabled, ``stage`` returns a shared
+no-op context and decorated functions cost one flag check, so the hooks
+can stay in library code permanently. Only the standard library is used
+here, so any module can import it without cycles.
+
+Stage nesting is tracked per thread, so stages opened by worker threads
+(the batched loaders, the price-cache pool) attribute to their own
+parents; totals and counters are shared and updated under a lock.
+Peak memory comes from tracemalloc, which is process-wide: with threads
+running concurrently a stage's peak includes their allocations too.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List
+
+
+# -------------------------------------------------------------------
+# State
+# -------------------------------------------------------------------
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    rows: int = 0
+    peak_bytes: int = 0
+
+
+class _State:
+    enabled: bool = False
+    track_memory: bool = False
+    started: float = 0.0
+    stages: Dict[str, StageStats] = {}
+    counters: Dict[str, int] = {}
+    local: threading.local = threading.local()
+    lock: threading.Lock = threading.Lock()
+
+
+_STATE = _State()
+
+
+def _stack() -> List["_Stage"]:
+    """
+    Open stages of the calling thread, innermost last.
+    """
+    local = _STATE.local
+    stack = getattr(local, "stack", None)
+    if stack is None:
+        stack = local.stack = []
+    return stack
+
+
+def enable(track_memory: bool = False) -> None:
+    """
+    Start collecting; ``track_memory`` turns on tracemalloc peaks
+    (adds noticeable overhead to allocation-heavy stages).
+    """
+    reset()
+    _STATE.enabled = True
+    _STATE.track_memory = track_memory
+    _STATE.started = time.perf_counter()
+    if track_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def disable() -> None:
+    _STATE.enabled = False
+    if _STATE.track_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _STATE.track_memory = False
+
+
+def reset() -> None:
+    _STATE.stages = {}
+    _STATE.counters = {}
+    _STATE.local = threading.local()
+    _STATE.started = time.perf_counter()
+
+
+def is_enabled() -> bool:
+    return _STATE.enabled
+
+
+# -------------------------------------------------------------------
+# Hooks
+# -------------------------------------------------------------------
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add_rows(self, n: int) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("name", "rows", "_t0", "_mem0", "_peak")
+
+    def __init__(self, name: str, rows: int = 0):
+        self.name = name
+        self.rows = rows
+
+    def add_rows(self, n: int) -> None:
+        self.rows += int(n)
+
+    def __enter__(self):
+        stack = _stack()
+        if _STATE.track_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # Keep the enclosing stage's peak before resetting it
+            if stack:
+                parent = stack[-1]
+                parent._peak = max(parent._peak, peak)
+            tracemalloc.reset_peak()
+            self._mem0 = current
+            self._peak = current
+        stack.append(self)
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self._t0
+        stack = _stack()
+        stack.pop()
+
+        peak = None
+        if _STATE.track_memory:
+            peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+            if stack:
+                parent = stack[-1]
+                parent._peak = max(parent._peak, peak)
+
+        with _STATE.lock:
+            stats = _STATE.stages.get(self.name)
+            if stats is None:
+                stats = _STATE.stages[self.name] = StageStats()
+            stats.calls += 1
+            stats.seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+            stats.rows += self.rows
+            if peak is not None:
+                stats.peak_bytes = max(stats.peak_bytes, peak - self._mem0)
+        return False
+
+
+def stage(name: str, rows: int = 0):
+    """
+    Time a block::
+
+        with stage("load.prices") as s:
+            frame = load(...)
+            s.add_rows(len(frame))
+    """
+    if not _STATE.enabled:
+        return _NULL_STAGE
+    return _Stage(name, rows)
+
+
+def instrument(name: str | None = None, rows: Callable[..., int] | None = None):
+    """
+    Decorator form of ``stage``.
+
+    ``rows`` is called with the function's own arguments and returns the
+    number of rows (symbols, bars, orders) the call processes.
+    """
+    def wrap(fn):
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _STATE.enabled:
+                return fn(*args, **kwargs)
+            n = 0
+            if rows is not None:
+                try:
+                    n = int(rows(*args, **kwargs))
+                except Exception:
+                    n = 0
+            with _Stage(label, n):
+                return fn(*args, **kwargs)
+
+        return wrapper
+    return wrap
+
+
+def count(name: str, n: int = 1) -> None:
+    if _STATE.enabled:
+        with _STATE.lock:
+            _STATE.counters[name] = _STATE.counters.get(name, 0) + n
+
+
+# -------------------------------------------------------------------
+# Reporting
+# -------------------------------------------------------------------
+
+def report() -> dict:
+    total = time.perf_counter() - _STATE.started
+    with _STATE.lock:
+        stages = {name: asdict(stats) for name, stats in _STATE.stages.items()}
+        counters = dict(_STATE.counters)
+    return {
+        "total_seconds": total,
+        "track_memory": _STATE.track_memory,
+        "stages": stages,
+        "counters": counters,
+    }
+
+
+def summary(data: dict | None = None) -> str:
+    data = data or report()
+    total = data["total_seconds"] or 1e-12
+
+    lines = [
+        f"{'stage':<36} {'calls':>7} {'seconds':>10} {'%run':>6} {'rows':>12} {'peak MB':>9}",
+        "-" * 85,
+    ]
+    ordered = sorted(data["stages"].items(), key=lambda kv: kv[1]["seconds"], reverse=True)
+    for name, s in ordered:
+        peak = f"{s['peak_bytes'] / 1e6:9.1f}" if data["track_memory"] else f"{'-':>9}"
+        lines.append(
+            f"{name:<36} {s['calls']:>7} {s['seconds']:>10.3f} "
+            f"{100 * s['seconds'] / total:>5.1f}% {s['rows']:>12} {peak}"
+        )
+    lines.append("-" * 85)
+    lines.append(f"{'total run':<36} {'':>7} {data['total_seconds']:>10.3f}")
+
+    for name, value in sorted(data["counters"].items()):
+        lines.append(f"  {name}: {value}")
+
+    return "\n".join(lines)
+
+
+def dump(path: str) -> str:
+    """
+    Write the JSON report to ``path`` and return the human summary.
+    """
+    data = report()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+    return summary(data)
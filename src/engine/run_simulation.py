@@ -1,9 +1,22 @@
 # src/engine/run_simulation.py
 
+import sys
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
 from src.data.data_loader import load_universe_prices
+from src.engine import instrumentation
+from src.engine.instrumentation import stage
+from src.config.config import INITIAL_CAPITAL
+from src.data.price_cache import PriceCache
+from src.data.price_matrix import write_price_matrix
+from src.engine.backtest import run_mean_reversion_backtest
+from src.filter_universe import filter_universe
+from src.portfolio.portfolio import Portfolio, compute_metrics
+from src.strategy.allocator import allocate_capital
+from src.strategy.ranker import rank_universe
+from src.strategy.scoring import score_universe
 
 
 def load_universe(universe_path: str) -> pd.DataFrame:
@@ -65,17 +78,48 @@ def clean_universe(df_universe: pd.DataFrame) -> pd.DataFrame:
     return df_universe.reset_index(drop=True)
 
 
-def run_simulation():
+def run_simulation(
+    profile: bool = False,
+    track_memory: bool = False,
+    report_path: str = "data_cache/run_report.json"
+):
+    """
+    Load the universe, download prices, persist the price matrix, then
+    filter, score and rank the universe, allocate an initial book and
+    backtest the mean-reversion strategy.
+
+    With ``profile`` set, per-stage wall time, call counts, rows and
+    (with ``track_memory``) peak memory are collected, written to
+    ``report_path`` as JSON and summarized at the end of the run.
+    """
+    if profile:
+        instrumentation.enable(track_memory=track_memory)
+
+    try:
+        _run_pipeline()
+    finally:
+        if profile:
+            print("\nStage timings:")
+            print(instrumentation.dump(report_path))
+            print(f"Run report written to {report_path}")
+            instrumentation.disable()
+
+
+def _run_pipeline():
 
     print("\nLoading universe...")
 
     universe_path = "src/data/universe.csv"
 
-    df_universe = load_universe(universe_path)
+    with stage("load.universe") as s:
+        df_universe = load_universe(universe_path)
+        s.add_rows(len(df_universe))
 
     print(f"Initial universe size: {len(df_universe)}")
 
-    df_universe = clean_universe(df_universe)
+    with stage("universe.clean") as s:
+        df_universe = clean_universe(df_universe)
+        s.add_rows(len(df_universe))
 
     print(f"Valid universe size: {len(df_universe)}")
 
@@ -93,6 +137,7 @@ def run_simulation():
         start=start_date,
         end=end_date,
         parallel=True,
+        cache=PriceCache(),
     )
 
     if price_data is None or price_data.empty:
@@ -105,8 +150,48 @@ def run_simulation():
     print("\nFirst rows of price data:")
     print(price_data.head())
 
+    # Persist once so backtest workers can memory-map it (float64, so
+    # the sweep uses the mapping directly instead of casting a copy)
+    with stage("matrix.write", rows=price_data.size):
+        matrix_path = write_price_matrix(price_data, "data_cache/price_matrix", dtype=np.float64)
+    print(f"Price matrix written to {matrix_path}")
+
+    analyze_universe(df_universe, price_data)
+
     print("\nSimulation complete")
 
 
+def analyze_universe(df_universe: pd.DataFrame, price_data: pd.DataFrame) -> dict:
+    """
+    Filter, score and rank the universe on ``price_data``, allocate a
+    fresh book to the top names and backtest the mean-reversion
+    strategy over the tradable tickers.
+    """
+    tradable = filter_universe(df_universe, price_data)
+    print(f"\nTradable tickers: {len(tradable)}")
+    if not tradable:
+        return {}
+
+    prices = price_data[tradable]
+    scores = score_universe(prices)
+    ranked = rank_universe(scores.to_dict())
+    print(f"Top ranked: {ranked['top']}")
+
+    last_prices = prices.ffill().iloc[-1].dropna().to_dict()
+    portfolio = Portfolio(INITIAL_CAPITAL)
+    allocate_capital(portfolio, ranked["top"], ranked["bottom"], last_prices)
+    print(f"Initial book: {portfolio.positions}")
+
+    with stage("backtest.mean_reversion", rows=prices.size):
+        result = run_mean_reversion_backtest(prices)
+    metrics = compute_metrics(result.equity_curve)
+    print(f"Mean-reversion backtest: {metrics}")
+
+    return {"ranked": ranked, "positions": portfolio.positions, "metrics": metrics}
+
+
 if __name__ == "__main__":
-    run_simulation()
+    run_simulation(
+        profile="--profile" in sys.argv or "--profile-memory" in sys.argv,
+        track_memory="--profile-memory" in sys.argv,
+    )
@@ -0,0 +1,312 @@
+"""
+Parameter sweep for the mean-reversion strategy.
+
+Purpose
+-------
+Grid-search the ``config.py`` strategy parameters (``LOOKBACK``,
+``BUY_ZSCORE``, ``SELL_ZSCORE``, ``MAX_POSITION_PCT``,
+``TRANSACTION_COST``) without editing the module:
+
+- the price matrix is loaded once and placed in shared memory (or, for
+  an on-disk ``PriceMatrix``, memory-mapped by each worker); pool
+  workers attach to it instead of receiving a pickled copy per job.
+  A float64 matrix is used without copying; float32 is cast per task
+- jobs are grouped by lookback so each task computes the rolling
+  mean/std once and reuses it for every threshold / sizing combination
+- each task scores all of its equity curves in one vectorized
+  ``curve_metrics`` call (Sharpe, Sortino, CAGR, drawdown, Calmar,
+  turnover, hit rate); results are written to a CSV table, one row per
+  combination
+
+Example
+-------
+python -m src.engine.sweep --prices src/data/price_data.csv \
+    --lookback 10,20,30 --buy-zscore=-1,-1.5 --sell-zscore 1,1.5 \
+    --out sweep_results.csv
+"""
+
+import argparse
+import itertools
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.config.config import (
+    BUY_ZSCORE,
+    INITIAL_CAPITAL,
+    LOOKBACK,
+    MAX_POSITION_PCT,
+    SELL_ZSCORE,
+    TRANSACTION_COST,
+)
+from src.data.price_matrix import PriceMatrix, open_price_matrix
+from src.engine.backtest import MeanReversionConfig, run_mean_reversion_backtest
+from src.portfolio.metrics import METRICS, curve_metrics, traded_value
+from src.strategy.rolling import rolling_mean_var
+from src.strategy.signals import zscore_signal_codes
+
+
+PARAMETERS = (
+    "lookback",
+    "buy_zscore",
+    "sell_zscore",
+    "max_position_pct",
+    "transaction_cost",
+)
+
+
+# -------------------------------------------------------------------
+# Grid
+# -------------------------------------------------------------------
+
+def parameter_grid(
+    lookback: Sequence[int] = (LOOKBACK,),
+    buy_zscore: Sequence[float] = (BUY_ZSCORE,),
+    sell_zscore: Sequence[float] = (SELL_ZSCORE,),
+    max_position_pct: Sequence[float] = (MAX_POSITION_PCT,),
+    transaction_cost: Sequence[float] = (TRANSACTION_COST,)
+) -> List[MeanReversionConfig]:
+    """
+    Cartesian product of parameter ranges; unspecified ones use config.py.
+    """
+    return [
+        MeanReversionConfig(*values)
+        for values in itertools.product(
+            lookback, buy_zscore, sell_zscore, max_position_pct, transaction_cost
+        )
+    ]
+
+
+# -------------------------------------------------------------------
+# Worker side
+# -------------------------------------------------------------------
+
+_SHARED: Dict[str, object] = {}
+
+
+def _attach(shm_name: str, shape: tuple) -> None:
+    """
+    Pool initializer: map the shared price matrix once per process.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _SHARED["shm"] = shm
+    _SHARED["prices"] = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+
+def _attach_matrix(matrix: PriceMatrix) -> None:
+    """
+    Pool initializer for an on-disk matrix (pickles as its path).
+
+    The mapping is kept as-is; a float64 matrix is used in place, any
+    other dtype is cast per task in ``_run_group``.
+    """
+    _SHARED["prices"] = matrix.values
+
+
+def _run_group(prices: np.ndarray, configs: List[MeanReversionConfig], initial_capital: float) -> List[dict]:
+    """
+    Backtest configs that share one lookback, reusing its rolling stats.
+    """
+    # No copy for float64 input (shared memory, float64 memmap)
+    prices = np.asarray(prices, dtype=np.float64)
+    lookback = configs[0].lookback
+    mean, var = rolling_mean_var(prices, lookback)
+    std = np.sqrt(var)
+
+    n_days = len(prices)
+    curves = np.empty((n_days, len(configs)))
+    traded = np.empty((n_days, len(configs)))
+    trades = []
+
+    signal_cache: Dict[tuple, np.ndarray] = {}
+    for k, config in enumerate(configs):
+        key = (config.buy_zscore, config.sell_zscore)
+        if key not in signal_cache:
+            signal_cache[key] = zscore_signal_codes(prices, mean, std, *key)
+
+        result = run_mean_reversion_backtest(
+            prices, config, initial_capital, signals=signal_cache[key]
+        )
+        curves[:, k] = result.equity_curve.to_numpy()
+        traded[:, k] = traded_value(result.trade_log, result.equity_curve.index)
+        trades.append(len(result.trade_log))
+
+    metrics = curve_metrics(curves, traded)
+
+    rows = []
+    for k, config in enumerate(configs):
+        row = metrics.iloc[k]
+        rows.append({
+            **{name: getattr(config, name) for name in PARAMETERS},
+            **row.to_dict(),
+            # Rounded as compute_metrics reports them
+            "Sharpe": round(float(row["Sharpe"]), 2),
+            "MaxDrawdown": round(float(row["MaxDrawdown"]), 2),
+            "FinalEquity": float(curves[-1, k]) if n_days else initial_capital,
+            "Trades": trades[k],
+        })
+    return rows
+
+
+def _pool_group(configs: List[MeanReversionConfig], initial_capital: float) -> List[dict]:
+    return _run_group(_SHARED["prices"], configs, initial_capital)
+
+
+# -------------------------------------------------------------------
+# Driver
+# -------------------------------------------------------------------
+
+def _tasks(configs: List[MeanReversionConfig], per_task: int) -> List[List[int]]:
+    """
+    Group config positions by lookback, then split large groups so all
+    workers stay busy.
+    """
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for i, config in enumerate(configs):
+        groups[config.lookback].append(i)
+
+    tasks = []
+    for group in groups.values():
+        for start in range(0, len(group), per_task):
+            tasks.append(group[start:start + per_task])
+    return tasks
+
+
+def _finish(rows: List[dict], tasks: List[List[int]], output_path: str | None) -> pd.DataFrame:
+    results = pd.DataFrame(rows, columns=[*PARAMETERS, *METRICS, "FinalEquity", "Trades"])
+
+    # Restore input order (tasks are grouped by lookback)
+    results.index = [i for task in tasks for i in task]
+    results = results.sort_index().reset_index(drop=True)
+
+    if output_path:
+        results.to_csv(output_path, index=False)
+        print(f"Wrote {len(results)} sweep results to {output_path}")
+
+    return results
+
+
+def run_sweep(
+    prices,
+    configs: Sequence[MeanReversionConfig],
+    initial_capital: float = INITIAL_CAPITAL,
+    max_workers: int | None = None,
+    configs_per_task: int = 32,
+    output_path: str | None = None
+) -> pd.DataFrame:
+    """
+    Backtest every config over one price matrix.
+
+    Parameters
+    ----------
+    prices : DataFrame, np.ndarray or PriceMatrix
+        Close prices, index = dates, columns = tickers
+    configs : sequence of MeanReversionConfig
+        Combinations to evaluate, e.g. from ``parameter_grid``
+    initial_capital : float
+        Starting cash per backtest
+    max_workers : int, optional
+        Pool size (default: os.cpu_count()); 1 runs in-process
+    configs_per_task : int
+        Upper bound on combinations per pool task
+    output_path : str, optional
+        Write the results table to this CSV
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per config, in input order: parameters, Sharpe,
+        MaxDrawdown, FinalEquity, Trades
+    """
+    configs = list(configs)
+    tasks = _tasks(configs, max(1, configs_per_task))
+    workers = min(max_workers or os.cpu_count() or 1, max(1, len(tasks)))
+
+    rows: List[dict] = []
+    if workers <= 1:
+        values = np.asarray(prices, dtype=np.float64)
+        for task in tasks:
+            rows.extend(_run_group(values, [configs[i] for i in task], initial_capital))
+        return _finish(rows, tasks, output_path)
+
+    shm = None
+    if isinstance(prices, PriceMatrix):
+        initializer, initargs = _attach_matrix, (prices,)
+    else:
+        values = np.asarray(prices, dtype=np.float64)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, values.nbytes))
+        np.ndarray(values.shape, dtype=np.float64, buffer=shm.buf)[:] = values
+        initializer, initargs = _attach, (shm.name, values.shape)
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=initializer,
+            initargs=initargs,
+        ) as executor:
+            futures = [
+                executor.submit(_pool_group, [configs[i] for i in task], initial_capital)
+                for task in tasks
+            ]
+            for future in futures:
+                rows.extend(future.result())
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+    return _finish(rows, tasks, output_path)
+
+
+# -------------------------------------------------------------------
+# CLI
+# -------------------------------------------------------------------
+
+def _floats(text: str) -> List[float]:
+    return [float(x) for x in text.split(",") if x.strip()]
+
+
+def _ints(text: str) -> List[int]:
+    return [int(x) for x in text.split(",") if x.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mean-reversion parameter sweep")
+    parser.add_argument("--prices", default="src/data/price_data.csv", help="CSV of closes, first column = dates")
+    parser.add_argument("--matrix", default=None, help="On-disk price matrix directory (overrides --prices)")
+    parser.add_argument("--lookback", type=_ints, default=[LOOKBACK])
+    parser.add_argument("--buy-zscore", type=_floats, default=[BUY_ZSCORE])
+    parser.add_argument("--sell-zscore", type=_floats, default=[SELL_ZSCORE])
+    parser.add_argument("--max-position-pct", type=_floats, default=[MAX_POSITION_PCT])
+    parser.add_argument("--transaction-cost", type=_floats, default=[TRANSACTION_COST])
+    parser.add_argument("--capital", type=float, default=INITIAL_CAPITAL)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="sweep_results.csv")
+    args = parser.parse_args(argv)
+
+    if args.matrix:
+        prices = open_price_matrix(args.matrix)
+    else:
+        prices = pd.read_csv(args.prices, index_col=0, parse_dates=True)
+    configs = parameter_grid(
+        args.lookback,
+        args.buy_zscore,
+        args.sell_zscore,
+        args.max_position_pct,
+        args.transaction_cost,
+    )
+
+    print(f"Sweeping {len(configs)} combinations over {prices.shape[1]} tickers x {len(prices)} days")
+    results = run_sweep(
+        prices, configs, args.capital, max_workers=args.workers, output_path=args.out
+    )
+    print(results.sort_values("Sharpe", ascending=False).head(10).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,58 +1,108 @@
+import numpy as np
 import pandas as pd
 
+from src.engine.instrumentation import instrument
+
+
+def _nanmean_columns(values: np.ndarray, window: int | None):
+    """
+    Column means ignoring NaN over the trailing ``window`` rows, plus
+    the number of valid rows per column.
+    """
+    if window is not None:
+        values = values[-window:] if window > 0 else values[:0]
+
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=0)
+    total = np.where(valid, values, 0.0).sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+
+    return mean, count
+
+
+def _close_and_volume(price_data):
+    """
+    Split price data into (close columns, close values, volume frame).
+
+    Accepts a close DataFrame (optionally with a 'Volume' block) or an
+    ``OHLCVPanel``.
+    """
+    volume = price_data["Volume"] if "Volume" in price_data else None
+
+    if hasattr(price_data, "field"):
+        close = price_data.field("Close")
+    else:
+        close = price_data.to_numpy(dtype=float)
+
+    return pd.Index(price_data.columns), close, volume
+
+
+@instrument("universe.filter", rows=lambda df_universe, *a, **k: len(df_universe))
 def filter_universe(
     df_universe,
     price_data=None,
     recently_held=None,
     recently_sold=None,
     min_price=5,
-    min_adv=1_000_000
+    min_adv=1_000_000,
+    window=None
 ):
     """
     Filters a universe of tickers based on:
     - recently held / sold tickers
     - minimum price
     - average daily volume (ADV)
-    
+
+    Average price and ADV are computed for every ticker in one columnar
+    pass; exclusions are hash lookups. Universe order is preserved.
+
     Parameters:
         df_universe (pd.DataFrame): Must contain "Ticker" column
-        price_data (pd.DataFrame): Historical price data with columns = tickers and 'Volume'
+        price_data (pd.DataFrame or OHLCVPanel): Historical price data with columns = tickers and 'Volume'
         recently_held (list): tickers to exclude temporarily
         recently_sold (list): tickers to exclude temporarily
         min_price (float): minimum stock price to trade
         min_adv (float): minimum average daily volume (shares traded)
-    
+        window (int): average over the trailing ``window`` bars only
+            (default: full history)
+
     Returns:
         list of tickers passing filters
     """
-    tickers = df_universe["Ticker"].tolist()
-    
-    if recently_held:
-        tickers = [t for t in tickers if t not in recently_held]
-    if recently_sold:
-        tickers = [t for t in tickers if t not in recently_sold]
+    tickers = df_universe["Ticker"].to_numpy(dtype=object)
+    keep = np.ones(len(tickers), dtype=bool)
+
+    excluded = set(recently_held or ()) | set(recently_sold or ())
+    if excluded:
+        keep &= ~pd.Index(tickers).isin(excluded)
 
     # Skip tickers not in price_data
     if price_data is not None:
-        tickers = [t for t in tickers if t in price_data.columns]
-
-        # Compute average price & ADV over available period
-        adv_filtered = []
-        for t in tickers:
-            series = price_data[t].dropna()
-            if len(series) == 0:
-                continue
-            # Average closing price
-            avg_price = series.mean()
-            # If volume data is available
-            if hasattr(price_data, 'Volume') and t in price_data['Volume'].columns:
-                adv = price_data['Volume'][t].dropna().mean()
-            else:
-                # Fallback: skip ADV filter if no volume
-                adv = min_adv + 1
-            if avg_price >= min_price and adv >= min_adv:
-                adv_filtered.append(t)
-        tickers = adv_filtered
-
-    return tickers
+        columns, close, volume = _close_and_volume(price_data)
+
+        # No price history at all (e.g. a failed load): nothing passes
+        if close.shape[1] == 0:
+            return []
+
+        pos = columns.get_indexer(tickers)
+        keep &= pos >= 0
+
+        # Average closing price over available period
+        avg_price, n_bars = _nanmean_columns(close, window)
+        avg_price = avg_price[pos]
+        n_bars = np.where(pos >= 0, n_bars[pos], 0)
+
+        # If volume data is available
+        adv = np.full(len(tickers), min_adv + 1, dtype=float)
+        if volume is not None:
+            vol_pos = pd.Index(volume.columns).get_indexer(tickers)
+            vol_mean, _ = _nanmean_columns(volume.to_numpy(dtype=float), window)
+            has_volume = vol_pos >= 0
+            adv[has_volume] = vol_mean[vol_pos[has_volume]]
+
+        with np.errstate(invalid="ignore"):
+            keep &= (n_bars > 0) & (avg_price >= min_price) & (adv >= min_adv)
 
+    return tickers[keep].tolist()
@@ -0,0 +1,372 @@
+"""
+Columnar, array-backed portfolio state.
+
+Purpose
+-------
+Drop-in alternative to ``Portfolio`` for long multi-asset backtests:
+
+- positions are an int64 share vector indexed by a symbol table
+- trades are recorded into preallocated, growable column arrays
+  (timestamp, symbol id, side, qty, price, cost) instead of tuples
+- equity is a dot product against a price vector
+
+The ``execute`` / ``execute_batch`` / ``evict`` / ``rebalance`` /
+``total_equity`` API and the ``positions`` / ``trade_log`` views match
+``Portfolio``, so the allocator and existing callers work unchanged.
+"""
+
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from src.portfolio.portfolio import Order, fill_buys, net_orders, running_total
+
+
+BUY_SIDE = 1
+SELL_SIDE = -1
+
+
+# -------------------------------------------------------------------
+# Symbol table
+# -------------------------------------------------------------------
+
+class SymbolTable:
+    """
+    Stable symbol <-> integer id mapping.
+    """
+
+    def __init__(self, symbols: Iterable[str] = ()):
+        self.symbols: List[str] = []
+        self._ids: Dict[str, int] = {}
+        for symbol in symbols:
+            self.add(symbol)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._ids
+
+    def add(self, symbol: str) -> int:
+        sid = self._ids.get(symbol)
+        if sid is None:
+            sid = len(self.symbols)
+            self._ids[symbol] = sid
+            self.symbols.append(symbol)
+        return sid
+
+    def get(self, symbol: str) -> int | None:
+        return self._ids.get(symbol)
+
+    def lookup(self, symbols: Iterable[str]) -> np.ndarray:
+        """
+        Ids for ``symbols``, -1 where a symbol is not in the table.
+        """
+        return np.array([self._ids.get(s, -1) for s in symbols], dtype=np.int64)
+
+    def price_vector(self, prices: dict, default: float = 0.0) -> np.ndarray:
+        """
+        Align a symbol -> price mapping to table order.
+        """
+        return np.array(
+            [prices.get(symbol, default) for symbol in self.symbols],
+            dtype=float,
+        )
+
+
+# -------------------------------------------------------------------
+# Trade log
+# -------------------------------------------------------------------
+
+class TradeLog:
+    """
+    Growable columnar trade store (amortized O(1) append).
+    """
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(int(capacity), 1)
+        self._size = 0
+        self.timestamp = np.empty(capacity, dtype=np.int64)
+        self.symbol_id = np.empty(capacity, dtype=np.int32)
+        self.side = np.empty(capacity, dtype=np.int8)
+        self.qty = np.empty(capacity, dtype=np.int64)
+        self.price = np.empty(capacity, dtype=np.float64)
+        self.cost = np.empty(capacity, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self) -> None:
+        capacity = len(self.timestamp) * 2
+        for name in ("timestamp", "symbol_id", "side", "qty", "price", "cost"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def append(self, timestamp: int, symbol_id: int, side: int, qty: int, price: float, cost: float) -> None:
+        if self._size == len(self.timestamp):
+            self._grow()
+        i = self._size
+        self.timestamp[i] = timestamp
+        self.symbol_id[i] = symbol_id
+        self.side[i] = side
+        self.qty[i] = qty
+        self.price[i] = price
+        self.cost[i] = cost
+        self._size += 1
+
+    def extend(self, timestamp: int, symbol_id, side: int, qty, price, cost) -> None:
+        """
+        Append one side's trades from aligned arrays.
+        """
+        n = len(symbol_id)
+        while self._size + n > len(self.timestamp):
+            self._grow()
+        rows = slice(self._size, self._size + n)
+        self.timestamp[rows] = timestamp
+        self.symbol_id[rows] = symbol_id
+        self.side[rows] = side
+        self.qty[rows] = qty
+        self.price[rows] = price
+        self.cost[rows] = cost
+        self._size += n
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """
+        Views of the filled part of each column.
+        """
+        n = self._size
+        return {
+            "timestamp": self.timestamp[:n],
+            "symbol_id": self.symbol_id[:n],
+            "side": self.side[:n],
+            "qty": self.qty[:n],
+            "price": self.price[:n],
+            "cost": self.cost[:n],
+        }
+
+    def to_frame(self, table: SymbolTable) -> pd.DataFrame:
+        cols = self.columns()
+        names = np.asarray(table.symbols, dtype=object)
+        return pd.DataFrame({
+            "timestamp": cols["timestamp"],
+            "symbol": names[cols["symbol_id"]] if len(names) else [],
+            "side": np.where(cols["side"] == BUY_SIDE, "BUY", "SELL"),
+            "qty": cols["qty"],
+            "price": cols["price"],
+            "cost": cols["cost"],
+        })
+
+
+# -------------------------------------------------------------------
+# Portfolio
+# -------------------------------------------------------------------
+
+class ColumnarPortfolio:
+    """
+    Array-backed portfolio with the ``Portfolio`` API.
+    """
+
+    def __init__(
+        self,
+        initial_capital,
+        symbols: Iterable[str] = (),
+        max_position_pct=0.10,
+        transaction_cost=0.001,
+        log_capacity: int = 1024
+    ):
+        self.cash = initial_capital
+        self.table = SymbolTable(symbols)
+        self.shares = np.zeros(len(self.table), dtype=np.int64)
+        self.max_position_pct = max_position_pct
+        self.transaction_cost = transaction_cost
+        self.log = TradeLog(log_capacity)
+
+        # Stamped on every trade; moved forward with ``advance``
+        self.clock: int = 0
+
+        # Optional history tracking per symbol for risk scaling
+        self.price_history: dict[str, pd.Series] = {}
+
+    # ----------------------------
+    # Clock
+    # ----------------------------
+    def advance(self, timestamp) -> None:
+        """
+        Set the timestamp for subsequent trades: an integer (e.g. bar
+        index) or anything ``pd.Timestamp`` accepts (stored as ns).
+        """
+        if isinstance(timestamp, (int, np.integer)):
+            self.clock = int(timestamp)
+        else:
+            self.clock = int(pd.Timestamp(timestamp).value)
+
+    # ----------------------------
+    # Symbol ids
+    # ----------------------------
+    def _sid(self, symbol: str) -> int:
+        sid = self.table.add(symbol)
+        if sid >= len(self.shares):
+            grown = np.zeros(max(len(self.table), 2 * len(self.shares)), dtype=np.int64)
+            grown[:len(self.shares)] = self.shares
+            self.shares = grown
+        return sid
+
+    def _held(self, sid: int | None) -> bool:
+        return sid is not None and sid < len(self.shares) and self.shares[sid] != 0
+
+    # ----------------------------
+    # Compatibility views
+    # ----------------------------
+    @property
+    def positions(self) -> dict[str, int]:
+        """
+        Snapshot of non-zero positions as symbol -> shares.
+        """
+        held = np.flatnonzero(self.shares)
+        return {self.table.symbols[i]: int(self.shares[i]) for i in held}
+
+    @property
+    def trade_log(self) -> list[tuple]:
+        """
+        Trades as ``(symbol, side, qty, price)`` tuples, like ``Portfolio``.
+        """
+        cols = self.log.columns()
+        return [
+            (
+                self.table.symbols[sid],
+                "BUY" if side == BUY_SIDE else "SELL",
+                int(qty),
+                float(price),
+            )
+            for sid, side, qty, price in zip(
+                cols["symbol_id"], cols["side"], cols["qty"], cols["price"]
+            )
+        ]
+
+    # ----------------------------
+    # Portfolio equity
+    # ----------------------------
+    def equity(self, price_vector: np.ndarray) -> float:
+        """
+        Equity against a price vector aligned with ``self.table``.
+        """
+        n = len(self.table)
+        return float(self.cash + np.dot(self.shares[:n], price_vector[:n]))
+
+    def total_equity(self, prices: dict) -> float:
+        held = np.flatnonzero(self.shares)
+        if held.size == 0:
+            return self.cash
+        px = np.array([prices.get(self.table.symbols[i], 0) for i in held], dtype=float)
+        return float(self.cash + np.dot(self.shares[held], px))
+
+    # ----------------------------
+    # Execute trade
+    # ----------------------------
+    def execute(self, symbol: str, price: float, signal: str, position_size: int = None, transaction_cost=None):
+        if price <= 0:
+            return
+
+        tc = transaction_cost if transaction_cost is not None else self.transaction_cost
+
+        if signal == "BUY":
+            shares_to_buy = position_size or 0
+            cost = shares_to_buy * price * (1 + tc)
+            if cost <= self.cash and shares_to_buy > 0:
+                sid = self._sid(symbol)
+                self.cash -= cost
+                self.shares[sid] += shares_to_buy
+                self.log.append(self.clock, sid, BUY_SIDE, shares_to_buy, price, shares_to_buy * price * tc)
+
+        elif signal == "SELL" and self._held(self.table.get(symbol)):
+            self._liquidate(self.table.get(symbol), price, tc)
+
+    def execute_batch(self, orders: Iterable[Order], transaction_cost=None) -> List[Order]:
+        """
+        Net and apply orders in one pass; same rules as
+        ``Portfolio.execute_batch``.
+        """
+        tc = transaction_cost if transaction_cost is not None else self.transaction_cost
+
+        names, net, price = net_orders(orders)
+
+        # Unknown symbols hold nothing; they get an id only once a buy fills
+        sids = self.table.lookup(names)
+        known = sids >= 0
+        held = np.zeros(len(names), dtype=np.int64)
+        held[known] = self.shares[sids[known]]
+
+        sell = np.minimum(np.maximum(-net, 0), held)
+        sells = np.flatnonzero(sell)
+        value = sell[sells] * price[sells]
+        self.cash = float(running_total(self.cash, value * (1 - tc))[-1])
+        self.shares[sids[sells]] -= sell[sells]
+        self.log.extend(self.clock, sids[sells], SELL_SIDE, sell[sells], price[sells], value * tc)
+
+        buys = np.flatnonzero(net > 0)
+        filled, self.cash = fill_buys(self.cash, net[buys] * price[buys] * (1 + tc))
+        buys = buys[filled]
+        for i in buys[sids[buys] < 0]:
+            sids[i] = self._sid(names[i])
+        value = net[buys] * price[buys]
+        self.shares[sids[buys]] += net[buys]
+        self.log.extend(self.clock, sids[buys], BUY_SIDE, net[buys], price[buys], value * tc)
+
+        return [
+            (names[i], "SELL", n, p)
+            for i, n, p in zip(sells.tolist(), sell[sells].tolist(), price[sells].tolist())
+        ] + [
+            (names[i], "BUY", n, p)
+            for i, n, p in zip(buys.tolist(), net[buys].tolist(), price[buys].tolist())
+        ]
+
+    def _liquidate(self, sid: int, price: float, tc: float) -> None:
+        shares = int(self.shares[sid])
+        self.shares[sid] = 0
+        self.cash += shares * price * (1 - tc)
+        self.log.append(self.clock, sid, SELL_SIDE, shares, price, shares * price * tc)
+
+    # ----------------------------
+    # Evict a position
+    # ----------------------------
+    def evict(self, symbol: str, price: float = None):
+        sid = self.table.get(symbol)
+        if self._held(sid) and price is not None:
+            self._liquidate(sid, price, self.transaction_cost)
+
+    # ----------------------------
+    # Rebalance all positions to target weights
+    # ----------------------------
+    def rebalance(self, prices: dict, target_weights: dict[str, float]):
+        equity = self.total_equity(prices)
+        orders = []
+        for symbol, target_weight in target_weights.items():
+            price = prices.get(symbol)
+            if price is None or price <= 0:
+                continue
+
+            sid = self.table.get(symbol)
+            held = int(self.shares[sid]) if self._held(sid) else 0
+
+            target_value = equity * target_weight
+            delta_value = target_value - held * price
+            if abs(delta_value) < 1e-6:
+                continue
+
+            shares_delta = int(delta_value // price)
+            if shares_delta == 0:
+                continue
+
+            signal = "BUY" if shares_delta > 0 else "SELL"
+            orders.append((symbol, signal, abs(shares_delta), price))
+
+        return self.execute_batch(orders)
+
+    # ----------------------------
+    # Optional: access symbol return history for risk scaling
+    # ----------------------------
+    def get_symbol_history(self, symbol: str) -> pd.Series | None:
+        return self.price_history.get(symbol)
@@ -0,0 +1,195 @@
+"""
+Vectorized performance metrics for many equity curves.
+
+Purpose
+-------
+Score thousands of runs (e.g. a parameter sweep) in one pass of NumPy
+reductions instead of one ``compute_metrics`` call per curve:
+
+- Sharpe, Sortino (annualized, target return 0)
+- CAGR, max drawdown, longest drawdown (bars), Calmar
+- turnover (annualized traded value / average equity), hit rate
+
+Curves are the columns of a dates x runs array. Runs of different
+lengths can be NaN-padded; every statistic skips NaN bars. On a single
+curve, Sharpe and MaxDrawdown equal ``compute_metrics`` before its
+rounding, including the degenerate cases: MaxDrawdown is NaN when no
+bar has a defined drawdown (e.g. a single bar at 0 equity) and 0 for a
+curve without bars.
+"""
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+
+METRICS = (
+    "Sharpe",
+    "Sortino",
+    "CAGR",
+    "MaxDrawdown",
+    "MaxDrawdownDuration",
+    "Calmar",
+    "Turnover",
+    "HitRate",
+)
+
+
+def _as_curves(equity):
+    """
+    (dates x runs float array, run labels) from a Series, DataFrame or array.
+    """
+    if isinstance(equity, pd.Series):
+        return equity.to_numpy(dtype=float)[:, None], [equity.name if equity.name is not None else 0]
+    if isinstance(equity, pd.DataFrame):
+        return equity.to_numpy(dtype=float), list(equity.columns)
+
+    values = np.asarray(equity, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    return values, list(range(values.shape[1]))
+
+
+def traded_value(trade_log: Sequence[tuple], dates) -> np.ndarray:
+    """
+    Gross traded notional per date from ``BacktestResult.trade_log``
+    tuples ``(date, ticker, side, price, qty)``.
+    """
+    dates = pd.Index(dates)
+    if not trade_log:
+        return np.zeros(len(dates))
+
+    when, _, _, price, qty = zip(*trade_log)
+    pos = dates.get_indexer(when)
+    value = np.abs(np.asarray(price, dtype=float) * np.asarray(qty, dtype=float))
+    keep = pos >= 0
+    return np.bincount(pos[keep], weights=value[keep], minlength=len(dates))
+
+
+def curve_metrics(
+    equity,
+    traded=None,
+    periods_per_year: int = 252
+) -> pd.DataFrame:
+    """
+    Metrics for every equity curve at once.
+
+    Parameters
+    ----------
+    equity : Series, DataFrame or np.ndarray
+        Equity curves, dates x runs (a 1D input is one run)
+    traded : array-like, optional
+        Gross traded value per bar, same shape as ``equity``; without it
+        Turnover is NaN
+    periods_per_year : int
+        Bars per year for annualization
+
+    Returns
+    -------
+    DataFrame
+        One row per run (labelled like the input columns), one column
+        per name in ``METRICS``. Sharpe / Sortino are 0 when their
+        denominator is 0 (as in ``compute_metrics``); other undefined
+        values are NaN.
+    """
+    values, labels = _as_curves(equity)
+    no_bars = len(values) == 0
+    if no_bars:
+        # No bars: one NaN bar gives the same (empty) statistics
+        values = np.full((1, values.shape[1]), np.nan)
+    n_bars, n_runs = values.shape
+    ann = np.sqrt(periods_per_year)
+
+    # One row per run keeps each reduction contiguous (pairwise sums)
+    curves = np.ascontiguousarray(values.T)
+
+    # ----------------------------
+    # Returns
+    # ----------------------------
+    with np.errstate(invalid="ignore", divide="ignore"):
+        returns = curves[:, 1:] / curves[:, :-1] - 1.0
+    valid = ~np.isnan(returns)
+    n_returns = valid.sum(axis=1)
+    clean = np.where(valid, returns, 0.0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = clean.sum(axis=1) / n_returns
+        centered = np.where(valid, returns - mean[:, None], 0.0)
+        std = np.sqrt((centered ** 2).sum(axis=1) / (n_returns - 1))
+        downside = np.sqrt((np.minimum(clean, 0.0) ** 2).sum(axis=1) / n_returns)
+
+        sharpe = np.where(std > 0, ann * mean / std, 0.0)
+        sortino = np.where(downside > 0, ann * mean / downside, 0.0)
+
+        positive = (clean > 0).sum(axis=1)
+        moved = (clean != 0).sum(axis=1)
+        hit_rate = np.where(moved > 0, positive / moved, np.nan)
+
+    # ----------------------------
+    # Growth
+    # ----------------------------
+    present = ~np.isnan(curves)
+    has_data = present.any(axis=1)
+    first_idx = np.argmax(present, axis=1)
+    last_idx = n_bars - 1 - np.argmax(present[:, ::-1], axis=1)
+    rows = np.arange(n_runs)
+
+    periods = np.where(has_data, last_idx - first_idx, 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        growth = curves[rows, last_idx] / curves[rows, first_idx]
+        cagr = np.where(
+            (periods > 0) & (growth >= 0),
+            growth ** (periods_per_year / np.maximum(periods, 1)) - 1.0,
+            np.nan,
+        )
+
+    # ----------------------------
+    # Drawdowns
+    # ----------------------------
+    peak = np.fmax.accumulate(curves, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        drawdown = (peak - curves) / peak
+    under = drawdown > 0                        # NaN bars count as not under water
+    max_dd = np.where(under, drawdown, 0.0).max(axis=1, initial=0.0)
+    # Like pandas' skipna max: undefined when every drawdown is NaN
+    defined = ~np.isnan(drawdown).all(axis=1)
+    max_dd = np.where(defined | no_bars, max_dd, np.nan)
+
+    t = np.arange(n_bars)
+    last_high = np.maximum.accumulate(np.where(under, -1, t), axis=1)
+    duration = np.where(under, t - last_high, 0).max(axis=1, initial=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        calmar = np.where(max_dd > 0, cagr / max_dd, np.nan)
+
+    # ----------------------------
+    # Turnover
+    # ----------------------------
+    if traded is None:
+        turnover = np.full(n_runs, np.nan)
+    else:
+        traded = np.asarray(traded, dtype=float)
+        if traded.ndim == 1:
+            traded = traded[:, None]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg_equity = np.where(present, curves, 0.0).sum(axis=1) / present.sum(axis=1)
+            turnover = (
+                np.nansum(traded, axis=0) / avg_equity
+                * periods_per_year / np.where(periods > 0, periods, np.nan)
+            )
+
+    return pd.DataFrame(
+        {
+            "Sharpe": sharpe,
+            "Sortino": sortino,
+            "CAGR": cagr,
+            "MaxDrawdown": max_dd,
+            "MaxDrawdownDuration": duration,
+            "Calmar": calmar,
+            "Turnover": turnover,
+            "HitRate": hit_rate,
+        },
+        index=pd.Index(labels, name="run"),
+        columns=list(METRICS),
+    )
@@ -0,0 +1,162 @@
+"""
+Streaming performance tracking.
+
+Purpose
+-------
+Follow an equity curve bar by bar without rebuilding pandas objects:
+
+- peak equity, current / max drawdown
+- drawdown duration (bars since the last peak) and its maximum
+- running mean / variance of bar returns (Welford) for Sharpe
+
+Every ``update`` is O(1). The curve itself goes into a preallocated
+float array (grown by doubling if the run outlives ``capacity``), or is
+not kept at all with ``keep_curve=False`` for bounded memory on long or
+intraday runs.
+
+``metrics()`` matches ``compute_metrics`` on the recorded curve (the
+peak is only seeded differently when ``initial_equity`` exceeds the
+first bar).
+"""
+
+import numpy as np
+
+
+class PerformanceTracker:
+    """
+    Incremental equity-curve statistics.
+
+    Parameters
+    ----------
+    initial_equity : float, optional
+        Seeds the peak (e.g. starting cash), as the backtests do; returns
+        are still measured between recorded bars only
+    capacity : int
+        Bars to preallocate for the stored curve
+    keep_curve : bool
+        Store equity / drawdown per bar; False keeps memory constant
+    periods_per_year : int
+        Annualization factor for Sharpe
+    """
+
+    def __init__(
+        self,
+        initial_equity: float | None = None,
+        capacity: int = 256,
+        keep_curve: bool = True,
+        periods_per_year: int = 252
+    ):
+        self.keep_curve = keep_curve
+        self.periods_per_year = periods_per_year
+
+        size = max(int(capacity), 1) if keep_curve else 0
+        self._equity = np.empty(size)
+        self._drawdown = np.empty(size)
+        self.n = 0
+
+        self.peak = np.nan if initial_equity is None else float(initial_equity)
+        self.last = np.nan
+        self.drawdown = 0.0
+        self.max_drawdown = 0.0
+        self.drawdown_duration = 0
+        self.max_drawdown_duration = 0
+
+        # Welford accumulators over bar returns
+        self._n_returns = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    # ----------------------------
+    # Updates
+    # ----------------------------
+    def update(self, equity: float) -> float:
+        """
+        Record one bar; returns the current drawdown (fraction of peak).
+
+        A non-finite bar is stored as NaN to keep the curve aligned but
+        leaves the peak and return statistics alone; the next valid bar's
+        return is measured against the last valid one.
+        """
+        equity = float(equity)
+
+        if not np.isfinite(equity):
+            self._record(np.nan, np.nan)
+            return self.drawdown
+
+        if np.isfinite(self.last):
+            r = equity / self.last - 1.0
+            self._n_returns += 1
+            delta = r - self._mean
+            self._mean += delta / self._n_returns
+            self._m2 += delta * (r - self._mean)
+
+        if not equity <= self.peak:         # also replaces an unseeded peak
+            self.peak = equity
+
+        drawdown = (self.peak - equity) / self.peak
+        self.drawdown = drawdown
+        self.max_drawdown = max(self.max_drawdown, drawdown)
+
+        if drawdown > 0:
+            self.drawdown_duration += 1
+            self.max_drawdown_duration = max(self.max_drawdown_duration, self.drawdown_duration)
+        else:
+            self.drawdown_duration = 0
+
+        self.last = equity
+        self._record(equity, drawdown)
+        return drawdown
+
+    def _record(self, equity: float, drawdown: float) -> None:
+        if self.keep_curve:
+            if self.n == len(self._equity):
+                self._equity = np.concatenate([self._equity, np.empty(len(self._equity))])
+                self._drawdown = np.concatenate([self._drawdown, np.empty(len(self._drawdown))])
+            self._equity[self.n] = equity
+            self._drawdown[self.n] = drawdown
+        self.n += 1
+
+    # ----------------------------
+    # Curves
+    # ----------------------------
+    @property
+    def curve(self) -> np.ndarray:
+        """
+        Recorded equity (view, length ``n``).
+        """
+        return self._equity[:self.n]
+
+    @property
+    def drawdown_curve(self) -> np.ndarray:
+        """
+        Recorded drawdown as a fraction of peak (view, length ``n``).
+        """
+        return self._drawdown[:self.n]
+
+    # ----------------------------
+    # Statistics
+    # ----------------------------
+    @property
+    def return_mean(self) -> float:
+        return self._mean if self._n_returns else np.nan
+
+    @property
+    def return_std(self) -> float:
+        if self._n_returns < 2:
+            return np.nan
+        return float(np.sqrt(max(self._m2, 0.0) / (self._n_returns - 1)))
+
+    def sharpe(self) -> float:
+        std = self.return_std
+        if not std > 0:
+            return 0.0
+        return float(np.sqrt(self.periods_per_year) * self._mean / std)
+
+    def metrics(self) -> dict:
+        """
+        Same keys and rounding as ``compute_metrics``.
+        """
+        return {
+            "Sharpe": round(self.sharpe(), 2),
+            "MaxDrawdown": round(float(self.max_drawdown), 2),
+        }
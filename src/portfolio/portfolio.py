@@ -1,6 +1,76 @@
+from typing import Iterable, List, Tuple
+
 import numpy as np
 import pandas as pd
 
+from src.engine.instrumentation import instrument
+
+
+Order = Tuple[str, str, int, float]     # (symbol, side, shares, price)
+
+
+# ----------------------------
+# Batch helpers
+# ----------------------------
+def running_total(start: float, values: np.ndarray) -> np.ndarray:
+    """
+    ``start + v0 + v1 + ...`` accumulated left to right, i.e. with the
+    same rounding as adding one trade at a time.
+    """
+    return np.cumsum(np.concatenate(([start], values)))
+
+
+def fill_buys(cash: float, cost: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Which buys fill when each needs ``cost <= cash`` in order.
+
+    One cumulative sum when everything fills; otherwise the sequential
+    rule is replayed from the first rejected order.
+    """
+    running = running_total(cash, -cost)
+    filled = cost <= running[:-1]
+    if filled.all():
+        return filled, float(running[-1])
+
+    first = int(np.argmin(filled))
+    filled[first:] = False
+    cash = float(running[first])
+    for i in range(first, len(cost)):
+        if cost[i] <= cash:
+            cash -= cost[i]
+            filled[i] = True
+    return filled, cash
+
+
+def net_orders(orders: Iterable[Order]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Net orders per symbol.
+
+    Returns symbols in first-seen order, the signed net share quantity
+    (BUY positive) and the last price seen for each. Orders without a
+    positive quantity or price are dropped; SELLs at zero (write-offs)
+    are kept.
+    """
+    net: dict[str, int] = {}
+    last_price: dict[str, float] = {}
+    for symbol, side, qty, price in orders:
+        if qty <= 0 or price < 0 or (price == 0 and side != "SELL"):
+            continue
+        if side == "BUY":
+            net[symbol] = net.get(symbol, 0) + qty
+        elif side == "SELL":
+            net[symbol] = net.get(symbol, 0) - qty
+        else:
+            continue
+        last_price[symbol] = price
+
+    n = len(net)
+    return (
+        list(net),
+        np.fromiter(net.values(), dtype=np.int64, count=n),
+        np.fromiter(last_price.values(), dtype=float, count=n),
+    )
+
 
 class Portfolio:
     """
@@ -49,6 +119,54 @@ class Portfolio:
             self.cash += proceeds
             self.trade_log.append((symbol, "SELL", shares_to_sell, price))
 
+    # ----------------------------
+    # Execute many orders at once
+    # ----------------------------
+    def execute_batch(self, orders: Iterable[Order], transaction_cost=None) -> List[Order]:
+        """
+        Net and apply ``(symbol, side, shares, price)`` orders in one pass.
+
+        Orders are netted per symbol at the last price given for it. Net
+        sells may be partial (never below zero shares) and are applied
+        before buys, so they free cash; each net buy then fills only if
+        its cost is covered, in first-seen order.
+
+        Returns
+        -------
+        list of tuple
+            Trades made, as trade-log tuples
+        """
+        tc = transaction_cost if transaction_cost is not None else self.transaction_cost
+
+        names, net, price = net_orders(orders)
+        held = np.array([self.positions.get(s, 0) for s in names], dtype=np.int64)
+
+        sell = np.minimum(np.maximum(-net, 0), held)
+        sells = np.flatnonzero(sell)
+        self.cash = float(running_total(self.cash, sell[sells] * price[sells] * (1 - tc))[-1])
+
+        buys = np.flatnonzero(net > 0)
+        filled, self.cash = fill_buys(self.cash, net[buys] * price[buys] * (1 + tc))
+        buys = buys[filled]
+
+        trades = [
+            (names[i], "SELL", n, p)
+            for i, n, p in zip(sells.tolist(), sell[sells].tolist(), price[sells].tolist())
+        ] + [
+            (names[i], "BUY", n, p)
+            for i, n, p in zip(buys.tolist(), net[buys].tolist(), price[buys].tolist())
+        ]
+
+        for symbol, side, n, _ in trades:
+            remaining = self.positions.get(symbol, 0) + (n if side == "BUY" else -n)
+            if remaining:
+                self.positions[symbol] = remaining
+            else:
+                del self.positions[symbol]
+
+        self.trade_log.extend(trades)
+        return trades
+
     # ----------------------------
     # Evict a position
     # ----------------------------
@@ -63,7 +181,12 @@ class Portfolio:
     # Rebalance all positions to target weights
     # ----------------------------
     def rebalance(self, prices: dict, target_weights: dict[str, float]):
+        """
+        Trade toward target weights as one netted batch; over-weight
+        positions are trimmed, not liquidated.
+        """
         equity = self.total_equity(prices)
+        orders = []
         for symbol, target_weight in target_weights.items():
             price = prices.get(symbol)
             if price is None or price <= 0:
@@ -80,7 +203,9 @@ class Portfolio:
                 continue
 
             signal = "BUY" if shares_delta > 0 else "SELL"
-            self.execute(symbol, price, signal, position_size=abs(shares_delta))
+            orders.append((symbol, signal, abs(shares_delta), price))
+
+        return self.execute_batch(orders)
 
     # ----------------------------
     # Optional: access symbol return history for risk scaling
@@ -91,6 +216,7 @@ class Portfolio:
 # ----------------------------
 # Metrics
 # ----------------------------
+@instrument("metrics.compute_metrics", rows=lambda equity_curve: len(equity_curve))
 def compute_metrics(equity_curve: pd.Series):
     """
     Compute standard performance metrics.
@@ -1,18 +1,114 @@
 # src/risk.py
+from typing import Sequence
+
 import numpy as np
 
+from src.portfolio.performance import PerformanceTracker
+from src.strategy.rolling import RollingStats
+
+
+class EWMAVolatility:
+    """
+    Exponentially weighted volatility of bar-to-bar returns, per symbol.
+
+    RiskMetrics recursion ``var = lam * var + (1 - lam) * r^2``, seeded
+    with the first squared return. O(1) per bar; NaN bars are skipped
+    per symbol.
+
+    Parameters
+    ----------
+    n_symbols : int
+        Number of tracked symbols
+    lam : float
+        Decay factor (0.94 = RiskMetrics daily)
+    min_periods : int
+        Returns required before a volatility is reported
+    """
+
+    def __init__(self, n_symbols: int, lam: float = 0.94, min_periods: int = 20):
+        self.lam = lam
+        self.min_periods = min_periods
+        self._var = np.zeros(n_symbols)
+        self._count = np.zeros(n_symbols, dtype=np.int64)
+        self._last = np.full(n_symbols, np.nan)
+
+    def update(self, prices) -> None:
+        row = np.asarray(prices, dtype=float)
+        idx = np.flatnonzero(~np.isnan(row))
+        x = row[idx]
+
+        prev = self._last[idx]
+        has_prev = ~np.isnan(prev)
+        i = idx[has_prev]
+        r2 = (x[has_prev] / prev[has_prev] - 1.0) ** 2
+
+        self._var[i] = np.where(
+            self._count[i] == 0, r2, self.lam * self._var[i] + (1 - self.lam) * r2
+        )
+        self._count[i] += 1
+        self._last[idx] = x
+
+    def volatility(self) -> np.ndarray:
+        return np.where(self._count >= max(self.min_periods, 1), np.sqrt(self._var), np.nan)
+
+
 class RiskManager:
     """
     Handles risk allocation, position sizing, and drawdown constraints.
+
+    Volatility for sizing can be estimated incrementally: ``track`` a
+    symbol set, feed one bar per ``update``, then ``volatility`` /
+    ``scale_positions`` are array lookups rather than per-symbol history
+    reductions.
+
+    Parameters
+    ----------
+    max_drawdown : float
+        Drawdown limit for ``check_drawdown``
+    target_volatility : float
+        Volatility each position is scaled to
+    vol_window : int
+        Returns in the rolling window; also the EWMA warm-up length
+    vol_method : str
+        "rolling" (window std, ddof=1) or "ewma"
+    ewma_lambda : float
+        EWMA decay factor
     """
-    def __init__(self, max_drawdown=0.2, target_volatility=0.1):
+    def __init__(
+        self,
+        max_drawdown=0.2,
+        target_volatility=0.1,
+        vol_window: int = 20,
+        vol_method: str = "rolling",
+        ewma_lambda: float = 0.94
+    ):
+        if vol_method not in ("rolling", "ewma"):
+            raise ValueError(f"Unknown vol_method: {vol_method}")
+
         self.max_drawdown = max_drawdown
         self.target_volatility = target_volatility
-        self.equity_peak = 1.0
+        self.vol_window = vol_window
+        self.vol_method = vol_method
+        self.ewma_lambda = ewma_lambda
+
+        # Peak / drawdown state, O(1) per check
+        self.performance = PerformanceTracker(initial_equity=1.0, keep_curve=False)
+
+        self.symbols: list = []
+        self._index: dict = {}
+        self._estimator = None
+
+    @property
+    def equity_peak(self) -> float:
+        return self.performance.peak
 
     def check_drawdown(self, equity_curve):
-        self.equity_peak = max(self.equity_peak, equity_curve[-1])
-        drawdown = (self.equity_peak - equity_curve[-1]) / self.equity_peak
+        """
+        Record the latest equity (a scalar, or a curve whose last value
+        is used) and check it against ``max_drawdown``.
+        """
+        equity = equity_curve[-1] if np.ndim(equity_curve) else equity_curve
+        drawdown = self.performance.update(equity)
         return drawdown <= self.max_drawdown
 
     def scale_position(self, signal_weight, historical_vol):
@@ -23,3 +119,63 @@ class RiskManager:
             return 0
         return signal_weight * (self.target_volatility / historical_vol)
 
+    # ----------------------------
+    # Incremental volatility
+    # ----------------------------
+    @property
+    def tracking(self) -> bool:
+        return self._estimator is not None
+
+    def track(self, symbols: Sequence[str], history=None) -> "RiskManager":
+        """
+        Start estimating volatility for ``symbols``, optionally warmed up
+        on a dates x symbols price history (columns in ``symbols`` order).
+        """
+        self.symbols = list(symbols)
+        self._index = {s: i for i, s in enumerate(self.symbols)}
+
+        if self.vol_method == "ewma":
+            self._estimator = EWMAVolatility(
+                len(self.symbols), self.ewma_lambda, min_periods=self.vol_window
+            )
+        else:
+            self._estimator = RollingStats(len(self.symbols), window=self.vol_window + 1)
+
+        if history is not None:
+            for row in np.asarray(history, dtype=float):
+                self._estimator.update(row)
+        return self
+
+    def update(self, prices) -> None:
+        """
+        Feed one bar: a symbol -> price mapping or an array aligned with
+        the tracked symbols (NaN / missing = no bar).
+        """
+        if self._estimator is None:
+            raise RuntimeError("call track() before update()")
+        if isinstance(prices, dict):
+            prices = [prices.get(s, np.nan) for s in self.symbols]
+        self._estimator.update(prices)
+
+    def volatility(self, symbols: Sequence[str] | None = None) -> np.ndarray:
+        """
+        Current per-bar return volatility; NaN until warmed up or for
+        untracked symbols.
+        """
+        if self._estimator is None:
+            raise RuntimeError("call track() before volatility()")
+        vol = self._estimator.volatility()
+        if symbols is None:
+            return vol
+        idx = np.array([self._index.get(s, -1) for s in symbols], dtype=np.intp)
+        return np.where(idx >= 0, vol[idx], np.nan) if len(idx) else vol[:0]
+
+    def scale_positions(self, signal_weights, historical_vols) -> np.ndarray:
+        """
+        Vector ``scale_position``; zero where volatility is zero or unknown.
+        """
+        vol = np.asarray(historical_vols, dtype=float)
+        ok = np.isfinite(vol) & (vol != 0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scaled = np.asarray(signal_weights, dtype=float) * (self.target_volatility / vol)
+        return np.where(ok, scaled, 0.0)
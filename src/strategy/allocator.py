@@ -8,12 +8,22 @@ Translate ranked symbols into portfolio actions:
 - evict bottom-ranked symbols
 - enforce position and capital constraints
 
+The whole book is planned at once on share / price vectors
+(``plan_allocation``) and the resulting order list is then applied in
+one netted batch (``execute_batch``). Cash is simulated exactly as
+sequential execution would, so planned buys are affordable.
+
 This module is policy-driven and portfolio-aware.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Dict
 
+import numpy as np
+
+from src.engine.instrumentation import instrument
+from src.portfolio.portfolio import Order, fill_buys, running_total
+
 
 # -------------------------------------------------------------------
 # Configuration
@@ -26,122 +36,239 @@ class AllocationConfig:
     min_trade_value: float = 50.0     # ignore tiny trades
 
 
+@dataclass
+class AllocationPlan:
+    """
+    Target book and the orders that reach it.
+
+    ``symbols`` covers every held symbol followed by new entry
+    candidates; ``current`` / ``target`` are share vectors aligned with
+    it. ``orders`` are in execution order, as trade-log tuples.
+
+    ``cash`` is projected from ``orders`` executed one by one; once
+    ``allocate_capital`` has applied them it is the portfolio's actual
+    cash, which can be higher because netting saves transaction costs.
+    """
+    symbols: List[str]
+    current: np.ndarray
+    target: np.ndarray
+    orders: List[Order] = field(default_factory=list)
+    cash: float = 0.0
+
+
+# -------------------------------------------------------------------
+# Vector helpers
+# -------------------------------------------------------------------
+
+def _orders(symbols, side: str, idx: np.ndarray, shares: np.ndarray, price: np.ndarray) -> List[Order]:
+    return [
+        (symbols[i], side, n, p)
+        for i, n, p in zip(idx.tolist(), shares.tolist(), price[idx].tolist())
+    ]
+
+
+def _risk_multipliers(portfolio, symbols: List[str], risk_mgr) -> np.ndarray:
+    # Incrementally tracked volatility: one vector lookup
+    if getattr(risk_mgr, "tracking", False):
+        return risk_mgr.scale_positions(1.0, risk_mgr.volatility(symbols))
+
+    vols = []
+    for symbol in symbols:
+        hist_returns = portfolio.get_symbol_history(symbol)
+        vols.append(hist_returns.std() if hist_returns is not None else 0.0)
+    return np.array(
+        [risk_mgr.scale_position(1.0, vol) for vol in vols], dtype=float
+    )
+
+
 # -------------------------------------------------------------------
 # Core allocation logic
 # -------------------------------------------------------------------
 
-def allocate_capital(
+def plan_allocation(
     portfolio,
     top_symbols: List[str],
     bottom_symbols: List[str],
     prices: Dict[str, float],
     config: AllocationConfig = AllocationConfig(),
     risk_mgr=None
-):
+) -> AllocationPlan:
     """
-    Apply capital allocation decisions to a portfolio.
+    Compute the orders ``allocate_capital`` applies, without touching
+    the portfolio.
 
-    Parameters
-    ----------
-    portfolio : Portfolio
-        Portfolio object (must support evict, execute, cash)
-    top_symbols : list[str]
-        Symbols selected for entry / holding
-    bottom_symbols : list[str]
-        Symbols selected for eviction
-    prices : dict
-        symbol -> current price
-    config : AllocationConfig
-        Allocation policy
-    risk_mgr : optional
-        RiskManager for scaling position sizes
+    Steps match trade-by-trade allocation: evict bottom-ranked holdings,
+    enter top-ranked symbols into free slots (optionally risk-scaled),
+    then rebalance every position to ``target_weight`` of the
+    pre-entry equity. Buys only fill while cash covers them.
+
+    Rebalance trims are partial sells and are applied before rebalance
+    buys, so they free cash for them.
     """
+    tc = portfolio.transaction_cost
+
+    held = list(portfolio.positions)
+    held_set = set(held)
+    symbols = held + [s for s in dict.fromkeys(top_symbols) if s not in held_set]
+    n_held = len(held)
+
+    # Missing prices become NaN
+    price = np.array([prices.get(s) for s in symbols], dtype=float)
+    current = np.zeros(len(symbols), dtype=np.int64)
+    current[:n_held] = list(portfolio.positions.values())
+    shares = current.copy()
+    index = {s: i for i, s in enumerate(symbols)}
+
+    orders: List[Order] = []
 
     # ----------------------------
     # Step 1: Evict bottom-ranked symbols
     # ----------------------------
-    for symbol in bottom_symbols:
-        if symbol in portfolio.positions:
-            portfolio.evict(symbol, price=prices.get(symbol))
+    evict = [
+        index[s] for s in dict.fromkeys(bottom_symbols)
+        if s in held_set and price[index[s]] >= 0      # zero = write-off
+    ]
+    evict = np.array(evict, dtype=np.intp)
+    proceeds = shares[evict] * price[evict] * (1 - tc)
+    cash = float(running_total(portfolio.cash, proceeds)[-1])
+    orders += _orders(symbols, "SELL", evict, shares[evict], price)
+    shares[evict] = 0
+
+    kept = np.ones(n_held, dtype=bool)
+    kept[evict] = False
+    kept = np.flatnonzero(kept)
+
+    # Entry candidates in rank order; evicted symbols may re-enter
+    evicted = set(symbols[i] for i in evict)
+    candidates = np.array([
+        index[s] for s in dict.fromkeys(top_symbols)
+        if s not in held_set or s in evicted
+    ], dtype=np.intp)
 
     # ----------------------------
     # Step 2: Determine available slots
     # ----------------------------
-    current_positions = list(portfolio.positions.keys())
-    available_slots = max(0, config.max_positions - len(current_positions))
-
-    if available_slots <= 0:
-        # Already at max positions, may still rebalance existing positions later
-        pass
+    available_slots = max(0, config.max_positions - len(kept))
 
     # ----------------------------
     # Step 3: Compute allocation per new position
     # ----------------------------
-    equity = portfolio.total_equity(prices)
+    marks = np.where(np.isnan(price[kept]), 0.0, price[kept])
+    equity = float(running_total(cash, shares[kept] * marks)[-1])
     alloc_per_position = equity * config.target_weight
 
     # ----------------------------
     # Step 4: Enter top-ranked symbols
     # ----------------------------
-    for symbol in top_symbols:
-        if symbol in portfolio.positions:
-            continue  # already holding
-
-        if available_slots <= 0:
-            break  # max positions reached
-
-        price = prices.get(symbol)
-        if price is None or price <= 0:
-            continue
-
-        # Scale by risk manager if provided
-        size_multiplier = 1.0
-        if risk_mgr:
-            hist_returns = portfolio.get_symbol_history(symbol)
-            hist_vol = hist_returns.std() if hist_returns is not None else 0.0
-            size_multiplier = risk_mgr.scale_position(1.0, hist_vol)
-
-        # Compute number of shares to buy
-        shares = int((alloc_per_position * size_multiplier) // price)
-        trade_value = shares * price
-
-        if shares <= 0 or trade_value < config.min_trade_value:
-            continue
-
-        # Execute trade
-        portfolio.execute(
-            symbol=symbol,
-            price=price,
-            signal="BUY",
-            position_size=shares
+    cand_price = price[candidates]
+    valid = cand_price > 0          # NaN (no price) compares False
+
+    size_multiplier = np.ones(len(candidates))
+    if risk_mgr and valid.any():
+        size_multiplier[valid] = _risk_multipliers(
+            portfolio, [symbols[i] for i in candidates[valid]], risk_mgr
         )
 
-        available_slots -= 1
+    with np.errstate(invalid="ignore", divide="ignore"):
+        budget = np.floor_divide(alloc_per_position * size_multiplier, cand_price)
+    cand_shares = np.where(valid & np.isfinite(budget), budget, 0).astype(np.int64)
+    trade_value = cand_shares * cand_price
+    passing = valid & (cand_shares > 0) & (trade_value >= config.min_trade_value)
+
+    chosen = candidates[passing][:available_slots]
+    buy_shares = cand_shares[passing][:available_slots]
+    cost = buy_shares * price[chosen] * (1 + tc)
+
+    filled, cash = fill_buys(cash, cost)
+    entered = chosen[filled]
+    shares[entered] = buy_shares[filled]
+    orders += _orders(symbols, "BUY", entered, buy_shares[filled], price)
 
     # ----------------------------
-    # Step 5: Optional rebalance existing positions to target weight
+    # Step 5: Rebalance existing positions to target weight
     # ----------------------------
-    # This ensures equal-weight allocation and full capital usage
-    for symbol in portfolio.positions.keys():
-        price = prices.get(symbol)
-        if price is None or price <= 0:
-            continue
-        target_value = equity * config.target_weight
-        current_value = portfolio.positions[symbol] * price
-        delta_value = target_value - current_value
-
-        if abs(delta_value) < config.min_trade_value:
-            continue
-
-        shares_delta = int(delta_value // price)
-        if shares_delta == 0:
-            continue
-
-        signal = "BUY" if shares_delta > 0 else "SELL"
-        portfolio.execute(
-            symbol=symbol,
-            price=price,
-            signal=signal,
-            position_size=abs(shares_delta)
-        )
+    # Holdings keep their order; new entries follow in entry order
+    book = np.concatenate([kept, entered])
+    book_price = price[book]
+    target_value = equity * config.target_weight
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        delta_value = target_value - shares[book] * book_price
+        tradable = (book_price > 0) & (np.abs(delta_value) >= config.min_trade_value)
+        shares_delta = np.where(
+            tradable, np.floor_divide(delta_value, book_price), 0
+        ).astype(np.int64)
+
+    trims = shares_delta < 0
+    trim_idx = book[trims]
+    trim_shares = np.minimum(-shares_delta[trims], shares[trim_idx])
+    proceeds = trim_shares * price[trim_idx] * (1 - tc)
+    cash = float(running_total(cash, proceeds)[-1])
+    shares[trim_idx] -= trim_shares
+    orders += _orders(symbols, "SELL", trim_idx, trim_shares, price)
 
+    adds = shares_delta > 0
+    add_idx = book[adds]
+    add_shares = shares_delta[adds]
+    filled, cash = fill_buys(cash, add_shares * price[add_idx] * (1 + tc))
+    shares[add_idx[filled]] += add_shares[filled]
+    orders += _orders(symbols, "BUY", add_idx[filled], add_shares[filled], price)
+
+    return AllocationPlan(
+        symbols=symbols,
+        current=current,
+        target=shares,
+        orders=orders,
+        cash=cash,
+    )
+
+
+@instrument(
+    "allocation.allocate_capital",
+    rows=lambda portfolio, top, bottom, *a, **k: len(top) + len(bottom)
+)
+def allocate_capital(
+    portfolio,
+    top_symbols: List[str],
+    bottom_symbols: List[str],
+    prices: Dict[str, float],
+    config: AllocationConfig = AllocationConfig(),
+    risk_mgr=None,
+    timestamp=None
+) -> AllocationPlan:
+    """
+    Apply capital allocation decisions to a portfolio.
+
+    Parameters
+    ----------
+    portfolio : Portfolio
+        Portfolio object (must support execute_batch, positions, cash)
+    top_symbols : list[str]
+        Symbols selected for entry / holding
+    bottom_symbols : list[str]
+        Symbols selected for eviction
+    prices : dict
+        symbol -> current price
+    config : AllocationConfig
+        Allocation policy
+    risk_mgr : optional
+        RiskManager for scaling position sizes; uses its tracked
+        volatility when ``track`` was called, otherwise the std of
+        ``portfolio.get_symbol_history``
+    timestamp : optional
+        Rebalance time; advances the clock of portfolios that stamp
+        their trades (``ColumnarPortfolio.advance``)
+
+    Returns
+    -------
+    AllocationPlan
+        The applied plan (target shares and orders)
+    """
+    plan = plan_allocation(
+        portfolio, top_symbols, bottom_symbols, prices, config, risk_mgr
+    )
+    if timestamp is not None and hasattr(portfolio, "advance"):
+        portfolio.advance(timestamp)
+    portfolio.execute_batch(plan.orders)
+    plan.cash = float(portfolio.cash)
+    return plan
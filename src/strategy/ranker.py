@@ -12,7 +12,11 @@ and side-effect free.
 """
 
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from src.engine.instrumentation import instrument
 
 
 # -------------------------------------------------------------------
@@ -30,6 +34,7 @@ class RankerConfig:
 # Core ranking logic
 # -------------------------------------------------------------------
 
+@instrument("ranking.rank_universe", rows=lambda scores, *a, **k: len(scores))
 def rank_universe(
     scores: Dict[str, float],
     config: RankerConfig = RankerConfig()
@@ -55,33 +60,177 @@ def rank_universe(
     if not scores:
         return {"top": [], "bottom": []}
 
-    # Remove invalid scores
-    clean_scores = {
-        sym: score
-        for sym, score in scores.items()
-        if score is not None and score != float("-inf")
-    }
+    symbols = list(scores.keys())
+    values = np.array(
+        [np.nan if score is None else score for score in scores.values()],
+        dtype=float,
+    )
+    return rank_array(values, symbols, config)
 
-    if not clean_scores:
-        return {"top": [], "bottom": []}
 
-    # Optional minimum score filter
+# -------------------------------------------------------------------
+# Array-based ranking
+# -------------------------------------------------------------------
+
+def _valid_mask(values: np.ndarray, config: RankerConfig) -> np.ndarray:
+    valid = ~np.isnan(values) & (values != -np.inf)
     if config.min_score is not None:
-        clean_scores = {
-            sym: score
-            for sym, score in clean_scores.items()
-            if score >= config.min_score
-        }
+        with np.errstate(invalid="ignore"):
+            valid &= values >= config.min_score
+    return valid
+
+
+def _select_top(values: np.ndarray, idx: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first, ties by position.
+
+    Partitioning finds the k-th best value; only candidates at or above
+    it (all boundary ties included) are sorted, so the result matches a
+    stable descending sort.
+    """
+    if k <= 0 or idx.size == 0:
+        return idx[:0]
+    k = min(k, idx.size)
+
+    vals = values[idx]
+    kth = np.partition(vals, idx.size - k)[idx.size - k]
+    cand = idx[vals >= kth]
+    order = np.lexsort((cand, -values[cand]))
+    return cand[order][:k]
+
+
+def _select_bottom(values: np.ndarray, idx: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the last k entries of the stable descending ranking.
+    """
+    if k <= 0 or idx.size == 0:
+        return idx[:0]
+    k = min(k, idx.size)
+
+    vals = values[idx]
+    kth = np.partition(vals, k - 1)[k - 1]
+    cand = idx[vals <= kth]
+    order = np.lexsort((cand, -values[cand]))
+    return cand[order][-k:]
+
+
+def rank_array(
+    scores: np.ndarray,
+    symbols: Sequence[str],
+    config: RankerConfig = RankerConfig()
+) -> Dict[str, List[str]]:
+    """
+    Rank a score vector with a parallel symbol array.
+
+    Selection is O(n) partitioning plus a sort of the selected names
+    only. Output is identical to a stable descending sort of all scores:
+    ties keep input order, and ``bottom`` is the tail of that ranking.
+    NaN and -inf scores are treated as missing.
 
-    if not clean_scores:
+    Parameters
+    ----------
+    scores : np.ndarray
+        Score per symbol
+    symbols : sequence of str
+        Symbol names aligned with ``scores``
+    config : RankerConfig
+        Ranking configuration
+
+    Returns
+    -------
+    result : dict
+        {"top": [...], "bottom": [...]}
+    """
+    values = np.asarray(scores, dtype=float)
+    names = np.asarray(symbols, dtype=object)
+
+    idx = np.flatnonzero(_valid_mask(values, config))
+    if idx.size == 0:
         return {"top": [], "bottom": []}
 
-    # Sort descending (higher = better)
-    ranked = sorted(clean_scores.items(), key=lambda x: x[1], reverse=True)
+    # ranked[-0:] is the whole list; keep that behaviour
+    bottom_n = config.bottom_n if config.bottom_n != 0 else idx.size
+
+    top = _select_top(values, idx, config.top_n)
+    bottom = _select_bottom(values, idx, bottom_n)
 
-    # Select top-N and bottom-N
-    top_symbols = [sym for sym, _ in ranked[: config.top_n]]
-    bottom_symbols = [sym for sym, _ in ranked[-config.bottom_n:]]
+    return {"top": names[top].tolist(), "bottom": names[bottom].tolist()}
 
-    return {"top": top_symbols, "bottom": bottom_symbols}
 
+@instrument("ranking.rank_matrix", rows=lambda score_matrix, *a, **k: np.size(score_matrix))
+def rank_matrix(
+    score_matrix,
+    symbols: Sequence[str] | None = None,
+    config: RankerConfig = RankerConfig()
+) -> List[Dict[str, List[str]]]:
+    """
+    Rank every row (date) of a dates x symbols score matrix.
+
+    The k-th best / worst value of every row is found with a single
+    partition over the whole matrix; each row then only sorts its
+    boundary candidates.
+
+    Parameters
+    ----------
+    score_matrix : DataFrame or np.ndarray
+        Scores, one row per date
+    symbols : sequence of str, optional
+        Column names; defaults to the DataFrame columns
+    config : RankerConfig
+        Ranking configuration
+
+    Returns
+    -------
+    list[dict]
+        One {"top", "bottom"} result per row, in row order
+    """
+    if symbols is None:
+        symbols = list(score_matrix.columns)
+
+    values = np.asarray(score_matrix, dtype=float)
+    names = np.asarray(symbols, dtype=object)
+    n_rows, n_cols = values.shape
+
+    valid = _valid_mask(values, config)
+    n_valid = valid.sum(axis=1)
+
+    # ----------------------------
+    # Row-wise thresholds in one partition each
+    # ----------------------------
+    k_top = min(max(config.top_n, 0), n_cols)
+    k_bottom = min(max(config.bottom_n, 0), n_cols)
+
+    if k_top > 0:
+        top_key = np.where(valid, values, -np.inf)
+        top_kth = np.partition(top_key, n_cols - k_top, axis=1)[:, n_cols - k_top]
+    if k_bottom > 0:
+        bottom_key = np.where(valid, values, np.inf)
+        bottom_kth = np.partition(bottom_key, k_bottom - 1, axis=1)[:, k_bottom - 1]
+
+    results = []
+    for row in range(n_rows):
+        if n_valid[row] == 0:
+            results.append({"top": [], "bottom": []})
+            continue
+
+        row_values = values[row]
+        row_valid = valid[row]
+
+        if k_top > 0:
+            cand = np.flatnonzero(row_valid & (row_values >= top_kth[row]))
+            top = cand[np.lexsort((cand, -row_values[cand]))][:k_top]
+        else:
+            top = np.empty(0, dtype=np.int64)
+
+        if config.bottom_n == 0:
+            cand = np.flatnonzero(row_valid)
+            bottom = cand[np.lexsort((cand, -row_values[cand]))]
+        elif k_bottom > 0:
+            cand = np.flatnonzero(row_valid & (row_values <= bottom_kth[row]))
+            bottom = cand[np.lexsort((cand, -row_values[cand]))][-k_bottom:]
+        else:
+            bottom = np.empty(0, dtype=np.int64)
+
+        results.append({"top": names[top].tolist(), "bottom": names[bottom].tolist()})
+
+    return results
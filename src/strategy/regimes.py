@@ -1,23 +1,79 @@
 # src/regimes.py
+import numpy as np
 import pandas as pd
 
+from src.strategy.rolling import rolling_mean_var
+
+# Compact regime codes (int8), ordered by volatility
+LOW_VOL_RANGE = 0
+MID_VOL_TREND = 1
+HIGH_VOL_TREND = 2
+
+REGIME_LABELS = {
+    LOW_VOL_RANGE: "low_vol_range",
+    MID_VOL_TREND: "mid_vol_trend",
+    HIGH_VOL_TREND: "high_vol_trend",
+}
+
+
+def classify_regime_matrix(prices, window=20, vol_thresh=0.02):
+    """
+    Classify every (date, ticker) of a price matrix at once.
+
+    Same rules as ``classify_regime``, evaluated with boolean masks over
+    rolling return mean/std. Warm-up bars (no full window yet) are
+    ``mid_vol_trend``, as in the per-series version.
+
+    Parameters
+    ----------
+    prices : pd.DataFrame or np.ndarray
+        Price history, index = dates, columns = tickers
+    window : int
+        Rolling window for return volatility and trend
+    vol_thresh : float
+        Volatility threshold separating range from trend regimes
+
+    Returns
+    -------
+    regimes : same type as ``prices``
+        int8 regime codes
+    labels : dict
+        code -> regime name (``REGIME_LABELS``)
+    """
+    values = np.asarray(prices, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+
+    # Simple returns; missing bars count as flat, like fillna(0)
+    returns = np.zeros_like(values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        returns[1:] = values[1:] / values[:-1] - 1.0
+    returns[np.isnan(returns)] = 0.0
+
+    trend, var = rolling_mean_var(returns, window)
+    vol = np.sqrt(var)
+
+    codes = np.full(values.shape, MID_VOL_TREND, dtype=np.int8)
+    with np.errstate(invalid="ignore"):
+        codes[vol <= vol_thresh] = LOW_VOL_RANGE
+        codes[(vol > vol_thresh) & (np.abs(trend) > 0)] = HIGH_VOL_TREND
+
+    if isinstance(prices, pd.DataFrame):
+        codes = pd.DataFrame(codes, index=prices.index, columns=prices.columns)
+    elif isinstance(prices, pd.Series):
+        codes = pd.Series(codes[:, 0], index=prices.index, name=prices.name)
+    else:
+        codes = codes.reshape(np.shape(prices))
+
+    return codes, dict(REGIME_LABELS)
+
+
 def classify_regime(price_series, window=20, vol_thresh=0.02):
     """
     Simple regime classifier:
     - Trend: high volatility with directional bias
     - Range: low volatility, no directional bias
     """
-    returns = price_series.pct_change().fillna(0)
-    vol = returns.rolling(window).std()
-    trend = returns.rolling(window).mean()
-
-    regimes = []
-    for i in range(len(price_series)):
-        if vol[i] > vol_thresh and abs(trend[i]) > 0:
-            regimes.append("high_vol_trend")
-        elif vol[i] <= vol_thresh:
-            regimes.append("low_vol_range")
-        else:
-            regimes.append("mid_vol_trend")
-    return pd.Series(regimes, index=price_series.index)
-
+    codes, labels = classify_regime_matrix(price_series, window, vol_thresh)
+    names = np.array([labels[c] for c in sorted(labels)], dtype=object)
+    return pd.Series(names[codes.to_numpy()], index=price_series.index)
@@ -0,0 +1,261 @@
+"""
+Incremental rolling-window statistics.
+
+Purpose
+-------
+Maintain trailing-window statistics for many symbols at once, updating
+in O(1) per new bar per symbol instead of recomputing over history:
+
+- mean / std / z-score of prices
+- momentum (last / oldest price in the window)
+- volatility of bar-to-bar returns inside the window
+
+State is array-backed (one column per symbol) with ring buffers and
+sliding-window Welford accumulators. The same object serves batch
+backtests (``warm_up`` on a matrix) and live bar-by-bar loops
+(``update`` per bar).
+
+Conventions follow pandas ``rolling``: a statistic is NaN until
+``min_periods`` bars are in the window; std uses ddof=1. NaN bars are
+skipped per symbol, so each symbol's window holds its last ``window``
+valid bars.
+"""
+
+from typing import Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+EPSILON = 1e-8
+
+
+# -------------------------------------------------------------------
+# Batch rolling moments
+# -------------------------------------------------------------------
+
+def rolling_mean_var(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Trailing mean and variance (ddof=1) along axis 0 of a 2D array.
+
+    Window sums are reduced over a strided view in one pass. Rows before
+    the first full window, and windows containing NaN, are NaN, as with
+    ``DataFrame.rolling(window)``.
+    """
+    mean = np.full(values.shape, np.nan)
+    var = np.full(values.shape, np.nan)
+
+    if window > 1 and len(values) >= window:
+        # Variance is shift-invariant; centering each column keeps
+        # E[x^2] - E[x]^2 from cancelling on high-priced symbols
+        with np.errstate(invalid="ignore"):
+            center = np.nanmean(values, axis=0) if values.size else 0.0
+        center = np.where(np.isnan(center), 0.0, center)
+        shifted = values - center
+
+        window_mean = sliding_window_view(shifted, window, axis=0).mean(axis=-1)
+        window_sq = sliding_window_view(shifted * shifted, window, axis=0).mean(axis=-1)
+
+        mean[window - 1:] = window_mean + center
+        # Clamp tiny negative rounding on flat windows
+        var[window - 1:] = np.maximum(window_sq - window_mean ** 2, 0.0) * (
+            window / (window - 1)
+        )
+
+    return mean, var
+
+
+# -------------------------------------------------------------------
+# Sliding-window accumulator
+# -------------------------------------------------------------------
+
+class _WindowAccumulator:
+    """
+    Ring buffer plus running mean / M2 for a window of length ``size``.
+    """
+
+    def __init__(self, size: int, n_symbols: int):
+        self.size = size
+        self.buffer = np.full((max(size, 1), n_symbols), np.nan)
+        self.pos = np.zeros(n_symbols, dtype=np.int64)
+        self.count = np.zeros(n_symbols, dtype=np.int64)
+        self.mean = np.zeros(n_symbols)
+        self.m2 = np.zeros(n_symbols)
+
+    def push(self, idx: np.ndarray, x: np.ndarray) -> None:
+        if self.size == 0 or idx.size == 0:
+            return
+
+        full = self.count[idx] == self.size
+
+        # ----------------------------
+        # Growing window: plain Welford add
+        # ----------------------------
+        grow = idx[~full]
+        if grow.size:
+            xg = x[~full]
+            self.count[grow] += 1
+            delta = xg - self.mean[grow]
+            self.mean[grow] += delta / self.count[grow]
+            self.m2[grow] += delta * (xg - self.mean[grow])
+
+        # ----------------------------
+        # Full window: replace the oldest value
+        # ----------------------------
+        slide = idx[full]
+        if slide.size:
+            xs = x[full]
+            old = self.buffer[self.pos[slide], slide]
+            old_mean = self.mean[slide]
+            delta = xs - old
+            new_mean = old_mean + delta / self.size
+            self.m2[slide] += delta * (xs - new_mean + old - old_mean)
+            self.mean[slide] = new_mean
+
+        np.maximum(self.m2, 0.0, out=self.m2)
+
+        self.buffer[self.pos[idx], idx] = x
+        self.pos[idx] = (self.pos[idx] + 1) % self.size
+
+    def oldest(self) -> np.ndarray:
+        cols = np.arange(self.buffer.shape[1])
+        return self.buffer[(self.pos - self.count) % self.size, cols]
+
+    def std(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = self.m2 / np.where(self.count > 1, self.count - 1, np.nan)
+        return np.sqrt(var)
+
+    def resync(self) -> None:
+        """
+        Recompute mean / M2 exactly from the buffer to shed drift.
+        """
+        if self.size == 0:
+            return
+        mean = np.nansum(self.buffer, axis=0) / np.maximum(self.count, 1)
+        centered = np.where(np.isnan(self.buffer), 0.0, self.buffer - mean)
+        self.mean = mean
+        self.m2 = (centered ** 2).sum(axis=0)
+
+
+# -------------------------------------------------------------------
+# Public kernel
+# -------------------------------------------------------------------
+
+class RollingStats:
+    """
+    Trailing-window price and return statistics for a fixed symbol set.
+
+    Parameters
+    ----------
+    symbols : sequence of str or int
+        Symbol names, or the number of symbols
+    window : int
+        Number of bars in the price window; returns use ``window - 1``
+    min_periods : int, optional
+        Bars required before statistics are reported (default: window)
+    resync_every : int
+        Recompute accumulators from the buffers every N updates to bound
+        floating-point drift on long runs
+    """
+
+    def __init__(
+        self,
+        symbols: Sequence[str] | int,
+        window: int = 20,
+        min_periods: int | None = None,
+        resync_every: int = 10_000
+    ):
+        if window < 1:
+            raise ValueError("window must be >= 1")
+
+        if isinstance(symbols, int):
+            self.symbols = list(range(symbols))
+        else:
+            self.symbols = list(symbols)
+
+        n = len(self.symbols)
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.resync_every = resync_every
+
+        self._prices = _WindowAccumulator(window, n)
+        self._returns = _WindowAccumulator(window - 1, n)
+        self._last = np.full(n, np.nan)
+        self._updates = 0
+
+    # ----------------------------
+    # Updates
+    # ----------------------------
+    def update(self, prices) -> None:
+        """
+        Add one bar (one price per symbol, NaN = no bar for that symbol).
+        """
+        row = np.asarray(prices, dtype=float)
+        idx = np.flatnonzero(~np.isnan(row))
+        x = row[idx]
+
+        prev = self._last[idx]
+        has_prev = ~np.isnan(prev)
+        self._returns.push(idx[has_prev], x[has_prev] / prev[has_prev] - 1.0)
+        self._prices.push(idx, x)
+        self._last[idx] = x
+
+        self._updates += 1
+        if self.resync_every and self._updates % self.resync_every == 0:
+            self._prices.resync()
+            self._returns.resync()
+
+    def warm_up(self, history) -> "RollingStats":
+        """
+        Feed a dates x symbols matrix bar by bar.
+        """
+        for row in np.asarray(history, dtype=float):
+            self.update(row)
+        return self
+
+    # ----------------------------
+    # Statistics
+    # ----------------------------
+    def _ready(self) -> np.ndarray:
+        return self._prices.count >= max(self.min_periods, 1)
+
+    @property
+    def count(self) -> np.ndarray:
+        return self._prices.count.copy()
+
+    @property
+    def last(self) -> np.ndarray:
+        return self._last.copy()
+
+    def mean(self) -> np.ndarray:
+        return np.where(self._ready(), self._prices.mean, np.nan)
+
+    def std(self) -> np.ndarray:
+        return np.where(self._ready(), self._prices.std(), np.nan)
+
+    def zscore(self, prices=None) -> np.ndarray:
+        """
+        (price - mean) / std, 0 where std is ~0; price defaults to last bar.
+        """
+        price = self._last if prices is None else np.asarray(prices, dtype=float)
+        std = self.std()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z = (price - self.mean()) / std
+        return np.where(std < EPSILON, 0.0, z)
+
+    def momentum(self) -> np.ndarray:
+        """
+        Last price / oldest price in the window - 1.
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mom = self._last / self._prices.oldest() - 1.0
+        return np.where(self._ready(), mom, np.nan)
+
+    def volatility(self) -> np.ndarray:
+        """
+        Std (ddof=1) of the returns between bars inside the window.
+        """
+        if self.window < 2:
+            return np.where(self._ready(), 0.0, np.nan)
+        return np.where(self._ready(), self._returns.std(), np.nan)
@@ -19,6 +19,8 @@ from dataclasses import dataclass
 import numpy as np
 import pandas as pd
 
+from src.engine.instrumentation import instrument
+
 # -------------------------------------------------------------------
 # Configuration
 # -------------------------------------------------------------------
@@ -125,3 +127,206 @@ def score_symbol(
 
     return float(final_score)
 
+
+# -------------------------------------------------------------------
+# Vectorized cross-sectional scoring
+# -------------------------------------------------------------------
+
+def _as_matrix(prices) -> np.ndarray:
+    values = np.asarray(prices, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    return values
+
+
+def _regime_multipliers(regimes, multipliers: dict, shape) -> np.ndarray:
+    """
+    Map regime labels (scalar, per-symbol or per-cell) to multipliers.
+    """
+    if regimes is None or isinstance(regimes, str):
+        return np.full(shape, multipliers.get(regimes, 1.0))
+
+    labels = np.asarray(regimes, dtype=object)
+    uniques, inverse = np.unique(labels, return_inverse=True)
+    lookup = np.array([multipliers.get(u, 1.0) for u in uniques], dtype=float)
+    return np.broadcast_to(lookup[inverse].reshape(labels.shape), shape)
+
+
+def _combine_score(
+    price: np.ndarray,
+    z: np.ndarray,
+    momentum: np.ndarray,
+    vol: np.ndarray,
+    regimes,
+    rotation_scores,
+    config: ScoringConfig
+) -> np.ndarray:
+    """
+    Same arithmetic as ``score_symbol``, applied elementwise.
+    """
+    raw_score = -z + 0.5 * momentum
+    adjusted_score = raw_score / (1.0 + config.vol_penalty * vol)
+
+    multipliers = config.regime_multipliers or DEFAULT_REGIME_MULTIPLIERS
+    adjusted_score *= _regime_multipliers(regimes, multipliers, price.shape)
+
+    rotation = np.asarray(rotation_scores, dtype=float)
+    adjusted_score *= (1.0 + config.rotation_weight * (rotation - 0.5))
+
+    price_penalty = config.price_penalty_weight / np.maximum(price, EPSILON)
+    return adjusted_score - price_penalty
+
+
+@instrument("scoring.score_universe", rows=lambda prices, *a, **k: np.shape(prices)[1])
+def score_universe(
+    prices,
+    regimes=None,
+    rotation_scores=0.5,
+    config: ScoringConfig = ScoringConfig(),
+    current_prices=None
+):
+    """
+    Score every symbol at once; matches ``score_symbol`` per column.
+
+    Parameters
+    ----------
+    prices : DataFrame or np.ndarray
+        History matrix, dates x symbols. Each column is the ``history``
+        passed to ``score_symbol`` (NaNs are dropped per column).
+    regimes : str or array-like
+        One regime label for all symbols or one per symbol
+    rotation_scores : float or array-like
+        Rotation score per symbol
+    config : ScoringConfig
+        Scoring configuration
+    current_prices : array-like, optional
+        Price per symbol; defaults to the last valid value of each column
+
+    Returns
+    -------
+    pd.Series or np.ndarray
+        Score per symbol (Series indexed by symbol for DataFrame input);
+        ``-inf`` where fewer than ``config.lookback`` valid bars exist.
+    """
+    values = _as_matrix(prices)
+    n_dates, n_symbols = values.shape
+
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=0)
+
+    # ----------------------------
+    # First / last valid bar per column
+    # ----------------------------
+    cols = np.arange(n_symbols)
+    has_data = count > 0
+    first_idx = np.where(has_data, valid.argmax(axis=0), 0)
+    last_idx = np.where(has_data, n_dates - 1 - valid[::-1].argmax(axis=0), 0)
+    first = values[first_idx, cols] if n_dates else np.full(n_symbols, np.nan)
+    last = values[last_idx, cols] if n_dates else np.full(n_symbols, np.nan)
+
+    if current_prices is None:
+        price = last
+    else:
+        price = np.broadcast_to(np.asarray(current_prices, dtype=float), (n_symbols,))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # ----------------------------
+        # Z-score against full history
+        # ----------------------------
+        mean = np.nansum(values, axis=0) / np.where(count > 0, count, np.nan)
+        centered = np.where(valid, values - mean, 0.0)
+        std = np.sqrt(
+            (centered ** 2).sum(axis=0) / np.where(count > 1, count - 1, np.nan)
+        )
+        z = np.where(std < EPSILON, 0.0, (price - mean) / std)
+
+        # ----------------------------
+        # Momentum: last / first valid bar
+        # ----------------------------
+        momentum = np.where(count >= 2, last / first - 1.0, 0.0)
+
+        # ----------------------------
+        # Volatility of returns between consecutive valid bars
+        # ----------------------------
+        filled = pd.DataFrame(values).ffill().to_numpy()
+        returns = np.full_like(values, np.nan)
+        if n_dates > 1:
+            returns[1:] = values[1:] / filled[:-1] - 1.0
+        n_returns = (~np.isnan(returns)).sum(axis=0)
+        ret_mean = np.nansum(returns, axis=0) / np.where(n_returns > 0, n_returns, np.nan)
+        ret_centered = np.where(np.isnan(returns), 0.0, returns - ret_mean)
+        vol = np.sqrt(
+            (ret_centered ** 2).sum(axis=0)
+            / np.where(n_returns > 1, n_returns - 1, np.nan)
+        )
+        vol = np.where(n_returns == 0, 0.0, vol)
+
+        scores = _combine_score(price, z, momentum, vol, regimes, rotation_scores, config)
+
+    scores = np.where(count < config.lookback, -np.inf, scores)
+
+    if isinstance(prices, pd.DataFrame):
+        return pd.Series(scores, index=prices.columns, name="score")
+    return scores
+
+
+@instrument("scoring.score_universe_matrix", rows=lambda prices, *a, **k: np.size(prices))
+def score_universe_matrix(
+    prices,
+    regimes=None,
+    rotation_scores=0.5,
+    config: ScoringConfig = ScoringConfig()
+):
+    """
+    Score every (date, symbol) using a trailing ``config.lookback`` window.
+
+    Cell (t, j) equals ``score_symbol(price=prices[t, j],
+    history=prices[t - lookback + 1 : t + 1, j], ...)``; windows that are
+    incomplete or contain NaNs score ``-inf``.
+
+    Parameters
+    ----------
+    prices : DataFrame or np.ndarray
+        Price matrix, dates x symbols
+    regimes : str or array-like
+        Scalar, per-symbol vector or dates x symbols label matrix
+    rotation_scores : float or array-like
+        Scalar, per-symbol vector or dates x symbols matrix
+    config : ScoringConfig
+        Scoring configuration
+
+    Returns
+    -------
+    DataFrame or np.ndarray
+        Score matrix with the same shape (and labels) as ``prices``
+    """
+    values = _as_matrix(prices)
+    window = config.lookback
+    frame = pd.DataFrame(values)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        count = frame.notna().rolling(window, min_periods=1).sum().to_numpy()
+
+        rolling = frame.rolling(window)
+        mean = rolling.mean().to_numpy()
+        std = rolling.std().to_numpy()
+        z = np.where(std < EPSILON, 0.0, (values - mean) / std)
+
+        if window >= 2:
+            momentum = values / frame.shift(window - 1).to_numpy() - 1.0
+        else:
+            momentum = np.zeros_like(values)
+
+        if window >= 2:
+            returns = frame / frame.shift(1) - 1.0
+            vol = returns.rolling(window - 1).std().to_numpy()
+        else:
+            vol = np.zeros_like(values)
+
+        scores = _combine_score(values, z, momentum, vol, regimes, rotation_scores, config)
+
+    scores = np.where(count < window, -np.inf, scores)
+
+    if isinstance(prices, pd.DataFrame):
+        return pd.DataFrame(scores, index=prices.index, columns=prices.columns)
+    return scores
@@ -3,47 +3,80 @@
 import pandas as pd
 import numpy as np
 
-def generate_signals(prices: pd.Series, lookback: int = 20, buy_zscore: float = -1.0, sell_zscore: float = 1.0):
+from src.config.config import LOOKBACK, BUY_ZSCORE, SELL_ZSCORE
+from src.engine.instrumentation import instrument
+from src.strategy.rolling import rolling_mean_var
+
+# Compact signal codes (int8)
+HOLD = 0
+BUY = 1
+SELL = -1
+
+SIGNAL_LABELS = {HOLD: "HOLD", BUY: "BUY", SELL: "SELL"}
+
+
+@instrument("signals.generate_signals", rows=lambda prices, *a, **k: np.size(prices))
+def generate_signals(
+    prices,
+    lookback: int = LOOKBACK,
+    buy_zscore: float = BUY_ZSCORE,
+    sell_zscore: float = SELL_ZSCORE
+):
     """
-    Generate simple z-score based BUY, SELL, HOLD signals for a Series of prices.
-    
+    Generate z-score based BUY, SELL, HOLD signals for a price history.
+
+    The z-score at each bar uses the rolling mean/std (ddof=1) of the
+    trailing ``lookback`` bars, current bar included. Window sums are
+    reduced over a strided view, so every ticker is handled in one
+    vectorized pass without a Python loop.
+
     Parameters
     ----------
-    prices : pd.Series
-        Current day prices for tickers (index=ticker)
+    prices : pd.DataFrame, pd.Series or np.ndarray
+        Price history, index = dates, columns = tickers
     lookback : int
         Lookback period for rolling mean/std
     buy_zscore : float
         Z-score threshold to BUY
     sell_zscore : float
         Z-score threshold to SELL
-    
+
     Returns
     -------
-    signals : dict
-        Dictionary of ticker -> signal ('BUY', 'SELL', 'HOLD')
+    signals : same type and shape as ``prices``
+        int8 codes: BUY (1), SELL (-1), HOLD (0). Warm-up bars, NaN
+        prices and flat windows (std == 0) are HOLD. Use
+        ``SIGNAL_LABELS`` to map codes to names.
     """
-    signals = dict()
-    
-    for ticker in prices.index:
-        # For a single-ticker series, you would normally use historical price
-        # Here we'll assume prices is a pd.Series of length lookback (mocking for now)
-        # In real system, replace with historical series of that ticker
-        price_history = prices[ticker:ticker+lookback]  # placeholder
-        
-        mean = price_history.mean()
-        std = price_history.std()
-        if std == 0:
-            signals[ticker] = "HOLD"
-            continue
-        
-        zscore = (prices[ticker] - mean) / std
-        if zscore <= buy_zscore:
-            signals[ticker] = "BUY"
-        elif zscore >= sell_zscore:
-            signals[ticker] = "SELL"
-        else:
-            signals[ticker] = "HOLD"
-            
-    return signals
+    values = np.asarray(prices, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+
+    mean, var = rolling_mean_var(values, lookback)
+    codes = zscore_signal_codes(values, mean, np.sqrt(var), buy_zscore, sell_zscore)
+
+    if isinstance(prices, pd.DataFrame):
+        return pd.DataFrame(codes, index=prices.index, columns=prices.columns)
+    if isinstance(prices, pd.Series):
+        return pd.Series(codes[:, 0], index=prices.index, name=prices.name)
+    return codes.reshape(np.shape(prices))
+
+
+def zscore_signal_codes(values, mean, std, buy_zscore=BUY_ZSCORE, sell_zscore=SELL_ZSCORE):
+    """
+    Threshold precomputed rolling mean/std into int8 signal codes.
+
+    Lets callers that sweep thresholds reuse one ``rolling_mean_var``
+    pass per lookback.
+    """
+    codes = np.zeros(np.shape(values), dtype=np.int8)
+
+    # NaN comparisons are False, so warm-up and missing bars stay HOLD
+    # z <= k  <=>  (price - mean) <= k * std  for std > 0
+    with np.errstate(invalid="ignore"):
+        deviation = values - mean
+        tradable = std > 0
+        codes[tradable & (deviation <= buy_zscore * std)] = BUY
+        codes[tradable & (deviation >= sell_zscore * std)] = SELL
 
+    return codes
@@ -1,5 +1,8 @@
+import numpy as np
 import pandas as pd
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Dict, Iterator, List, Tuple
 
 UNIVERSE_PATH = "universe.csv"
 
@@ -10,8 +13,14 @@ def load_universe(path=UNIVERSE_PATH, as_of: str = None) -> pd.DataFrame:
     """
     Load raw universe snapshot, optionally filtering by date.
     """
-    df = pd.read_csv(path)
+    return _prepare_snapshot(pd.read_csv(path), as_of)
+
 
+def _prepare_snapshot(df: pd.DataFrame, as_of: str = None) -> pd.DataFrame:
+    """
+    Parse dates, apply ``as_of`` and fill optional columns of a raw
+    snapshot frame.
+    """
     # Ensure proper datetime column
     if "date" in df.columns:
         df["date"] = pd.to_datetime(df["date"])
@@ -83,3 +92,202 @@ def refresh_universe(df: pd.DataFrame, add_new: list[str] = None, remove: list[s
 
     return sorted(tickers)
 
+
+# -------------------------------------------------------------------
+# Point-in-time membership index
+# -------------------------------------------------------------------
+_OPEN = np.iinfo(np.int64).max     # "still listed" interval end (ns)
+
+
+def _to_ns(values) -> np.ndarray:
+    """
+    Dates -> int64 nanoseconds; NaT / None -> open-ended.
+    """
+    ns = pd.to_datetime(pd.Series(values), errors="coerce").to_numpy(dtype="datetime64[ns]").view(np.int64)
+    return np.where(ns == np.iinfo(np.int64).min, _OPEN, ns)
+
+
+@dataclass
+class MembershipEvent:
+    date: pd.Timestamp
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    delisted: List[str] = field(default_factory=list)
+
+
+class MembershipIndex:
+    """
+    Date-sorted universe membership intervals.
+
+    A ticker is eligible on date D if some interval has
+    ``added <= D < removed``. Intervals are sorted by start, so "who is
+    eligible on D" is a binary search for the candidates plus one
+    vectorized mask, instead of re-reading and filtering the snapshot
+    CSV. Delisted tickers keep their historical intervals, which keeps
+    backtests free of survivorship bias.
+
+    Parameters
+    ----------
+    intervals : DataFrame
+        Columns: ticker, added, removed (NaT = still listed) and
+        optionally delisted (the interval ended in a delisting)
+    """
+
+    def __init__(self, intervals: pd.DataFrame):
+        df = intervals.dropna(subset=["ticker", "added"])
+
+        start = _to_ns(df["added"])
+        end = _to_ns(df["removed"]) if "removed" in df.columns else np.full(len(df), _OPEN)
+        delisted = (
+            df["delisted"].fillna(False).astype(bool).to_numpy()
+            if "delisted" in df.columns
+            else np.zeros(len(df), dtype=bool)
+        )
+
+        # Ticker codes follow sorted names, so sorting codes sorts names
+        self.names, codes = np.unique(df["ticker"].astype(str).to_numpy(), return_inverse=True)
+
+        order = np.argsort(start, kind="stable")
+        self._start = start[order]
+        self._end = end[order]
+        self._code = codes[order]
+        self._delisted = delisted[order]
+
+        # Per-ticker intervals for point lookups
+        self._by_ticker: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        by_code = np.argsort(self._code, kind="stable")
+        bounds = np.searchsorted(self._code[by_code], np.arange(len(self.names) + 1))
+        for i, name in enumerate(self.names):
+            rows = by_code[bounds[i]:bounds[i + 1]]
+            self._by_ticker[name] = (self._start[rows], self._end[rows])
+
+    def __len__(self) -> int:
+        return len(self._start)
+
+    # ----------------------------
+    # Construction
+    # ----------------------------
+    @classmethod
+    def from_snapshots(cls, df: pd.DataFrame) -> "MembershipIndex":
+        """
+        Build intervals from dated snapshot rows (``ticker``, ``date``,
+        optional ``delisted``), as read by ``load_universe``.
+
+        A ticker stays a member from the first snapshot it appears in
+        until the next snapshot it is missing from (or flagged delisted).
+        """
+        df = df.dropna(subset=["ticker", "date"])
+        dates = np.unique(pd.to_datetime(df["date"]).to_numpy(dtype="datetime64[ns]"))
+
+        delisted = (
+            df["delisted"].fillna(False).astype(bool).to_numpy()
+            if "delisted" in df.columns
+            else np.zeros(len(df), dtype=bool)
+        )
+
+        listed = df[~delisted]
+        snap = np.searchsorted(dates, pd.to_datetime(listed["date"]).to_numpy(dtype="datetime64[ns]"))
+        tickers = listed["ticker"].astype(str).to_numpy()
+
+        runs = pd.DataFrame({"ticker": tickers, "snap": snap}).drop_duplicates()
+        runs = runs.sort_values(["ticker", "snap"], kind="stable").reset_index(drop=True)
+
+        # A new run starts on a new ticker or a gap in snapshots
+        t = runs["ticker"].to_numpy()
+        k = runs["snap"].to_numpy()
+        new_run = np.ones(len(runs), dtype=bool)
+        new_run[1:] = (t[1:] != t[:-1]) | (k[1:] != k[:-1] + 1)
+
+        first = np.flatnonzero(new_run)
+        last = np.append(first[1:] - 1, len(runs) - 1) if len(runs) else first
+
+        end_snap = k[last] + 1
+        is_open = end_snap >= len(dates)
+        removed = np.where(
+            is_open,
+            np.datetime64("NaT"),
+            dates[np.minimum(end_snap, len(dates) - 1)],
+        ) if len(runs) else np.array([], dtype="datetime64[ns]")
+
+        # Interval ended because the ticker was flagged delisted next
+        gone = set(zip(
+            df.loc[delisted, "ticker"].astype(str),
+            np.searchsorted(dates, pd.to_datetime(df.loc[delisted, "date"]).to_numpy(dtype="datetime64[ns]")),
+        ))
+        ended_delisted = np.array(
+            [(t[i], e) in gone for i, e in zip(last, end_snap)], dtype=bool
+        )
+
+        return cls(pd.DataFrame({
+            "ticker": t[first],
+            "added": dates[k[first]] if len(runs) else [],
+            "removed": removed,
+            "delisted": ended_delisted,
+        }))
+
+    # ----------------------------
+    # Queries
+    # ----------------------------
+    def members(self, date) -> List[str]:
+        """
+        Tickers eligible on ``date``, sorted.
+        """
+        d = _to_ns([date])[0]
+        k = np.searchsorted(self._start, d, side="right")
+        active = self._code[:k][self._end[:k] > d]
+        return self.names[np.unique(active)].tolist()
+
+    def is_member(self, ticker: str, date) -> bool:
+        intervals = self._by_ticker.get(ticker)
+        if intervals is None:
+            return False
+        starts, ends = intervals
+        d = _to_ns([date])[0]
+        return bool(np.any((starts <= d) & (ends > d)))
+
+    def events(self, start=None, end=None) -> Iterator[MembershipEvent]:
+        """
+        Stream membership changes in date order (optionally within
+        ``start <= date <= end``), one event per change date.
+        """
+        closes = self._end != _OPEN
+        when = np.concatenate([self._start, self._end[closes]])
+        kind = np.concatenate([
+            np.zeros(len(self._start), dtype=np.int8),
+            np.where(self._delisted[closes], 2, 1).astype(np.int8),
+        ])
+        code = np.concatenate([self._code, self._code[closes]])
+
+        order = np.lexsort((code, kind, when))
+        when, kind, code = when[order], kind[order], code[order]
+
+        lo = 0 if start is None else np.searchsorted(when, _to_ns([start])[0], side="left")
+        hi = len(when) if end is None else np.searchsorted(when, _to_ns([end])[0], side="right")
+
+        i = lo
+        while i < hi:
+            j = i + np.searchsorted(when[i:hi], when[i], side="right")
+            event = MembershipEvent(date=pd.Timestamp(when[i]))
+            for c, k in zip(code[i:j], kind[i:j]):
+                name = str(self.names[c])
+                if k == 0:
+                    event.added.append(name)
+                elif k == 1:
+                    event.removed.append(name)
+                else:
+                    event.delisted.append(name)
+            yield event
+            i = j
+
+
+def load_membership_index(path=UNIVERSE_PATH) -> MembershipIndex:
+    """
+    Parse the snapshot CSV once into a ``MembershipIndex``.
+
+    Uses ``added`` / ``removed`` interval columns if present, otherwise
+    derives intervals from dated snapshots.
+    """
+    df = pd.read_csv(path)
+    if "added" in df.columns:
+        return MembershipIndex(df)
+    return MembershipIndex.from_snapshots(_prepare_snapshot(df))
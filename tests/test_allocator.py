@@ -0,0 +1,31 @@
+import pytest
+
+from src.portfolio.columnar import ColumnarPortfolio
+from src.portfolio.portfolio import Portfolio
+from src.strategy.allocator import AllocationConfig, allocate_capital, plan_allocation
+
+
+CONFIG = AllocationConfig(max_positions=2, target_weight=0.4)
+PRICES = {"AAA": 10.0, "BBB": 20.0, "CCC": 40.0}
+
+
+def _book(cls):
+    portfolio = cls(10_000.0)
+    portfolio.execute_batch([("AAA", "BUY", 300, 10.0), ("BBB", "BUY", 100, 20.0)])
+    return portfolio
+
+
+@pytest.mark.parametrize("cls", [Portfolio, ColumnarPortfolio])
+def test_plan_cash_is_cash_after_netting(cls):
+    # AAA is evicted and re-enters: the SELL and BUY net to a trim
+    projected = plan_allocation(_book(cls), ["AAA", "CCC"], ["AAA", "BBB"], PRICES, CONFIG).cash
+
+    portfolio = _book(cls)
+    plan = allocate_capital(portfolio, ["AAA", "CCC"], ["AAA", "BBB"], PRICES, CONFIG)
+
+    assert plan.cash == portfolio.cash
+    assert plan.cash > projected
+    assert portfolio.positions == {
+        s: int(n) for s, n in zip(plan.symbols, plan.target) if n
+    }
+    assert set(portfolio.positions) == {"AAA", "CCC"}
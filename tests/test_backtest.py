@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_prices
+from src.engine.backtest import MeanReversionConfig, run_backtest, run_mean_reversion_backtest
+from src.strategy.signals import BUY, HOLD
+
+
+def _momentum_signal(series):
+    if len(series) < 20:
+        return "HOLD"
+
+    fast = series.rolling(5).mean().iloc[-1]
+    slow = series.rolling(20).mean().iloc[-1]
+
+    if fast > slow * 1.01:
+        return "BUY"
+    elif fast < slow * 0.99:
+        return "SELL"
+    return "HOLD"
+
+
+def _reference_momentum_loop(prices, cash, transaction_cost):
+    """
+    The original per-day loop from quant_simulator.py.
+    """
+    positions = {}
+    trade_log = []
+    equity_curve = []
+
+    for day, date in enumerate(prices.index):
+        for t in prices.columns:
+            price_series = prices[t].iloc[:day + 1]
+            price = price_series.iloc[-1]
+            signal = _momentum_signal(price_series)
+
+            if signal == "BUY" and cash > price:
+                qty = int(cash // price)
+                if qty > 0:
+                    cash -= qty * price * (1 + transaction_cost)
+                    positions[t] = positions.get(t, 0) + qty
+                    trade_log.append((date, t, "BUY", price, qty))
+
+            elif signal == "SELL" and positions.get(t, 0) > 0:
+                qty = positions[t]
+                cash += qty * price * (1 - transaction_cost)
+                positions[t] = 0
+                trade_log.append((date, t, "SELL", price, qty))
+
+        equity_curve.append(cash + sum(
+            positions.get(t, 0) * prices[t].iloc[day] for t in positions
+        ))
+
+    return trade_log, equity_curve, cash, {t: q for t, q in positions.items() if q}
+
+
+def test_momentum_backtest_matches_original_loop():
+    prices = make_prices(8, 120, seed=7)
+
+    trade_log, equity_curve, cash, positions = _reference_momentum_loop(prices, 272.0, 0.001)
+    result = run_backtest(prices, starting_cash=272.0, transaction_cost=0.001)
+
+    assert len(trade_log) > 10
+    assert result.trade_log == trade_log
+    np.testing.assert_allclose(result.equity_curve.to_numpy(), equity_curve, rtol=1e-12)
+    assert result.cash == pytest.approx(cash, rel=1e-12)
+    assert result.positions == positions
+
+    peak = np.maximum.accumulate(np.maximum(equity_curve, 272.0))
+    np.testing.assert_allclose(result.drawdown.to_numpy(), (peak - equity_curve) / peak * 100, atol=1e-12)
+
+
+def _buy_first_day(n_days, n_tickers):
+    signals = np.full((n_days, n_tickers), HOLD, dtype=np.int8)
+    signals[0] = BUY
+    return signals
+
+
+def test_mean_reversion_closes_delisted_position():
+    prices = pd.DataFrame(
+        {"A": [10.0, 11.0, 12.0, np.nan, np.nan], "B": [20.0] * 5},
+        index=pd.date_range("2024-01-01", periods=5),
+    )
+    config = MeanReversionConfig(max_position_pct=0.5, transaction_cost=0.0)
+
+    result = run_mean_reversion_backtest(
+        prices, config, initial_capital=1000.0, signals=_buy_first_day(5, 2)
+    )
+
+    sells = [t for t in result.trade_log if t[2] == "SELL"]
+    assert sells == [(prices.index[2], "A", "SELL", 12.0, 50)]
+    assert "A" not in result.positions
+    assert np.isfinite(result.equity_curve).all()
+    assert result.equity_curve.iloc[-1] == 1000.0 + 50 * 2.0
+
+
+def test_mean_reversion_marks_gap_at_last_price():
+    prices = pd.DataFrame({"A": [10.0, 11.0, np.nan, 13.0]})
+    config = MeanReversionConfig(max_position_pct=0.5, transaction_cost=0.0)
+
+    result = run_mean_reversion_backtest(
+        prices, config, initial_capital=1000.0, signals=_buy_first_day(4, 1)
+    )
+
+    assert result.positions == {"A": 50}
+    assert result.equity_curve.tolist() == [1000.0, 1050.0, 1050.0, 1150.0]
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from src.portfolio.columnar import ColumnarPortfolio
+from src.portfolio.portfolio import Portfolio
+from src.strategy.allocator import AllocationConfig, allocate_capital
+
+
+ORDERS = [
+    [("AAA", "BUY", 10, 50.0), ("BBB", "BUY", 20, 20.0), ("CCC", "BUY", 100, 90.0)],
+    [("AAA", "SELL", 4, 55.0), ("BBB", "SELL", 5, 21.0), ("BBB", "BUY", 2, 21.0), ("DDD", "BUY", 3, 10.0)],
+    [("AAA", "SELL", 100, 60.0), ("ZZZ", "SELL", 1, 5.0)],
+]
+
+
+def test_execute_batch_matches_portfolio():
+    reference = Portfolio(2_000.0)
+    columnar = ColumnarPortfolio(2_000.0)
+
+    for orders in ORDERS:
+        assert columnar.execute_batch(orders) == reference.execute_batch(orders)
+
+    assert columnar.cash == pytest.approx(reference.cash)
+    assert columnar.positions == reference.positions
+    assert columnar.trade_log == reference.trade_log
+
+
+def test_unfilled_orders_do_not_register_symbols():
+    portfolio = ColumnarPortfolio(100.0)
+
+    portfolio.execute_batch([("BIG", "BUY", 10, 50.0), ("NONE", "SELL", 5, 1.0), ("OK", "BUY", 1, 10.0)])
+
+    assert portfolio.table.symbols == ["OK"]
+    assert portfolio.positions == {"OK": 1}
+
+
+def test_trades_are_stamped_with_the_clock():
+    portfolio = ColumnarPortfolio(1_000.0)
+
+    portfolio.advance(3)
+    portfolio.execute("AAA", 10.0, "BUY", 5)
+    portfolio.advance(pd.Timestamp("2024-01-05"))
+    portfolio.execute("AAA", 11.0, "SELL")
+
+    assert portfolio.log.columns()["timestamp"].tolist() == [3, pd.Timestamp("2024-01-05").value]
+
+
+def test_allocate_capital_advances_clock():
+    portfolio = ColumnarPortfolio(10_000.0)
+    prices = {"AAA": 10.0, "BBB": 20.0}
+
+    allocate_capital(portfolio, ["AAA", "BBB"], [], prices, AllocationConfig(max_positions=2, target_weight=0.4), timestamp="2024-02-01")
+
+    frame = portfolio.log.to_frame(portfolio.table)
+    assert len(frame) == 2
+    assert (frame["timestamp"] == pd.Timestamp("2024-02-01").value).all()
@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data import data_loader
+from src.data.data_loader import BatchConfig, fetch_in_batches
+from src.data.fetchers import InMemoryFetcher
+from src.data.price_cache import PriceCache
+
+
+START, END = "2024-01-01", "2024-04-01"
+
+
+def _bars(periods=90, seed=0):
+    dates = pd.bdate_range(START, periods=periods)
+    close = 50 + np.random.default_rng(seed).normal(0, 1, periods).cumsum()
+    return pd.DataFrame({"Close": close}, index=dates)
+
+
+class FlakyFetcher(InMemoryFetcher):
+    """
+    Drops each ticker in ``flaky`` from its first N responses and raises
+    on any request that contains a ticker in ``broken``.
+    """
+
+    def __init__(self, frames, flaky=None, broken=()):
+        super().__init__(frames)
+        self.flaky = dict(flaky or {})
+        self.broken = set(broken)
+
+    def fetch_many(self, tickers, start, end):
+        frames = super().fetch_many(tickers, start, end)
+        if self.broken & set(tickers):
+            raise ConnectionError("upstream error")
+        for ticker in list(frames):
+            if self.flaky.get(ticker, 0) > 0:
+                self.flaky[ticker] -= 1
+                del frames[ticker]
+        return frames
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(data_loader.time, "sleep", delays.append)
+    return delays
+
+
+def test_batches_in_input_order():
+    tickers = [f"T{i}" for i in range(5)]
+    fetcher = InMemoryFetcher({t: _bars(seed=i) for i, t in enumerate(tickers)})
+
+    frames, reports = fetch_in_batches(tickers, START, END, fetcher, BatchConfig(batch_size=2))
+
+    assert list(frames) == tickers
+    assert sorted(len(call[0]) for call in fetcher.calls) == [1, 2, 2]
+    assert [r.batch_id for r in reports] == [0, 1, 2]
+    assert all(r.failed == [] and r.attempts == 1 for r in reports)
+
+
+def test_groups_by_missing_range(tmp_path):
+    fetcher = InMemoryFetcher({t: _bars(seed=i) for i, t in enumerate(["AAA", "BBB", "CCC"])})
+    cache = PriceCache(root=str(tmp_path), fetcher=fetcher, file_format="pickle")
+    cache.load("AAA", START, "2024-03-01")
+    cache.load("BBB", START, "2024-03-01")
+    fetcher.calls.clear()
+
+    frames, _ = fetch_in_batches(["AAA", "BBB", "CCC"], START, END, config=BatchConfig(), cache=cache)
+
+    requests = sorted((tuple(call[0]), call[1], call[2]) for call in fetcher.calls)
+    assert requests == [
+        (("AAA", "BBB"), "2024-03-01", "2024-04-01"),
+        (("CCC",), "2024-01-01", "2024-04-01"),
+    ]
+    for ticker in ["AAA", "BBB", "CCC"]:
+        expected = fetcher.frames[ticker].loc[:"2024-03-31"]
+        pd.testing.assert_frame_equal(frames[ticker], expected, check_freq=False)
+
+
+def test_retries_only_failed_symbols_with_backoff(sleeps):
+    fetcher = FlakyFetcher({"AAA": _bars(), "BBB": _bars(seed=1)}, flaky={"BBB": 2})
+    config = BatchConfig(max_retries=2, backoff_seconds=0.5)
+
+    frames, [report] = fetch_in_batches(["AAA", "BBB"], START, END, fetcher, config)
+
+    assert list(frames) == ["AAA", "BBB"]
+    assert [call[0] for call in fetcher.calls] == [["AAA", "BBB"], ["BBB"], ["BBB"]]
+    assert sleeps == [0.5, 1.0]
+    assert report.attempts == 3 and report.n_ok == 2 and report.failed == []
+
+
+def test_partial_failures_are_reported(sleeps):
+    frames_in = {"AAA": _bars(), "BBB": _bars(seed=1), "CCC": _bars(seed=2)}
+    fetcher = FlakyFetcher(frames_in, flaky={"BBB": 5}, broken={"CCC"})
+    config = BatchConfig(batch_size=2, max_retries=1, backoff_seconds=0.0)
+
+    frames, reports = fetch_in_batches(["AAA", "BBB", "CCC", "DDD"], START, END, fetcher, config)
+
+    # CCC's errors are isolated: DDD is simply missing upstream
+    assert list(frames) == ["AAA"]
+    assert [r.failed for r in reports] == [["BBB"], ["CCC", "DDD"]]
+    assert [r.attempts for r in reports] == [2, 2]
+    assert [r.n_ok for r in reports] == [1, 0]
+
+
+def test_raising_symbol_does_not_fail_its_batch(sleeps):
+    tickers = [f"T{i}" for i in range(8)]
+    frames_in = {t: _bars(seed=i) for i, t in enumerate(tickers)}
+    fetcher = FlakyFetcher(frames_in, broken={"T5"})
+    config = BatchConfig(batch_size=8, max_retries=1, backoff_seconds=0.0)
+
+    frames, [report] = fetch_in_batches(tickers, START, END, fetcher, config)
+
+    assert list(frames) == [t for t in tickers if t != "T5"]
+    assert report.failed == ["T5"] and report.n_ok == 7
+    assert report.attempts == 2
+    # Bisection: 8 -> 4 -> 2 -> 1 on the first attempt, then T5 alone
+    first_attempt = [call[0] for call in fetcher.calls[:7]]
+    assert first_attempt == [
+        tickers, tickers[:4], tickers[4:], ["T4", "T5"], ["T4"], ["T5"], ["T6", "T7"],
+    ]
+    assert [call[0] for call in fetcher.calls[7:]] == [["T5"]]
+
+
+def test_raising_per_ticker_fetcher_is_isolated(sleeps):
+    class RaisingFetcher:
+        def __init__(self, frames):
+            self.inner = InMemoryFetcher(frames)
+
+        def fetch(self, ticker, start, end):
+            if ticker == "BBB":
+                raise ValueError("bad symbol")
+            return self.inner.fetch(ticker, start, end)
+
+    fetcher = RaisingFetcher({t: _bars(seed=i) for i, t in enumerate(["AAA", "BBB", "CCC"])})
+    config = BatchConfig(max_retries=0)
+
+    frames, [report] = fetch_in_batches(["AAA", "BBB", "CCC"], START, END, fetcher, config)
+
+    assert list(frames) == ["AAA", "CCC"]
+    assert report.failed == ["BBB"]
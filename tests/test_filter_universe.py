@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from src.filter_universe import filter_universe
+
+
+UNIVERSE = pd.DataFrame({"Ticker": ["AAA", "BBB", "CCC", "DDD"]})
+
+
+def test_filters_on_price_and_exclusions():
+    prices = pd.DataFrame({
+        "AAA": [10.0, 12.0],
+        "BBB": [2.0, 3.0],
+        "CCC": [np.nan, np.nan],
+    })
+
+    assert filter_universe(UNIVERSE, prices) == ["AAA"]
+    assert filter_universe(UNIVERSE, prices, recently_held=["AAA"]) == []
+
+
+def test_empty_price_data_keeps_nothing():
+    assert filter_universe(UNIVERSE, pd.DataFrame()) == []
+
+
+def test_no_price_data_only_applies_exclusions():
+    kept = filter_universe(UNIVERSE, recently_sold=["BBB"])
+
+    assert kept == ["AAA", "CCC", "DDD"]
+
+
+def test_matches_loop_implementation_on_benchmark_data():
+    from benchmarks.reference import filter_universe_loop
+    from benchmarks.synthetic import make_prices
+
+    prices = make_prices(400, 60, seed=3, missing_frac=0.05)
+    prices.iloc[:, :5] = np.nan
+    universe = pd.DataFrame({"Ticker": list(prices.columns) + ["ZZZ"]})
+    held = list(prices.columns[10:30])
+    sold = list(prices.columns[25:40])
+
+    expected = filter_universe_loop(universe, prices, held, sold)
+
+    assert 0 < len(expected) < len(universe)
+    assert filter_universe(universe, prices, held, sold) == expected
@@ -0,0 +1,179 @@
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.engine import instrumentation
+from src.engine.instrumentation import count, instrument, stage
+
+
+@pytest.fixture
+def enabled():
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_disabled_hooks_record_nothing():
+    instrumentation.reset()
+
+    with stage("off", rows=10) as s:
+        s.add_rows(5)
+    count("off.counter")
+
+    data = instrumentation.report()
+    assert data["stages"] == {}
+    assert data["counters"] == {}
+
+
+def test_nested_stages_record_calls_and_rows(enabled):
+    for _ in range(3):
+        with stage("outer", rows=2) as outer:
+            with stage("inner") as inner:
+                inner.add_rows(7)
+            outer.add_rows(1)
+
+    stages = instrumentation.report()["stages"]
+    assert stages["outer"]["calls"] == 3
+    assert stages["outer"]["rows"] == 9
+    assert stages["inner"]["calls"] == 3
+    assert stages["inner"]["rows"] == 21
+    assert stages["outer"]["seconds"] >= stages["inner"]["seconds"]
+    assert stages["outer"]["max_seconds"] <= stages["outer"]["seconds"]
+
+
+def test_stage_is_recorded_when_block_raises(enabled):
+    with pytest.raises(ValueError):
+        with stage("fails"):
+            raise ValueError("boom")
+
+    assert instrumentation.report()["stages"]["fails"]["calls"] == 1
+    assert instrumentation._stack() == []
+
+
+def test_instrument_decorator_counts_rows(enabled):
+    @instrument("decorated", rows=lambda items: len(items))
+    def total(items):
+        return sum(items)
+
+    assert total([1, 2, 3]) == 6
+    assert total([4]) == 4
+
+    stats = instrumentation.report()["stages"]["decorated"]
+    assert stats["calls"] == 2
+    assert stats["rows"] == 4
+
+
+def test_count_accumulates(enabled):
+    count("symbols.loaded", 3)
+    count("symbols.loaded")
+    count("symbols.failed", 2)
+
+    assert instrumentation.report()["counters"] == {
+        "symbols.loaded": 4,
+        "symbols.failed": 2,
+    }
+
+
+def test_report_has_expected_keys(enabled):
+    with stage("a"):
+        pass
+
+    data = instrumentation.report()
+    assert set(data) == {"total_seconds", "track_memory", "stages", "counters"}
+    assert set(data["stages"]["a"]) == {
+        "calls", "seconds", "max_seconds", "rows", "peak_bytes"
+    }
+    assert data["total_seconds"] >= data["stages"]["a"]["seconds"]
+
+
+def test_dump_writes_json_and_returns_summary(enabled, tmp_path):
+    with stage("load.prices", rows=42):
+        pass
+    count("cache.hits", 5)
+
+    path = tmp_path / "nested" / "report.json"
+    text = instrumentation.dump(str(path))
+
+    data = json.loads(path.read_text())
+    assert data["stages"]["load.prices"]["rows"] == 42
+    assert data["counters"] == {"cache.hits": 5}
+    assert "load.prices" in text
+    assert "cache.hits: 5" in text
+    assert "total run" in text
+
+
+def test_track_memory_records_peak():
+    instrumentation.enable(track_memory=True)
+    try:
+        with stage("alloc"):
+            block = np.ones(1_000_000)
+            del block
+        stats = instrumentation.report()["stages"]["alloc"]
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
+
+    assert stats["peak_bytes"] >= 8_000_000
+
+
+def test_worker_threads_do_not_share_the_stage_stack(enabled):
+    n_threads, n_calls = 8, 200
+    seen_depths = []
+    barrier = threading.Barrier(n_threads)
+
+    def work():
+        barrier.wait()
+        for _ in range(n_calls):
+            with stage("worker"):
+                with stage("worker.inner"):
+                    seen_depths.append(len(instrumentation._stack()))
+                count("worker.calls")
+
+    with stage("outer"):
+        threads = [threading.Thread(target=work) for _ in range(n_threads)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert [s.name for s in instrumentation._stack()] == ["outer"]
+
+    data = instrumentation.report()
+    # Each worker sees only its own two open stages, never the caller's
+    assert set(seen_depths) == {2}
+    assert data["stages"]["worker"]["calls"] == n_threads * n_calls
+    assert data["stages"]["worker.inner"]["calls"] == n_threads * n_calls
+    assert data["counters"]["worker.calls"] == n_threads * n_calls
+    assert data["stages"]["outer"]["calls"] == 1
+
+
+def test_run_simulation_analysis_stages_are_timed(enabled):
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2024-01-01", periods=80)
+    tickers = [f"T{i}" for i in range(12)]
+    prices = pd.DataFrame(
+        50 * np.exp(np.cumsum(rng.normal(0, 0.02, (80, 12)), axis=0)),
+        index=dates,
+        columns=tickers,
+    )
+    df_universe = pd.DataFrame({"Ticker": tickers})
+
+    from src.engine.run_simulation import analyze_universe
+
+    result = analyze_universe(df_universe, prices)
+
+    stages = instrumentation.report()["stages"]
+    for name in (
+        "universe.filter",
+        "scoring.score_universe",
+        "ranking.rank_universe",
+        "allocation.allocate_capital",
+        "backtest.mean_reversion",
+        "metrics.compute_metrics",
+    ):
+        assert stages[name]["calls"] == 1, name
+    assert result["ranked"]["top"]
+    assert set(result["metrics"]) >= {"Sharpe", "MaxDrawdown"}
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.portfolio.metrics import METRICS, curve_metrics, traded_value
+from src.portfolio.portfolio import compute_metrics
+
+
+def _random_curves(n_bars=300, n_runs=50, seed=0):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0004, 0.012, (n_bars, n_runs))
+    curves = 1_000 * np.cumprod(1 + returns, axis=0)
+    curves[:, 0] = 1_000.0          # flat run: zero std
+    return curves
+
+
+def test_sharpe_and_drawdown_match_compute_metrics():
+    curves = _random_curves()
+
+    metrics = curve_metrics(curves)
+
+    for k in range(curves.shape[1]):
+        expected = compute_metrics(pd.Series(curves[:, k]))
+        assert round(metrics["Sharpe"].iloc[k], 2) == expected["Sharpe"]
+        assert round(metrics["MaxDrawdown"].iloc[k], 2) == expected["MaxDrawdown"]
+
+
+def test_hand_computed_small_curve():
+    curve = pd.Series([100.0, 110.0, 99.0, 105.0, 121.0, 121.0, 108.9])
+
+    m = curve_metrics(curve, periods_per_year=6).iloc[0]
+
+    # Under water on bars 2-3 (from 110) and bar 6 (from 121)
+    assert m["MaxDrawdownDuration"] == 2
+    assert m["MaxDrawdown"] == pytest.approx(0.1)
+    # 6 periods = one year of growth 100 -> 108.9
+    assert m["CAGR"] == pytest.approx(0.089)
+    assert m["Calmar"] == pytest.approx(0.089 / 0.1)
+    # 3 up moves out of 5 non-flat bars
+    assert m["HitRate"] == pytest.approx(3 / 5)
+
+    returns = curve.pct_change().dropna().to_numpy()
+    downside = np.sqrt((np.minimum(returns, 0) ** 2).mean())
+    assert m["Sortino"] == pytest.approx(np.sqrt(6) * returns.mean() / downside)
+    assert np.isnan(m["Turnover"])
+
+
+def test_nan_padded_runs_match_individual_runs():
+    curves = _random_curves(n_bars=120, n_runs=6, seed=1)
+    padded = curves.copy()
+    padded[:30, 2] = np.nan          # starts late
+    padded[90:, 3] = np.nan          # ends early
+    padded[50:52, 4] = np.nan        # gap
+
+    together = curve_metrics(padded)
+
+    for k, rows in enumerate([slice(None)] * 2 + [slice(30, None), slice(None, 90)] + [slice(None)] * 2):
+        alone = curve_metrics(padded[rows, k]).iloc[0]
+        for name in METRICS:
+            np.testing.assert_allclose(together[name].iloc[k], alone[name], rtol=1e-12, err_msg=name)
+
+
+def test_turnover_from_trade_log():
+    dates = pd.date_range("2024-01-01", periods=5)
+    equity = pd.Series([1_000.0] * 5, index=dates)
+    trade_log = [
+        (dates[1], "AAA", "BUY", 10.0, 50),
+        (dates[1], "BBB", "BUY", 20.0, 10),
+        (dates[3], "AAA", "SELL", 12.0, 50),
+        (pd.Timestamp("2030-01-01"), "CCC", "BUY", 1.0, 1),    # outside the curve
+    ]
+
+    traded = traded_value(trade_log, dates)
+
+    assert traded.tolist() == [0.0, 700.0, 0.0, 600.0, 0.0]
+    assert traded_value([], dates).tolist() == [0.0] * 5
+
+    m = curve_metrics(equity, traded, periods_per_year=4).iloc[0]
+    # 1300 traded over 4 periods (one year) on 1000 average equity
+    assert m["Turnover"] == pytest.approx(1.3)
+
+
+@pytest.mark.parametrize("curve", [[0.0], [0.0, 0.0], [np.nan, np.nan], [], [100.0]])
+def test_degenerate_drawdown_matches_compute_metrics(curve):
+    series = pd.Series(curve, dtype=float)
+
+    expected = compute_metrics(series)["MaxDrawdown"]
+    actual = curve_metrics(series)["MaxDrawdown"].iloc[0]
+
+    assert actual == expected or (np.isnan(actual) and np.isnan(expected))
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.monte_carlo import (
+    StreamingPathStats,
+    make_rng,
+    path_summary,
+    simulate_paths,
+    streaming_path_summary,
+)
+
+
+N_DAYS, N_SIMS = 20, 20_000
+LAST = np.array([10.0, 250.0, 3.0])
+MU = np.array([0.0005, -0.001, 0.002])
+SIGMA = np.array([0.02, 0.01, 0.05])
+
+
+@pytest.fixture(scope="module")
+def paths():
+    return simulate_paths(LAST, MU, SIGMA, N_DAYS, N_SIMS, make_rng(3))
+
+
+def _stream(paths, chunk_sims, **kwargs):
+    stats = StreamingPathStats(N_DAYS, len(LAST), **kwargs)
+    for start in range(0, N_SIMS, chunk_sims):
+        stats.update(paths[:, start:start + chunk_sims])
+    return stats
+
+
+@pytest.mark.parametrize("chunk_sims", [N_SIMS, 3_000])
+def test_moments_match_full_matrix(paths, chunk_sims):
+    stats = _stream(paths, chunk_sims, buffer_elements=10_000)
+
+    assert stats.count == N_SIMS
+    np.testing.assert_allclose(stats.mean(), paths.mean(axis=1), rtol=1e-12)
+    np.testing.assert_allclose(stats.std(), paths.std(axis=1, ddof=1), rtol=1e-10)
+
+
+@pytest.mark.parametrize("q", [0.01, 0.05, 0.5, 0.95, 0.99])
+def test_quantiles_within_one_bin(paths, q):
+    stats = _stream(paths, 3_000)
+
+    exact = np.quantile(paths, q, axis=1)
+    error = np.abs(np.log(stats.quantile(q)) - np.log(exact))
+    assert (error <= stats._width).all()
+
+
+def test_sketch_independent_of_buffer_size(paths):
+    small = _stream(paths, 3_000, buffer_elements=1)
+    large = _stream(paths, 3_000, buffer_elements=10_000_000)
+
+    np.testing.assert_array_equal(small._hist, large._hist)
+    np.testing.assert_allclose(small.std(), large.std(), rtol=1e-12)
+
+
+def test_tails_beyond_first_chunk_grid():
+    paths = np.ones((1, 4, 1))
+    stats = StreamingPathStats(1, 1, bins=8)
+    stats.update(paths * np.array([1.0, 2.0, 3.0, 4.0])[None, :, None])
+    stats.update(paths * np.array([0.01, 0.02, 500.0, 1000.0])[None, :, None])
+
+    assert stats.quantile(0.0)[0, 0] == pytest.approx(0.01)
+    assert stats.quantile(1.0)[0, 0] == pytest.approx(1000.0)
+    assert stats._hist.sum() == 8
+
+
+def test_nan_parameters_give_nan_summary():
+    prices = pd.DataFrame({
+        "OK": 100 * np.exp(np.cumsum(np.full(30, 0.001))),
+        "ONE": [np.nan] * 29 + [50.0],
+        "NONE": np.nan,
+    })
+
+    streamed = streaming_path_summary(prices, 5, 2_000, rng=make_rng(0), chunk_sims=500)
+    exact = path_summary(prices, 5, 2_000, rng=make_rng(0))
+
+    for summary in (streamed, exact):
+        assert summary.mean["OK"].notna().all()
+        assert summary.mean[["ONE", "NONE"]].isna().all().all()
+        for frame in summary.quantiles.values():
+            assert frame["OK"].notna().all()
+            assert frame[["ONE", "NONE"]].isna().all().all()
+    assert streamed.std[["ONE", "NONE"]].isna().all().all()
+
+    # The streaming branch of path_summary hits the same case
+    forced = path_summary(prices, 5, 2_000, rng=make_rng(0), max_elements=1_000)
+    assert forced.median[["ONE", "NONE"]].isna().all().all()
@@ -0,0 +1,68 @@
+import multiprocessing
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.analytics import parallel_mc
+from src.analytics.parallel_mc import ParallelConfig, parallel_path_summary
+
+
+def _prices(n_tickers=6):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, (120, n_tickers)), axis=0)))
+
+
+def _summarize(workers):
+    config = ParallelConfig(max_workers=workers, tickers_per_task=2, min_tickers=0)
+    summary = parallel_path_summary(_prices(), 10, 500, seed=1, config=config)
+    return summary.mean.to_numpy(), summary.median.to_numpy()
+
+
+def test_identical_for_any_worker_count():
+    mean_1, median_1 = _summarize(1)
+    mean_2, median_2 = _summarize(2)
+
+    np.testing.assert_array_equal(mean_1, mean_2)
+    np.testing.assert_array_equal(median_1, median_2)
+
+
+def _summarize_recording_warnings(workers):
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        mean, median = _summarize(workers)
+    return mean, median, [str(w.message) for w in caught if w.category is RuntimeWarning]
+
+
+def test_runs_in_process_inside_a_worker():
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        mean, median, messages = executor.submit(_summarize_recording_warnings, 4).result(timeout=120)
+
+    np.testing.assert_array_equal(mean, _summarize(1)[0])
+    np.testing.assert_array_equal(median, _summarize(1)[1])
+    assert len(messages) == 1 and "child process" in messages[0]
+
+
+def test_processes_false_never_starts_a_pool(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("pool started")
+
+    monkeypatch.setattr(parallel_mc, "ProcessPoolExecutor", no_pool)
+    config = ParallelConfig(max_workers=4, min_tickers=0, processes=False)
+
+    summary = parallel_path_summary(_prices(), 10, 500, seed=1, config=config)
+
+    np.testing.assert_array_equal(summary.mean.to_numpy(), _summarize(1)[0])
+
+
+def test_processes_true_skips_the_child_process_fallback(monkeypatch):
+    monkeypatch.setattr(parallel_mc.multiprocessing, "parent_process", lambda: object())
+    config = ParallelConfig(max_workers=2, tickers_per_task=2, processes=True)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        summary = parallel_path_summary(_prices(), 10, 500, seed=1, config=config)
+
+    np.testing.assert_array_equal(summary.mean.to_numpy(), _summarize(1)[0])
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from src.portfolio.performance import PerformanceTracker
+from src.portfolio.portfolio import compute_metrics
+
+
+def _track(curve, **kwargs):
+    tracker = PerformanceTracker(**kwargs)
+    for equity in curve:
+        tracker.update(equity)
+    return tracker
+
+
+def test_matches_compute_metrics():
+    rng = np.random.default_rng(0)
+    curve = 100.0 * np.cumprod(1 + rng.normal(0.0005, 0.01, 500))
+
+    tracker = _track(curve, capacity=8)
+
+    assert tracker.metrics() == compute_metrics(pd.Series(curve))
+    np.testing.assert_allclose(tracker.curve, curve)
+
+
+def test_nan_bar_keeps_peak_and_returns():
+    curve = [100.0, 120.0, np.nan, 90.0, 110.0]
+
+    tracker = _track(curve)
+
+    assert tracker.peak == 120.0
+    assert tracker.max_drawdown == 0.25
+    assert tracker.drawdown_duration == 2
+    assert tracker.n == len(curve)
+    assert np.isnan(tracker.curve[2]) and np.isnan(tracker.drawdown_curve[2])
+
+    # returns bridge the gap: 120 / 100, 90 / 120, 110 / 90
+    returns = np.array([0.2, -0.25, 110.0 / 90.0 - 1.0])
+    assert np.isclose(tracker.return_mean, returns.mean())
+    assert np.isclose(tracker.return_std, returns.std(ddof=1))
+    assert tracker.sharpe() != 0.0
+
+
+def test_leading_nan_bar():
+    tracker = _track([np.nan, 100.0, 80.0], initial_equity=100.0)
+
+    assert tracker.peak == 100.0
+    assert np.isclose(tracker.max_drawdown, 0.2)
+    assert np.isclose(tracker.return_mean, -0.2)
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.fetchers import InMemoryFetcher
+from src.data.price_cache import PriceCache
+
+
+def _bars(start, periods, seed=0):
+    dates = pd.bdate_range(start, periods=periods)
+    close = 100 + np.random.default_rng(seed).normal(0, 1, periods).cumsum()
+    return pd.DataFrame({"Close": close, "Volume": 1e6}, index=dates)
+
+
+@pytest.fixture
+def fetcher():
+    return InMemoryFetcher({"AAA": _bars("2024-01-01", 120), "LATE": _bars("2024-02-01", 60, seed=1)})
+
+
+@pytest.fixture
+def cache(tmp_path, fetcher):
+    return PriceCache(root=str(tmp_path / "prices"), fetcher=fetcher, file_format="pickle")
+
+
+def _expected(fetcher, ticker, start, end):
+    frame = fetcher.frames[ticker]
+    return frame[(frame.index >= start) & (frame.index < end)]
+
+
+def test_miss_then_hit(cache, fetcher):
+    first = cache.load("AAA", "2024-01-01", "2024-03-01")
+    second = cache.load("AAA", "2024-01-01", "2024-03-01")
+
+    assert len(fetcher.calls) == 1
+    assert (cache.stats.misses, cache.stats.hits, cache.stats.partial_hits) == (1, 1, 0)
+    pd.testing.assert_frame_equal(first, _expected(fetcher, "AAA", "2024-01-01", "2024-03-01"), check_freq=False)
+    pd.testing.assert_frame_equal(second, first)
+    assert cache.stats.rows_fetched == len(first)
+    assert cache.stats.bytes_written > 0 and cache.stats.bytes_read > 0
+
+
+def test_partial_hit_fetches_only_the_gaps(cache, fetcher):
+    cache.load("AAA", "2024-02-01", "2024-03-01")
+    frame = cache.load("AAA", "2024-01-15", "2024-04-01")
+
+    assert [call[1:] for call in fetcher.calls[1:]] == [
+        ("2024-01-15", "2024-02-01"),
+        ("2024-03-01", "2024-04-01"),
+    ]
+    assert cache.stats.partial_hits == 1
+    pd.testing.assert_frame_equal(frame, _expected(fetcher, "AAA", "2024-01-15", "2024-04-01"), check_freq=False)
+
+
+def test_merge_prefers_newer_bars(cache, fetcher):
+    cache.load("AAA", "2024-01-01", "2024-02-01")
+
+    revised = fetcher.frames["AAA"].iloc[10:25].copy()
+    revised["Close"] = -1.0
+    merged = cache.merge("AAA", revised, revised.index[0], revised.index[-1] + pd.Timedelta(days=1))
+
+    assert merged.index.is_unique and merged.index.is_monotonic_increasing
+    assert (merged.loc[revised.index, "Close"] == -1.0).all()
+    assert merged.index[-1] == revised.index[-1]
+
+
+def test_sidecar_records_requested_range(cache, fetcher):
+    cache.load("LATE", "2024-01-01", "2024-03-01")
+
+    # Listed after the start: the request is covered, not the first bar
+    assert cache.coverage("LATE") == (pd.Timestamp("2024-01-01"), pd.Timestamp("2024-03-01"))
+
+    cache.load("LATE", "2024-01-01", "2024-03-01")
+    assert len(fetcher.calls) == 1
+
+
+def test_empty_fetch_is_not_covered(cache, fetcher):
+    assert cache.load("NONE", "2024-01-01", "2024-03-01") is None
+    assert cache.coverage("NONE") is None
+
+    cache.load("NONE", "2024-01-01", "2024-03-01")
+    assert len(fetcher.calls) == 2
+    assert cache.stats.misses == 2
+
+
+def test_clear(cache):
+    cache.load("AAA", "2024-01-01", "2024-02-01")
+    cache.clear("AAA")
+
+    assert cache.coverage("AAA") is None
+    assert cache.read_range("AAA", "2024-01-01", "2024-02-01") is None
+
+
+def test_explicit_fetcher_overrides_cache_fetcher(cache, fetcher):
+    other = InMemoryFetcher({"AAA": _bars("2024-01-01", 120, seed=7)})
+
+    frame = cache.load("AAA", "2024-01-01", "2024-03-01", fetcher=other)
+
+    assert fetcher.calls == [] and len(other.calls) == 1
+    pd.testing.assert_frame_equal(frame, _expected(other, "AAA", "2024-01-01", "2024-03-01"), check_freq=False)
+
+
+@pytest.mark.parametrize("mode", ["serial", "parallel", "batched"])
+def test_loaders_prefer_explicit_fetcher_over_cache(cache, fetcher, mode):
+    from src.data.data_loader import BatchConfig, load_universe_prices
+
+    other = InMemoryFetcher({"AAA": _bars("2024-01-01", 120, seed=7)})
+    universe = pd.DataFrame({"Ticker": ["AAA"]})
+
+    prices = load_universe_prices(
+        universe,
+        "2024-01-01",
+        "2024-03-01",
+        parallel=mode == "parallel",
+        cache=cache,
+        fetcher=other,
+        batch_config=BatchConfig() if mode == "batched" else None,
+    )
+
+    assert fetcher.calls == [] and len(other.calls) == 1
+    expected = _expected(other, "AAA", "2024-01-01", "2024-03-01")["Close"]
+    np.testing.assert_allclose(prices["AAA"].to_numpy(), expected.to_numpy())
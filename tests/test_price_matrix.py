@@ -0,0 +1,40 @@
+import pickle
+
+import numpy as np
+
+from benchmarks.synthetic import make_prices
+from src.data.price_matrix import POINTER, open_price_matrix, write_price_matrix
+
+
+def test_round_trip(tmp_path):
+    prices = make_prices(3, 20, missing_frac=0.1)
+
+    write_price_matrix(prices, tmp_path / "m", dtype=np.float64)
+    matrix = open_price_matrix(tmp_path / "m")
+
+    assert matrix.tickers == list(prices.columns)
+    assert matrix.dates.equals(prices.index)
+    np.testing.assert_array_equal(np.asarray(matrix), prices.to_numpy())
+
+    window = pickle.loads(pickle.dumps(matrix.between(prices.index[5], prices.index[9])))
+    np.testing.assert_array_equal(np.asarray(window), prices.to_numpy()[5:10])
+
+
+def test_rewrite_swaps_version_atomically(tmp_path):
+    root = tmp_path / "m"
+    first = write_price_matrix(make_prices(3, 20, seed=1), root)
+    old = open_price_matrix(root)
+
+    second = write_price_matrix(make_prices(3, 30, seed=2), root)
+    third = write_price_matrix(make_prices(3, 40, seed=3), root)
+
+    assert (root / POINTER).read_text() == third.name
+    assert len(open_price_matrix(root)) == 40
+
+    # The previous version stays for in-flight readers; older ones go
+    assert second.exists() and not first.exists()
+    assert sorted(p.name for p in root.iterdir()) == sorted([POINTER, second.name, third.name])
+
+    # A reader's snapshot pickles as its own version, not the new one
+    assert len(pickle.loads(pickle.dumps(open_price_matrix(second)))) == 30
+    assert len(old) == 20
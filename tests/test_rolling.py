@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.strategy.rolling import RollingStats, rolling_mean_var
+
+
+WINDOW = 10
+
+
+def _prices(n_days=200, n_symbols=4, offset=0.0, missing_frac=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    values = 50 + rng.normal(0, 1, (n_days, n_symbols)).cumsum(axis=0) + offset
+    if missing_frac:
+        values[rng.random(values.shape) < missing_frac] = np.nan
+    return pd.DataFrame(values)
+
+
+@pytest.mark.parametrize("offset, missing_frac", [(0.0, 0.0), (0.0, 0.05), (1e7, 0.0), (1e7, 0.05)])
+def test_rolling_mean_var_matches_pandas(offset, missing_frac):
+    prices = _prices(offset=offset, missing_frac=missing_frac)
+    rolling = prices.rolling(WINDOW)
+
+    mean, var = rolling_mean_var(prices.to_numpy(), WINDOW)
+
+    # Warm-up rows and windows with a NaN are NaN in both
+    np.testing.assert_array_equal(np.isnan(mean), rolling.mean().isna().to_numpy())
+    np.testing.assert_allclose(mean, rolling.mean().to_numpy(), rtol=1e-12, equal_nan=True)
+    # pandas' own online variance loses ~1e-7 at a 1e7 offset; the exact
+    # two-pass variance pins the centered formula much tighter
+    np.testing.assert_allclose(var, rolling.var().to_numpy(), rtol=1e-5, atol=1e-9, equal_nan=True)
+    exact = np.full(var.shape, np.nan)
+    exact[WINDOW - 1:] = sliding_window_view(prices.to_numpy(), WINDOW, axis=0).var(axis=-1, ddof=1)
+    np.testing.assert_allclose(var, exact, rtol=1e-10, equal_nan=True)
+
+
+def test_rolling_mean_var_short_history():
+    mean, var = rolling_mean_var(_prices(n_days=WINDOW - 1).to_numpy(), WINDOW)
+
+    assert np.isnan(mean).all() and np.isnan(var).all()
+
+
+def _skip_nan_rolling(prices, window, stat):
+    """
+    pandas rolling over each column's valid bars, carried to every date.
+    """
+    return pd.DataFrame({
+        col: stat(series.dropna()).reindex(prices.index).ffill()
+        for col, series in prices.items()
+    })
+
+
+@pytest.mark.parametrize("offset, missing_frac", [(0.0, 0.0), (0.0, 0.1), (1e7, 0.1)])
+def test_rolling_stats_matches_pandas(offset, missing_frac):
+    prices = _prices(offset=offset, missing_frac=missing_frac)
+    stats = RollingStats(prices.shape[1], window=WINDOW, resync_every=50)
+
+    exp_mean = _skip_nan_rolling(prices, WINDOW, lambda s: s.rolling(WINDOW).mean())
+    exp_std = _skip_nan_rolling(prices, WINDOW, lambda s: s.rolling(WINDOW).std())
+    exp_vol = _skip_nan_rolling(prices, WINDOW, lambda s: s.pct_change().rolling(WINDOW - 1).std())
+
+    for day, row in enumerate(prices.to_numpy()):
+        stats.update(row)
+        np.testing.assert_allclose(stats.mean(), exp_mean.iloc[day], rtol=1e-12, equal_nan=True)
+        np.testing.assert_allclose(stats.std(), exp_std.iloc[day], rtol=1e-6, atol=1e-9, equal_nan=True)
+        np.testing.assert_allclose(stats.volatility(), exp_vol.iloc[day], rtol=1e-6, atol=1e-12, equal_nan=True)
+
+
+def test_rolling_stats_min_periods_and_zscore():
+    prices = _prices(n_days=5, n_symbols=2)
+    stats = RollingStats(["A", "B"], window=WINDOW, min_periods=3).warm_up(prices)
+
+    expected = prices.rolling(WINDOW, min_periods=3)
+    np.testing.assert_allclose(stats.mean(), expected.mean().iloc[-1])
+    np.testing.assert_allclose(stats.std(), expected.std().iloc[-1])
+    np.testing.assert_allclose(
+        stats.zscore(),
+        (prices.iloc[-1] - expected.mean().iloc[-1]) / expected.std().iloc[-1],
+    )
+
+    flat = RollingStats(1, window=3).warm_up([[5.0], [5.0], [5.0]])
+    assert flat.zscore()[0] == 0.0
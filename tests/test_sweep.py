@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_prices
+from src.data.price_matrix import open_price_matrix, write_price_matrix
+from src.engine import sweep
+from src.engine.sweep import parameter_grid, run_sweep
+
+
+CONFIGS = parameter_grid(lookback=(10, 20), buy_zscore=(-1.0, -1.5), sell_zscore=(1.0,))
+
+
+def test_float64_matrix_is_mapped_without_copy(tmp_path):
+    matrix = open_price_matrix(write_price_matrix(make_prices(4, 60), tmp_path / "m", dtype=np.float64))
+
+    sweep._attach_matrix(matrix)
+    try:
+        assert isinstance(sweep._SHARED["prices"], np.memmap)
+    finally:
+        sweep._SHARED.clear()
+
+
+def test_pool_matrix_matches_in_process_frame(tmp_path):
+    prices = make_prices(6, 120, missing_frac=0.02)
+    matrix = open_price_matrix(write_price_matrix(prices, tmp_path / "m", dtype=np.float64))
+
+    expected = run_sweep(prices, CONFIGS, max_workers=1)
+    pooled = run_sweep(matrix, CONFIGS, max_workers=2, configs_per_task=2)
+
+    pd.testing.assert_frame_equal(pooled, expected)
+
+
+def test_float32_matrix_same_in_process_and_pool(tmp_path):
+    matrix = open_price_matrix(write_price_matrix(make_prices(6, 120), tmp_path / "m"))
+
+    pd.testing.assert_frame_equal(
+        run_sweep(matrix, CONFIGS, max_workers=2, configs_per_task=2),
+        run_sweep(matrix, CONFIGS, max_workers=1),
+    )
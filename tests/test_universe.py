@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+
+from src import universe
+from src.universe import load_membership_index, load_universe
+
+
+SNAPSHOTS = """date,ticker,price,adv,delisted
+2024-01-01,AAA,10,2000000,False
+2024-01-01,BBB,20,2000000,False
+2024-02-01,AAA,11,2000000,False
+2024-02-01,BBB,19,2000000,True
+2024-02-01,CCC,30,2000000,False
+2024-03-01,CCC,31,2000000,False
+"""
+
+
+@pytest.fixture
+def snapshot_csv(tmp_path):
+    path = tmp_path / "universe.csv"
+    path.write_text(SNAPSHOTS)
+    return path
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    calls = []
+    read_csv = pd.read_csv
+
+    def counting(*args, **kwargs):
+        calls.append(args[0])
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(universe.pd, "read_csv", counting)
+    return calls
+
+
+def test_snapshot_csv_is_read_once(snapshot_csv, reads):
+    index = load_membership_index(snapshot_csv)
+
+    assert len(reads) == 1
+    assert index.members("2024-01-15") == ["AAA", "BBB"]
+    assert index.members("2024-02-15") == ["AAA", "CCC"]
+    assert index.members("2024-03-01") == ["CCC"]
+    assert not index.is_member("BBB", "2024-02-01")
+
+    events = list(index.events())
+    assert [e.date for e in events] == pd.to_datetime(["2024-01-01", "2024-02-01", "2024-03-01"]).tolist()
+    assert events[1].added == ["CCC"] and events[1].delisted == ["BBB"]
+    assert events[2].removed == ["AAA"]
+
+
+def test_members_match_as_of_snapshots(snapshot_csv):
+    index = load_membership_index(snapshot_csv)
+
+    for as_of in ["2024-01-01", "2024-02-01", "2024-03-01"]:
+        snap = load_universe(snapshot_csv, as_of=as_of)
+        latest = snap[(snap["date"] == snap["date"].max()) & ~snap["delisted"]]
+        assert index.members(as_of) == sorted(latest["ticker"])
+
+
+def test_interval_csv(tmp_path, reads):
+    path = tmp_path / "intervals.csv"
+    path.write_text("ticker,added,removed,delisted\nAAA,2024-01-01,,False\nBBB,2024-01-01,2024-02-01,True\n")
+
+    index = load_membership_index(path)
+
+    assert len(reads) == 1
+    assert index.members("2024-01-31") == ["AAA", "BBB"]
+    assert index.members("2024-06-01") == ["AAA"]
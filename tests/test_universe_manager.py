@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.universe_manager import UniverseConfig, UniverseManager
+
+
+def _frame(records):
+    return pd.DataFrame(
+        [(s, p, v) for s, (p, v) in records.items()],
+        columns=["symbol", "price", "avg_volume"],
+    )
+
+
+def _random_record(rng):
+    # Coarse volume buckets force liquidity ties; prices straddle min_price
+    return float(rng.choice([0.5, 1.0, 5.0, 20.0])), float(rng.integers(0, 8) * 250_000)
+
+
+@pytest.mark.parametrize("cap", [None, 0, 1, 10, 40])
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_refresh_matches_full_refresh(cap, seed):
+    rng = np.random.default_rng(seed)
+    config = UniverseConfig(max_universe_size=cap)
+    pool = [f"S{i:03d}" for i in range(120)]
+
+    records = {s: _random_record(rng) for s in pool[:60]}
+    manager = UniverseManager(config)
+    manager.refresh_universe(0, _frame(records))
+
+    for day in range(1, 30):
+        previous = set(manager.get_universe())
+
+        changed = {
+            s: _random_record(rng)
+            for s in rng.choice(pool, size=rng.integers(0, 15), replace=False)
+        }
+        listed = [s for s in records if s not in changed]
+        removed = list(rng.choice(listed, size=min(len(listed), rng.integers(0, 5)), replace=False))
+
+        change = manager.apply_updates(day, _frame(changed), removed=removed)
+
+        records.update(changed)
+        for s in removed:
+            del records[s]
+
+        expected = UniverseManager(config).refresh_universe(day, _frame(records))
+        assert manager.get_universe() == expected
+
+        assert set(change.entered) == set(expected) - previous
+        assert set(change.exited) == previous - set(expected)
+        assert change.day == day
+
+
+def test_apply_updates_reports_boundary_crossings():
+    manager = UniverseManager(UniverseConfig(max_universe_size=2))
+    manager.refresh_universe(0, _frame({
+        "AAA": (10.0, 3_000_000),
+        "BBB": (10.0, 2_000_000),
+        "CCC": (10.0, 1_000_000),
+    }))
+
+    change = manager.apply_updates(1, _frame({"CCC": (10.0, 5_000_000)}))
+
+    assert manager.get_universe() == ["CCC", "AAA"]
+    assert change.entered == ["CCC"]
+    assert change.exited == ["BBB"]
+
+
+def test_removed_member_is_replaced_by_next_in_line():
+    manager = UniverseManager(UniverseConfig(max_universe_size=2))
+    manager.refresh_universe(0, _frame({
+        "AAA": (10.0, 3_000_000),
+        "BBB": (10.0, 2_000_000),
+        "CCC": (10.0, 1_000_000),
+    }))
+
+    change = manager.apply_updates(1, removed=["AAA"])
+
+    assert manager.get_universe() == ["BBB", "CCC"]
+    assert change.entered == ["CCC"]
+    assert change.exited == ["AAA"]